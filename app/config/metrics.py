@@ -0,0 +1,207 @@
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Optional
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+# upper bounds of the request duration histogram, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current: ContextVar = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """
+    Measures of one request, collected while it is handled
+    """
+
+    __slots__ = (
+        "view",
+        "db_queries",
+        "db_time",
+        "serialize_time",
+        "serializing",
+        "cache_hits",
+        "cache_misses",
+    )
+
+    def __init__(self) -> None:
+        self.view = "unresolved"
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def execute(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper, see `connection.execute_wrapper`
+        """
+
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - start
+            self.db_queries += 1
+
+    def server_timing(self, total: float) -> str:
+        """
+        Returns the `Server-Timing` header value, durations in milliseconds
+        """
+
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries", '
+            f"serialize;dur={self.serialize_time * 1000:.1f}, "
+            f"total;dur={total * 1000:.1f}"
+        )
+
+
+def current() -> Optional[RequestMetrics]:
+    """
+    Returns the metrics of the request being handled, None outside of one
+    """
+
+    return _current.get()
+
+
+def record_cache_lookup(hit: bool) -> None:
+    metrics = _current.get()
+    if metrics is not None:
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+
+class TimedSerializerMixin:
+    """
+    Adds the time of the serialization of the instances to the request
+    metrics, nested serializers are part of the time of their parent
+    """
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)  # type: ignore
+
+        metrics.serializing = True
+        start = perf_counter()
+        try:
+            return super().to_representation(instance)  # type: ignore
+        finally:
+            metrics.serialize_time += perf_counter() - start
+            metrics.serializing = False
+
+
+class Registry:
+    """
+    Aggregated request metrics of the process by view, rendered in the
+    Prometheus text format
+
+    Every worker process keeps its own registry.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.requests: dict = defaultdict(int)
+            self.buckets: dict = defaultdict(lambda: [0] * (len(DURATION_BUCKETS) + 1))
+            self.totals: dict = defaultdict(lambda: defaultdict(int))
+
+    def record(
+        self, metrics: RequestMetrics, status: int, duration: float, size: int
+    ) -> None:
+        view = metrics.view
+        bucket = bisect_left(DURATION_BUCKETS, duration)
+        with self._lock:
+            self.requests[(view, status)] += 1
+            self.buckets[view][bucket] += 1
+            totals = self.totals[view]
+            totals["duration"] += duration
+            totals["db_queries"] += metrics.db_queries
+            totals["db_duration"] += metrics.db_time
+            totals["serialize_duration"] += metrics.serialize_time
+            totals["cache_hits"] += metrics.cache_hits
+            totals["cache_misses"] += metrics.cache_misses
+            totals["response_bytes"] += size
+
+    def render(self) -> str:
+        lines: list = []
+
+        def family(name: str, kind: str, help: str) -> None:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            family("http_requests_total", "counter", "Requests by view and status.")
+            for (view, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'http_requests_total{{view="{view}",status="{status}"}} {count}'
+                )
+
+            name = "http_request_duration_seconds"
+            family(name, "histogram", "Wall time of the requests.")
+            for view, buckets in sorted(self.buckets.items()):
+                cumulative = 0
+                for bound, count in zip((*DURATION_BUCKETS, "+Inf"), buckets):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{{view="{view}",le="{bound}"}} {cumulative}'
+                    )
+                total = self.totals[view]["duration"]
+                lines.append(f'{name}_sum{{view="{view}"}} {total:.6f}')
+                lines.append(f'{name}_count{{view="{view}"}} {cumulative}')
+
+            for key, name, help in (
+                ("db_queries", "db_queries_total", "Database queries."),
+                ("db_duration", "db_duration_seconds_total", "Database time."),
+                (
+                    "serialize_duration",
+                    "serialization_duration_seconds_total",
+                    "Serialization and rendering time.",
+                ),
+                ("cache_hits", "response_cache_hits_total", "Response cache hits."),
+                (
+                    "cache_misses",
+                    "response_cache_misses_total",
+                    "Response cache misses.",
+                ),
+                ("response_bytes", "http_response_size_bytes_total", "Body bytes."),
+            ):
+                family(name, "counter", help)
+                for view, totals in sorted(self.totals.items()):
+                    value = totals[key]
+                    value = f"{value:.6f}" if isinstance(value, float) else value
+                    lines.append(f'{name}{{view="{view}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def metrics_view(request):
+    """
+    Prometheus endpoint with the request metrics of this process, protected
+    by a bearer token when `METRICS_TOKEN` is set
+    """
+
+    token = settings.METRICS_TOKEN
+    if token:
+        authorization = request.headers.get("Authorization", "")
+        if not constant_time_compare(authorization, f"Bearer {token}"):
+            return HttpResponseForbidden()
+
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
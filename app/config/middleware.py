@@ -0,0 +1,118 @@
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import RequestMetrics, _current, registry
+
+
+def view_name(request) -> str:
+    """
+    Returns the name of the view of a request, `<ViewSet>.<action>` for the
+    DRF viewsets
+    """
+
+    match = request.resolver_match
+    if match is None:
+        return "unresolved"
+
+    view = getattr(match.func, "cls", None)
+    if view is None:
+        return match.view_name or match.func.__name__
+
+    actions = getattr(match.func, "actions", None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return f"{view.__name__}.{action}"
+
+
+class MeasuredStream:
+    """
+    Streaming content that keeps measuring its request while it is sent:
+    the queries of the iterator, the bytes and the wall time until the body
+    is closed, when the request is recorded
+    """
+
+    def __init__(self, content, metrics: RequestMetrics, status: int, start: float):
+        self.content = content
+        self.metrics = metrics
+        self.status = status
+        self.start = start
+        self.size = 0
+        self.iterator = None
+        self.closed = False
+
+    def __iter__(self):
+        self.iterator = self.measure()
+        return self.iterator
+
+    def measure(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self.metrics.execute))
+            for chunk in self.content:
+                self.size += len(chunk)
+                yield chunk
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self.iterator is not None:
+            self.iterator.close()
+        duration = perf_counter() - self.start
+        registry.record(self.metrics, self.status, duration, self.size)
+
+
+class PerformanceMiddleware:
+    """
+    Records the wall time, database queries and time, serialization time,
+    response cache lookups and response size of every request by view, see
+    `app.config.metrics`
+
+    The streaming responses are recorded once their body is sent, with the
+    queries run while it is streamed. With `METRICS_SERVER_TIMING` the
+    measures of the request are also sent in a `Server-Timing` header, up to
+    the start of the body for the streaming responses.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.execute))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        duration = perf_counter() - start
+
+        metrics.view = view_name(request)
+        if settings.METRICS_SERVER_TIMING:
+            response["Server-Timing"] = metrics.server_timing(duration)
+        if response.streaming:
+            response.streaming_content = MeasuredStream(
+                response.streaming_content, metrics, response.status_code, start
+            )
+        else:
+            registry.record(
+                metrics, response.status_code, duration, len(response.content)
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        # the response is rendered right after this hook
+        metrics = _current.get()
+        if metrics is not None:
+            start = perf_counter()
+
+            def rendered(response):
+                metrics.serialize_time += perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
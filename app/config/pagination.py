@@ -0,0 +1,236 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import date, datetime
+from functools import reduce
+from operator import or_
+from typing import Any, Optional
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination on the ordering of the queryset
+
+    The cursor holds the ordering values of the last row of the page, and
+    the next page is filtered with a row comparison on them, so any page
+    costs the same as the first one (no OFFSET scan). The ordering must end
+    with a unique field (the pk) to be a total order.
+
+    `?count=false` skips the `COUNT(*)` of the total number of rows.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, queryset) -> tuple:
+        ordering = tuple(queryset.query.order_by) or self.ordering
+        if ordering[-1].lstrip("-") not in ("id", "pk"):
+            ordering += ("-id" if ordering[0].startswith("-") else "id",)
+        return ordering
+
+    # region Cursor
+    @staticmethod
+    def encode_value(value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    def encode_cursor(self, position: list, reverse: bool) -> str:
+        data = {"p": position, "r": reverse}
+        cursor = urlsafe_b64encode(json.dumps(data).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, ordering: tuple) -> Optional[tuple]:
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+
+        try:
+            data = json.loads(urlsafe_b64decode(cursor.encode()))
+            position, reverse = data["p"], bool(data["r"])
+        except (BinasciiError, KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def parse_position(self, queryset, ordering: tuple, position: list) -> list:
+        """
+        Converts the cursor values to the types of the ordering fields, the
+        annotations (the search rank) by their output field
+
+        raise: NotFound if a value is not valid for its field
+        """
+
+        opts = queryset.model._meta
+        annotations = queryset.query.annotations
+        values = []
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            try:
+                if name in annotations:
+                    model_field = annotations[name].output_field
+                else:
+                    model_field = opts.pk if name == "pk" else opts.get_field(name)
+                value = model_field.to_python(value)
+            except FieldDoesNotExist:
+                pass
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+    @staticmethod
+    def get_value(instance: Any, name: str) -> Any:
+        # the instances may be `.values()` rows
+        return instance[name] if isinstance(instance, dict) else getattr(instance, name)
+
+    def get_position(self, instance: Any, ordering: tuple) -> list:
+        return [
+            self.encode_value(self.get_value(instance, field.lstrip("-")))
+            for field in ordering
+        ]
+
+    # endregion
+
+    @staticmethod
+    def filter_after(queryset, ordering: tuple, position: list, reverse: bool):
+        """
+        Filters the rows after the position in the ordering:
+        a >= x AND ((a > x) OR (a = x AND b > y) OR ...)
+
+        The redundant first condition lets the database start an index range
+        scan at the position.
+        """
+
+        conditions = []
+        for index, field in enumerate(ordering):
+            descending = field.startswith("-") != reverse
+            lookup = f"{field.lstrip('-')}__{'lt' if descending else 'gt'}"
+            equal = {f.lstrip("-"): v for f, v in zip(ordering, position[:index])}
+            conditions.append(Q(**equal, **{lookup: position[index]}))
+
+        first = ordering[0]
+        descending = first.startswith("-") != reverse
+        bound = {f"{first.lstrip('-')}__{'lte' if descending else 'gte'}": position[0]}
+        return queryset.filter(Q(**bound) & reduce(or_, conditions))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, "").lower() not in (
+            "0",
+            "false",
+            "no",
+        ):
+            self.count = queryset.count()
+
+        cursor = self.decode_cursor(request, self.ordering)
+        position, reverse = cursor if cursor else (None, False)
+        if position is not None:
+            position = self.parse_position(queryset, self.ordering, position)
+
+        if reverse:
+            queryset = queryset.order_by(
+                *(f[1:] if f.startswith("-") else f"-{f}" for f in self.ordering)
+            )
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = self.filter_after(queryset, self.ordering, position, reverse)
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.next = self.previous = None
+        if results:
+            first = self.get_position(results[0], self.ordering)
+            last = self.get_position(results[-1], self.ordering)
+            has_next = has_more if not reverse else True
+            has_previous = has_more if reverse else position is not None
+            if has_next:
+                self.next = self.encode_cursor(last, reverse=False)
+            if has_previous:
+                self.previous = self.encode_cursor(first, reverse=True)
+
+        return results
+
+    def get_paginated_response(self, data):
+        response = {}
+        if self.count is not None:
+            response["count"] = self.count
+        response.update({"next": self.next, "previous": self.previous, "results": data})
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator of the admin changelists that does not count large tables
+
+    For an unfiltered queryset on PostgreSQL the number of rows is read from
+    the planner statistics (`pg_class.reltuples`) instead of a `COUNT(*)`
+    that scans the whole table. Estimates under `estimate_threshold` rows,
+    filtered querysets and other databases use the exact count.
+    """
+
+    estimate_threshold = 10_000
+
+    def estimate_count(self) -> int:
+        queryset = self.object_list
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row else -1
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        query = getattr(queryset, "query", None)
+        if (
+            query is not None
+            and not query.where
+            and not query.distinct
+            and connections[queryset.db].vendor == "postgresql"
+        ):
+            estimate = self.estimate_count()
+            if estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
@@ -48,6 +48,7 @@ INSTALLED_APPS = (
 AUTH_USER_MODEL = "users.User"
 
 MIDDLEWARE = (
+    "app.config.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -118,7 +119,15 @@ STATICFILES_FINDERS = [
     "django.contrib.staticfiles.finders.FileSystemFinder",
     "django.contrib.staticfiles.finders.AppDirectoriesFinder",
 ]
-STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    # hotel and draft photos, stored once per content, see `app.config.storage`
+    "photos": {
+        "BACKEND": "app.config.storage.ContentAddressedStorage",
+        "OPTIONS": {"prefix": "photos"},
+    },
+}
 STATIC_URL = "static/"
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR.parent, "static"),
@@ -143,7 +152,7 @@ CACHES = {
 # https://www.django-rest-framework.org/api-guide/settings/
 
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "app.config.pagination.KeysetPagination",
     "PAGE_SIZE": 50,
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "DEFAULT_AUTHENTICATION_CLASSES": (
@@ -201,12 +210,82 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
+# Metrics
+# Request metrics of each worker process in the Prometheus format at /metrics,
+# see `app.config.metrics`. The endpoint requires this bearer token if set
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# Sends the measures of each request in a Server-Timing header
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "") == "1"
+
 # Hotel App - Email No Reply
 EMAIL_NO_REPLY = os.getenv("EMAIL_NO_REPLY", "noreply@hotelsmanager.com")
 
+# Hotel App - Email Delivery
+# Notification emails are sent over a persistent connection per worker
+# thread, closed after this number of idle seconds
+EMAIL_BACKEND = os.getenv(
+    "EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"
+)
+EMAIL_POOL_MAX_IDLE = 60
+
+# Hotel App - Response Cache
+# Entries are invalidated exactly on change, the timeout only bounds the
+# memory used by stale generations
+HOTEL_RESPONSE_CACHE_TIMEOUT = 60 * 60
+
 # Hotel App - Hotel Locations
 HOTEL_LOCATIONS = [
     ("madrid", "Madrid"),
     ("barcelona", "Barcelona"),
     ("sevilla", "Sevilla"),
 ]
+
+# Hotel App - Delta Sync
+# Seconds the sync token is set back to catch rows of transactions still open
+HOTEL_CHANGES_OVERLAP = 5
+# Days the deletions are kept, older tokens require a full sync
+HOTEL_TOMBSTONE_RETENTION_DAYS = 30
+
+# Hotel App - Draft Digests
+# Drafts are notified to the reviewers in a periodic digest instead of one
+# email per draft
+HOTEL_DRAFT_DIGEST = True
+# Seconds between digests
+HOTEL_DRAFT_DIGEST_WINDOW = 5 * 60
+# Maximum drafts in one digest email
+HOTEL_DRAFT_DIGEST_MAX_BATCH = 500
+
+# Hotel App - Photo Variants
+# WebP derivatives of the hotel photos, generated by a celery task after the
+# upload: name -> (width, height, crop). Cropped variants have that exact
+# size, the others fit in it keeping the aspect ratio
+HOTEL_PHOTO_VARIANTS = {
+    "thumbnail": (100, 100, True),
+    "small": (480, 480, False),
+    "large": (1280, 1280, False),
+}
+HOTEL_PHOTO_VARIANT_QUALITY = 80
+
+# Hotel App - Photo Uploads
+# The photos are streamed to a temporary file and rejected once they exceed
+# the size, their dimensions and format are read from the image header
+HOTEL_PHOTO_MAX_BYTES = 10 * 1024 * 1024
+HOTEL_PHOTO_MAX_PIXELS = 40_000_000
+HOTEL_PHOTO_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+FILE_UPLOAD_HANDLERS = [
+    "app.hotels.uploads.PhotoUploadHandler",
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+
+# Hotel App - Photo Storage
+# Seconds an unreferenced photo file is kept before `collect_photos` deletes
+# it, so uploads of transactions still open are not collected
+HOTEL_PHOTO_GC_GRACE = 24 * 60 * 60
+
+CELERY_BEAT_SCHEDULE = {
+    "send-draft-digests": {
+        "task": "app.hotels.tasks.send_draft_digests",
+        "schedule": HOTEL_DRAFT_DIGEST_WINDOW,
+    },
+}
@@ -19,3 +19,9 @@ DATABASES = {
         "PORT": os.getenv("DB_PORT", "5432"),
     }
 }
+
+# Email
+# Stand-in for the SMTP server, the emails are written to files
+
+EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
+EMAIL_FILE_PATH = os.getenv("EMAIL_FILE_PATH", "/tmp/hotelapp-emails")
@@ -0,0 +1,105 @@
+import hashlib
+import os
+from pathlib import PurePosixPath
+from typing import Optional
+from uuid import uuid4
+
+from django.core.files.storage import FileSystemStorage, storages
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names the files by the SHA-256 of their content,
+    so identical uploads are stored once
+
+    The content is hashed while it is written to a temporary file, chunk by
+    chunk, and the file is then moved to `<prefix>/<ab>/<cd>/<sha256><ext>`.
+    Only the extension of the requested name is kept. Saving a content that
+    is already stored returns the existing name.
+    """
+
+    temporary_dir = ".tmp"
+
+    def __init__(self, prefix: str = "photos", **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.prefix = prefix
+
+    def content_name(self, name: str, digest: str) -> str:
+        """
+        Returns the name of a content
+
+        name: requested name, its extension is kept
+        digest: SHA-256 of the content
+        """
+
+        ext = PurePosixPath(name).suffix.lower()
+        return f"{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+    def _save(self, name, content):
+        directory = self.path(self.temporary_dir)
+        os.makedirs(directory, exist_ok=True)
+        temporary = os.path.join(directory, uuid4().hex)
+
+        digest = hashlib.sha256()
+        # same flags and mode as `FileSystemStorage`, the umask applies
+        fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    file.write(chunk)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+        name = self.content_name(name, digest.hexdigest())
+        full_path = self.path(name)
+        try:
+            # a new use of the file, the garbage collection skips recent files
+            os.utime(full_path)
+        except FileNotFoundError:
+            pass
+        else:
+            os.unlink(temporary)
+            return name
+
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        # atomic, a concurrent save of the same content writes the same bytes
+        os.replace(temporary, full_path)
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+        return name
+
+    def delete_unused(self, name: str, limit: float) -> Optional[int]:
+        """
+        Deletes a file unless it was used since the `limit` timestamp
+
+        The file is moved aside before its last use is checked again, so a
+        save of the same content either bumps it first and it is restored,
+        or finds it missing and stores the content again.
+
+        return: the size of the deleted file, None if it was kept or missing
+        """
+
+        full_path = self.path(name)
+        directory = self.path(self.temporary_dir)
+        os.makedirs(directory, exist_ok=True)
+        trash = os.path.join(directory, uuid4().hex)
+        try:
+            if os.path.getmtime(full_path) >= limit:
+                return None
+            os.replace(full_path, trash)
+        except FileNotFoundError:
+            return None
+
+        stat = os.stat(trash)
+        if stat.st_mtime >= limit:
+            # same bytes as any copy saved meanwhile
+            os.replace(trash, full_path)
+            return None
+        os.unlink(trash)
+        return stat.st_size
+
+
+def photo_storage():
+    return storages["photos"]
@@ -0,0 +1,116 @@
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+
+from app.config.metrics import registry
+from app.hotels.tests.views.base import TestSetup
+
+
+class MetricsTestCase(TestSetup):
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+
+    def get_metrics(self, **headers) -> str:
+        response = self.client.get(reverse("metrics"), **headers)
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_view_name(self):
+        self.client.get(reverse("hotel-list"))
+        self.client.get(
+            reverse("hotel-detail", kwargs={"slug": "test-hotel-test-land"})
+        )
+
+        metrics = self.get_metrics()
+
+        self.assertIn(
+            'http_requests_total{view="HotelViewSet.list",status="200"} 1', metrics
+        )
+        self.assertIn(
+            'http_requests_total{view="HotelViewSet.retrieve",status="200"} 1', metrics
+        )
+
+    def test_measures(self):
+        response = self.client.get(reverse("hotel-list"))
+
+        metrics = self.get_metrics()
+
+        self.assertIn(
+            'http_request_duration_seconds_count{view="HotelViewSet.list"} 1', metrics
+        )
+        self.assertIn(
+            'response_cache_misses_total{view="HotelViewSet.list"} 1', metrics
+        )
+        size = len(response.content)
+        self.assertIn(
+            f'http_response_size_bytes_total{{view="HotelViewSet.list"}} {size}',
+            metrics,
+        )
+
+        lines = dict(
+            line.rsplit(" ", 1)
+            for line in metrics.splitlines()
+            if not line.startswith("#")
+        )
+        result = int(lines['db_queries_total{view="HotelViewSet.list"}'])
+        self.assertGreater(result, 0, msg="Queries of the list")
+        result = float(
+            lines['serialization_duration_seconds_total{view="HotelViewSet.list"}']
+        )
+        self.assertGreater(result, 0, msg="Serialization of the list")
+
+    def test_streaming_measures(self):
+        queries = []
+
+        def execute(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(execute):
+            response = self.client.get(reverse("hotel-export"))
+            content = b"".join(response.streaming_content)
+
+        metrics = self.get_metrics()
+
+        self.assertIn(b"test hotel", content)
+        self.assertIn(
+            'http_requests_total{view="HotelViewSet.export",status="200"} 1', metrics
+        )
+        self.assertIn(
+            f'http_response_size_bytes_total{{view="HotelViewSet.export"}} '
+            f"{len(content)}",
+            metrics,
+        )
+        # the rows are read while the body is streamed
+        self.assertIn(
+            f'db_queries_total{{view="HotelViewSet.export"}} {len(queries)}', metrics
+        )
+
+    def test_cache_hits(self):
+        self.client.get(reverse("hotel-list"))
+        self.client.get(reverse("hotel-list"))
+
+        metrics = self.get_metrics()
+
+        self.assertIn('response_cache_hits_total{view="HotelViewSet.list"} 1', metrics)
+
+    @override_settings(METRICS_SERVER_TIMING=True)
+    def test_server_timing(self):
+        response = self.client.get(reverse("hotel-list"))
+
+        result = response.headers.get("Server-Timing", "")
+        self.assertRegex(result, r'^db;dur=[\d.]+;desc="\d+ queries", serialize;dur=')
+
+    def test_no_server_timing_by_default(self):
+        response = self.client.get(reverse("hotel-list"))
+
+        self.assertNotIn("Server-Timing", response.headers)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token(self):
+        self.client.credentials()
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 403)
+
+        self.get_metrics(HTTP_AUTHORIZATION="Bearer secret")
@@ -0,0 +1,87 @@
+import hashlib
+import os
+from tempfile import TemporaryDirectory
+from time import time
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase
+
+from app.config.storage import ContentAddressedStorage
+
+
+class ContentAddressedStorageTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.storage = ContentAddressedStorage(location=self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_named_by_content(self):
+        digest = hashlib.sha256(b"photo").hexdigest()
+
+        result = self.storage.save("hotels/a.PNG", ContentFile(b"photo"))
+        expected = f"photos/{digest[:2]}/{digest[2:4]}/{digest}.png"
+        self.assertEqual(result, expected, msg=f"Expected {expected}")
+
+    def test_same_content_stored_once(self):
+        first = self.storage.save("hotels/a.png", ContentFile(b"photo"))
+        second = self.storage.save("hotel-drafts/b.png", ContentFile(b"photo"))
+
+        self.assertEqual(first, second, msg="Same content, same file")
+        with self.storage.open(first) as f:
+            self.assertEqual(f.read(), b"photo")
+
+    def test_different_content(self):
+        first = self.storage.save("hotels/a.png", ContentFile(b"photo"))
+        second = self.storage.save("hotels/a.png", ContentFile(b"other photo"))
+
+        self.assertNotEqual(first, second, msg="Different content, different file")
+
+    def test_no_temporary_files_left(self):
+        self.storage.save("hotels/a.png", ContentFile(b"photo"))
+        self.storage.save("hotels/a.png", ContentFile(b"photo"))
+
+        result = os.listdir(self.storage.path(self.storage.temporary_dir))
+        self.assertEqual(result, [], msg=f"Temporary files left: {result}")
+
+    def make_old(self, name: str) -> None:
+        os.utime(self.storage.path(name), (0, 0))
+
+    def test_delete_unused(self):
+        name = self.storage.save("hotels/a.png", ContentFile(b"photo"))
+        self.make_old(name)
+
+        result = self.storage.delete_unused(name, time())
+        self.assertEqual(result, 5, msg="Size of the deleted file")
+        self.assertFalse(self.storage.exists(name))
+
+        result = self.storage.save("hotels/a.png", ContentFile(b"photo"))
+        self.assertEqual(result, name)
+        self.assertTrue(self.storage.exists(name), msg="Stored again")
+
+    def test_delete_unused_keeps_recent(self):
+        name = self.storage.save("hotels/a.png", ContentFile(b"photo"))
+
+        result = self.storage.delete_unused(name, time() - 60)
+        self.assertIsNone(result)
+        self.assertTrue(self.storage.exists(name))
+
+    def test_delete_unused_reused_meanwhile(self):
+        name = self.storage.save("hotels/a.png", ContentFile(b"photo"))
+        self.make_old(name)
+        replace = os.replace
+
+        def reused_replace(source, destination):
+            # an identical upload reuses the file right after its check
+            if source == self.storage.path(name):
+                self.storage.save("hotels/b.png", ContentFile(b"photo"))
+            replace(source, destination)
+
+        with mock.patch("app.config.storage.os.replace", reused_replace):
+            result = self.storage.delete_unused(name, time())
+
+        self.assertIsNone(result)
+        with self.storage.open(name) as f:
+            self.assertEqual(f.read(), b"photo")
@@ -11,6 +11,7 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
+from app.config.metrics import metrics_view
 from app.hotels.views import HotelViewSet, HotelChainViewSet, HotelDraftViewSet
 
 from drf_yasg import openapi
@@ -39,6 +40,7 @@ router.register(r"hoteldrafts", HotelDraftViewSet)
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("admin/doc/", include("django.contrib.admindocs.urls")),
+    path("metrics", metrics_view, name="metrics"),
     path("api/v1/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/v1/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/v1/token/verify/", TokenVerifyView.as_view(), name="token_verify"),
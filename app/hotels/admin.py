@@ -5,6 +5,8 @@ from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 
+from app.config.pagination import EstimatedCountPaginator
+from .cache import bump_generation
 from .models import Hotel, HotelChain, HotelDraft
 
 
@@ -13,11 +15,21 @@ class HotelInline(admin.TabularInline):
     extra = 0
     fields = ("name", "location", "is_active")
 
+    def get_queryset(self, request):
+        # only the columns of the inline, the photos are not needed
+        return (
+            super()
+            .get_queryset(request)
+            .only("pk", "chain", "name", "location", "is_active")
+            .order_by("name")
+        )
+
 
 @admin.register(HotelChain)
 class HotelChainAdmin(admin.ModelAdmin):
     list_display = (
         "title",
+        "hotel_count",
         "price_range",
         "recipient_email",
         "created_at",
@@ -61,8 +73,12 @@ class HotelAdmin(admin.ModelAdmin):
         "updated_at",
     )
     list_filter = ("is_active", "chain")
+    list_select_related = ("chain",)
+    # the search lookups are served by the trigram indexes on PostgreSQL
     search_fields = ("name",)
     search_help_text = "Search for a hotel name"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         ("Hotel Information", {"fields": ("name", "location", "photo")}),
@@ -73,25 +89,22 @@ class HotelAdmin(admin.ModelAdmin):
                 "fields": ("is_active",),
             },
         ),
-        (
-            "Related Hotels",
-            {
-                "fields": ("related_hotels",),
-                "classes": ("collapse",),
-            },
-        ),
     )
 
     def image(self, obj):
         if not obj.photo:
             return "No photo"
-        return mark_safe(f'<img src="{obj.photo.url}" width="50" height="50" />')
+        # the thumbnail once generated, not the full size photo
+        url = obj.photo_variant_urls.get("thumbnail", obj.photo.url)
+        return mark_safe(f'<img src="{url}" width="50" height="50" />')
 
     def hotel_make_active(self, request, queryset):
-        queryset.update(is_active=True)
+        Hotel.objects.set_active(queryset, True)  # type: ignore
+        bump_generation(Hotel, HotelChain)
 
     def hotel_make_inactive(self, request, queryset):
-        queryset.update(is_active=False)
+        Hotel.objects.set_active(queryset, False)  # type: ignore
+        bump_generation(Hotel, HotelChain)
 
     actions = [hotel_make_active, hotel_make_inactive]  # type: ignore
     hotel_make_active.short_description = "Activate selected Hotels"
@@ -111,8 +124,12 @@ class HotelDraftAdmin(admin.ModelAdmin):
         "draft_actions",
     )
     list_filter = ("status", "hotel__is_active", "hotel__chain__price_range")
+    list_select_related = ("hotel", "chain", "created_by")
+    # the search lookups are served by the trigram indexes on PostgreSQL
     search_fields = ("hotel__name", "hotel__location", "hotel__chain__title")
     search_help_text = "Search for a hotel name"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     fieldsets = (
         ("Hotel Draft", {"fields": ("hotel", "status", "created_by")}),
         (
@@ -126,7 +143,7 @@ class HotelDraftAdmin(admin.ModelAdmin):
     readonly_fields = ("created_at", "updated_at", "status")
 
     def chain__title(self, obj):
-        if obj.status == HotelDraft.STATUS_APPROVED and not obj.chain.title:
+        if obj.status == HotelDraft.STATUS_APPROVED and not obj.chain:
             return "-"
 
         if obj.status == HotelDraft.STATUS_APPROVED:
@@ -182,19 +199,21 @@ class HotelDraftAdmin(admin.ModelAdmin):
         return "⏳"
 
     def hotel_url(self, obj):
-        url = reverse("admin:hotels_hotel_change", args=[obj.hotel.id])
+        url = reverse("admin:hotels_hotel_change", args=[obj.hotel_id])
         return mark_safe(f'<a href="{url}">🔗</a>')
 
+    @staticmethod
+    def can_approve(request) -> bool:
+        return request.user.is_reviewer or request.user.is_superuser
+
     def approve_form(self, request, hotel_draft_id):
-        if not request.user.is_reviewer and not request.user.is_superuser:
+        if not self.can_approve(request):
             self.message_user(
                 request, "You are not allowed to approve hotel drafts", level="ERROR"
             )
             return redirect("admin:hotels_hoteldraft_change", hotel_draft_id)  # type: ignore
 
-        hotel_draft = HotelDraft.objects.get(id=hotel_draft_id)
-        hotel_draft.status = HotelDraft.STATUS_PENDING
-        hotel_draft.save()
+        hotel_draft = HotelDraft.objects.select_related("hotel").get(id=hotel_draft_id)
 
         if request.method == "POST":
             updated = hotel_draft.approved_and_save()
@@ -235,8 +254,15 @@ class HotelDraftAdmin(admin.ModelAdmin):
         self.message_user(request, "Hotel Draft has been rejected")
         return redirect("admin:hotels_hoteldraft_changelist")  # type: ignore
 
-    # def make_approve(self, request, queryset):
-    #    queryset.update(status=HotelDraft.STATUS_APPROVED)
+    def make_approve(self, request, queryset):
+        if not self.can_approve(request):
+            self.message_user(
+                request, "You are not allowed to approve hotel drafts", level="ERROR"
+            )
+            return
+
+        approved = HotelDraft.approve_many(queryset.values_list("pk", flat=True))
+        self.message_user(request, f"{len(approved)} Hotel Drafts have been approved")
 
     def make_reject(self, request, queryset):
         queryset.update(status=HotelDraft.STATUS_REJECTED)
@@ -246,9 +272,9 @@ class HotelDraftAdmin(admin.ModelAdmin):
 
     actions = [  # type: ignore
         make_pending,
-        # make_approve,
+        make_approve,
         make_reject,
     ]
-    # make_approve.short_description = "Approve selected Hotel Drafts"
+    make_approve.short_description = "Approve selected Hotel Drafts"
     make_reject.short_description = "Reject selected Hotel Drafts"
     make_pending.short_description = "Pending selected Hotel Drafts"
@@ -0,0 +1,64 @@
+from django.core.cache import cache
+
+from app.config.metrics import record_cache_lookup
+from .side_effects import OnCommitBuffer
+
+GENERATION_KEY = "hotels:generation:{}"
+STATS_KEY = "hotels:response-cache:{}"
+
+
+def _incr(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+committed_bumps = OnCommitBuffer(lambda pending: [_incr(key) for key in pending])
+
+
+def get_generations(*models_: type) -> tuple:
+    """
+    Returns the generation of each model, bumped on every change
+
+    models_: model classes
+    """
+
+    keys = [GENERATION_KEY.format(model._meta.label_lower) for model in models_]
+    generations = cache.get_many(keys)
+    return tuple(generations.get(key, 0) for key in keys)
+
+
+def bump_generation(*models_: type) -> None:
+    """
+    Bumps the generation of the models so the cached responses built from
+    them are not used anymore
+
+    It is bumped again on commit, so another request can not cache data that
+    is not committed yet under the new generation. The bumps on commit are
+    coalesced, once per model and transaction.
+
+    models_: model classes
+    """
+
+    for model in models_:
+        key = GENERATION_KEY.format(model._meta.label_lower)
+        _incr(key)
+        committed_bumps.add(key)
+
+
+def record_lookup(hit: bool) -> None:
+    _incr(STATS_KEY.format("hits" if hit else "misses"))
+    record_cache_lookup(hit)
+
+
+def response_cache_stats() -> dict:
+    """
+    Returns the hit and miss counters of the response cache
+    """
+
+    stats = cache.get_many([STATS_KEY.format("hits"), STATS_KEY.format("misses")])
+    return {
+        "hits": stats.get(STATS_KEY.format("hits"), 0),
+        "misses": stats.get(STATS_KEY.format("misses"), 0),
+    }
@@ -0,0 +1,632 @@
+import io
+import json
+import os
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import repeat
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .cache import bump_generation
+from .matchers import chain_matcher
+from .models import Hotel, HotelChain, HotelDraft
+
+# lower case ascii, so the names are slugified by joining the words
+WORDS = (
+    "grand",
+    "palace",
+    "sunny",
+    "beach",
+    "royal",
+    "plaza",
+    "garden",
+    "central",
+    "ocean",
+    "mountain",
+    "city",
+    "park",
+)
+
+FIRST_NAMES = ("ana", "carlos", "lucia", "javier", "marta", "pablo", "sofia", "diego")
+
+# share of the generated drafts by status
+DRAFT_STATUSES = {
+    HotelDraft.STATUS_PENDING: 0.7,
+    HotelDraft.STATUS_APPROVED: 0.2,
+    HotelDraft.STATUS_REJECTED: 0.1,
+}
+
+# share of the generated hotels that are active
+ACTIVE_SHARE = 0.8
+
+MODELS = (HotelChain, Hotel, HotelDraft)
+
+# secondary indexes of the tables, the ones of the constraints are rebuilt
+# with their constraint
+INDEXES_SQL = """
+    SELECT i.indrelid::regclass::text, c.relname, pg_get_indexdef(i.indexrelid)
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE i.indrelid = ANY(%s::regclass[])
+    AND NOT i.indisprimary
+    AND NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conrelid = i.indrelid AND conindid = i.indexrelid
+    )
+"""
+
+# unique constraints and foreign keys of the tables, the foreign keys first
+CONSTRAINTS_SQL = """
+    SELECT
+        conrelid::regclass::text,
+        conname,
+        contype,
+        pg_get_constraintdef(oid),
+        conindid::regclass::text,
+        pg_get_indexdef(conindid),
+        condeferrable,
+        condeferred
+    FROM pg_constraint
+    WHERE conrelid = ANY(%s::regclass[]) AND contype IN ('u', 'f')
+    ORDER BY contype, conname
+"""
+
+
+@dataclass
+class Catalogue:
+    """
+    Ids of the rows of a synthetic catalogue, which are consecutive
+    """
+
+    chains: range
+    hotels: range
+    drafts: range
+
+
+@dataclass
+class Definitions:
+    """
+    Statements dropping and rebuilding the secondary indexes, unique
+    constraints and foreign keys of the catalogue tables around the load of
+    an empty database
+
+    drop: statements dropping them, the foreign keys first
+    indexes: `CREATE INDEX` statements, the unique constraints included
+    constraints: statements adding the constraints over the indexes built
+    """
+
+    drop: list
+    indexes: list
+    constraints: list
+
+
+def copy_value(value) -> str:
+    """
+    Returns a value in the text format of PostgreSQL `COPY`
+    """
+
+    if isinstance(value, dict):
+        value = json.dumps(value)
+    if isinstance(value, str):
+        return (
+            value.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class CatalogueSeeder:
+    """
+    Loads a deterministic synthetic catalogue with bulk queries: chains with
+    their hotels, which are the related hotels of one another, and the drafts
+    of every hotel
+
+    The rows are never saved one by one, so no model signal, notification or
+    task is fired. The ids are assigned in memory after the largest stored
+    one, so the names and slugs (built from the ids) are unique without any
+    lookup, the hotels and drafts reference their chain and hotel without
+    reading them back, and the hotel counters of the chains are computed
+    while the rows are generated. The rows are generated a batch of columns
+    at a time, with one random call per column instead of per row, and loaded
+    with `COPY` on PostgreSQL and with `executemany` on other databases.
+
+    By default the catalogue is loaded in one transaction, which keeps the
+    indexes and foreign keys up to date row by row. An empty PostgreSQL
+    database can be loaded with `run(empty_db=True)` instead, see `run`.
+
+    seed: seed of the random values, the same seed gives the same catalogue
+    batch_size: rows of hotels generated and loaded at once
+    using: database alias
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        batch_size: int = 10_000,
+        using: str = DEFAULT_DB_ALIAS,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.using = using
+        self.locations = [location for location, _ in settings.HOTEL_LOCATIONS]
+        self.price_ranges = [price_range for price_range, _ in HotelChain.PRICE_CHOICES]
+        self.statuses = list(DRAFT_STATUSES)
+        self.weights = list(DRAFT_STATUSES.values())
+        self.now = timezone.now()
+
+    @property
+    def connection(self):
+        # the connection of the current thread
+        return connections[self.using]
+
+    def run(
+        self,
+        chains: int,
+        hotels: int,
+        drafts: int,
+        created_by,
+        empty_db: bool = False,
+    ) -> Catalogue:
+        """
+        Creates the catalogue in one transaction
+
+        With `empty_db` the tables must be empty and the database PostgreSQL:
+        their secondary indexes, unique constraints and foreign keys are
+        dropped, the tables are loaded in parallel over one connection per
+        table, and the indexes and constraints are rebuilt afterwards, many
+        indexes at once.
+        The load is not one transaction then, so it must not be used on a
+        database in use. If it fails the loaded rows are deleted.
+
+        chains: number of chains
+        hotels: number of hotels per chain
+        drafts: number of drafts per hotel
+        created_by: author of the drafts
+        empty_db: load the empty tables without their indexes and constraints
+
+        raise: ValueError if `empty_db` and the database is not PostgreSQL or
+        the tables are not empty
+        """
+
+        if empty_db:
+            return self.run_empty(chains, hotels, drafts, created_by)
+
+        with transaction.atomic(using=self.using):
+            self.lock()
+            catalogue = self.get_catalogue(chains, hotels, drafts)
+            for batch in self.generate(catalogue, hotels, drafts, created_by.pk):
+                for model, columns, constants in batch:
+                    self.load(model, columns, constants)
+
+            self.reset_sequences()
+            bump_generation(Hotel, HotelChain)
+            chain_matcher.invalidate()
+            transaction.on_commit(chain_matcher.invalidate, using=self.using)
+
+        return catalogue
+
+    def run_empty(self, chains: int, hotels: int, drafts: int, created_by):
+        if self.connection.vendor != "postgresql":
+            raise ValueError("Only PostgreSQL databases are loaded empty")
+        if any(model._default_manager.using(self.using).exists() for model in MODELS):
+            raise ValueError("The hotel chains, hotels and drafts are not empty")
+
+        catalogue = self.get_catalogue(chains, hotels, drafts)
+        definitions = self.get_definitions()
+        self.drop(definitions)
+        try:
+            self.load_parallel(catalogue, hotels, drafts, created_by.pk)
+        except BaseException:
+            self.delete()
+            raise
+        finally:
+            self.rebuild(definitions)
+
+        self.reset_sequences()
+        bump_generation(Hotel, HotelChain)
+        chain_matcher.invalidate()
+        return catalogue
+
+    def lock(self) -> None:
+        """
+        Blocks the writes to the tables, the ids are taken from the largest
+        stored one
+        """
+
+        if self.connection.vendor == "postgresql":
+            tables = ", ".join(
+                self.connection.ops.quote_name(model._meta.db_table) for model in MODELS
+            )
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {tables} IN EXCLUSIVE MODE")
+
+    def get_catalogue(self, chains: int, hotels: int, drafts: int) -> Catalogue:
+        chain_id, hotel_id, draft_id = (self.next_id(model) for model in MODELS)
+        return Catalogue(
+            chains=range(chain_id, chain_id + chains),
+            hotels=range(hotel_id, hotel_id + chains * hotels),
+            drafts=range(draft_id, draft_id + chains * hotels * drafts),
+        )
+
+    def next_id(self, model: type) -> int:
+        queryset = model._default_manager.using(self.using)
+        largest = queryset.aggregate(largest=Max("pk"))["largest"]
+        return (largest or 0) + 1
+
+    def reset_sequences(self) -> None:
+        statements = self.connection.ops.sequence_reset_sql(no_style(), MODELS)
+        with self.connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    # region Generation
+    def generate(self, catalogue: Catalogue, hotels: int, drafts: int, created_by_id):
+        """
+        Yields the batches of the catalogue, as the model, the columns and
+        the constants of the rows of each table
+
+        columns: values of every row by column attribute name
+        constants: value of every row by column attribute name
+        """
+
+        group = max(1, self.batch_size // max(hotels, 1))
+        for start in range(0, len(catalogue.chains), group):
+            chain_pks = catalogue.chains[start : start + group]
+            first = start * hotels
+            hotel_pks = catalogue.hotels[first : first + len(chain_pks) * hotels]
+            draft_pks = catalogue.drafts[
+                first * drafts : (first + len(hotel_pks)) * drafts
+            ]
+
+            hotel = self.hotel_columns(hotel_pks, chain_pks, hotels)
+            yield [
+                (
+                    HotelChain,
+                    *self.chain_columns(chain_pks, hotel["is_active"], hotels),
+                ),
+                (Hotel, hotel, self.hotel_constants()),
+                (
+                    HotelDraft,
+                    *self.draft_columns(draft_pks, hotel, drafts, created_by_id),
+                ),
+            ]
+
+    def chain_columns(self, pks: range, is_active: list, hotels: int) -> tuple:
+        """
+        Returns the columns and constants of the chains
+
+        is_active: activity of their hotels, `hotels` per chain in order
+        """
+
+        rng, size = self.rng, len(pks)
+        firsts, seconds = rng.choices(WORDS, k=size), rng.choices(WORDS, k=size)
+        contacts = rng.choices(FIRST_NAMES, k=size)
+        slugs = [
+            f"{first}-{second}-{pk}" for first, second, pk in zip(firsts, seconds, pks)
+        ]
+        columns = {
+            "id": pks,
+            "title": [
+                f"{first} {second} {pk}".title()
+                for first, second, pk in zip(firsts, seconds, pks)
+            ],
+            "slug": slugs,
+            "description": [
+                f"{first.title()} {second} hotels."
+                for first, second in zip(firsts, seconds)
+            ],
+            "email": [f"sales@{slug}.example.com" for slug in slugs],
+            "phone": [
+                f"+34 9{number}" for number in rng.choices(range(10**7, 10**8), k=size)
+            ],
+            "website": [f"https://www.{slug}.example.com" for slug in slugs],
+            "sales_contact": [
+                f"{contact.title()} <{contact}@{slug}.example.com>"
+                for contact, slug in zip(contacts, slugs)
+            ],
+            "price_range": rng.choices(self.price_ranges, k=size),
+            "active_hotel_count": [
+                sum(is_active[index * hotels : (index + 1) * hotels])
+                for index in range(size)
+            ],
+        }
+        constants = {
+            "created_at": self.now,
+            "updated_at": self.now,
+            "auto_assign": False,
+            "recipient_email": "",
+            "hotel_count": hotels,
+        }
+        return columns, constants
+
+    def hotel_columns(self, pks: range, chain_pks: range, hotels: int) -> dict:
+        """
+        Returns the columns of the hotels, `hotels` per chain
+        """
+
+        rng, size = self.rng, len(pks)
+        firsts, seconds = rng.choices(WORDS, k=size), rng.choices(WORDS, k=size)
+        words = list(zip(firsts, seconds, pks))
+        return {
+            "id": pks,
+            "location": rng.choices(self.locations, k=size),
+            "slug": [f"{first}-{second}-hotel-{pk}" for first, second, pk in words],
+            "name": [f"{first} {second} hotel {pk}" for first, second, pk in words],
+            "is_active": rng.choices(
+                (True, False), (ACTIVE_SHARE, 1 - ACTIVE_SHARE), k=size
+            ),
+            "chain_id": [pk for pk in chain_pks for _ in range(hotels)],
+        }
+
+    def hotel_constants(self) -> dict:
+        return {
+            "created_at": self.now,
+            "updated_at": self.now,
+            "photo": "",
+            "photo_variants": {},
+        }
+
+    def draft_columns(
+        self, pks: range, hotel: dict, drafts: int, created_by_id
+    ) -> tuple:
+        """
+        Returns the columns and constants of the drafts, `drafts` per hotel
+
+        hotel: columns of the hotels
+        """
+
+        rng, size = self.rng, len(pks)
+
+        def per_hotel(values) -> list:
+            return [value for value in values for _ in range(drafts)]
+
+        columns = {
+            "id": pks,
+            "location": rng.choices(self.locations, k=size),
+            "is_active": per_hotel(hotel["is_active"]),
+            "chain_id": per_hotel(hotel["chain_id"]),
+            "name": per_hotel(hotel["name"]),
+            "slug": [f"{slug}-{pk}" for slug, pk in zip(per_hotel(hotel["slug"]), pks)],
+            "hotel_id": per_hotel(hotel["id"]),
+            "status": rng.choices(self.statuses, self.weights, k=size),
+        }
+        constants = {
+            "created_at": self.now,
+            "updated_at": self.now,
+            "photo": "",
+            "created_by_id": created_by_id,
+        }
+        return columns, constants
+
+    # endregion
+
+    # region Load
+    def load(self, model: type, columns: dict, constants: dict) -> None:
+        if not len(columns["id"]):
+            return
+        if self.connection.vendor == "postgresql":
+            self.copy(model, columns, constants)
+        else:
+            self.insert(model, columns, constants)
+
+    def insert(self, model: type, columns: dict, constants: dict) -> None:
+        """
+        Inserts the rows with `executemany`, unlike `bulk_create` the fields
+        `pre_save` is skipped, so `AutoSlugField` does not look up every slug
+        """
+
+        fields = model._meta.concrete_fields
+        values = [
+            (
+                repeat(
+                    field.get_db_prep_save(constants[field.attname], self.connection)
+                )
+                if field.attname in constants
+                else columns[field.attname]
+            )
+            for field in fields
+        ]
+        placeholders = ", ".join(["%s"] * len(fields))
+        sql = f"INSERT INTO {self.get_table(model)} VALUES ({placeholders})"
+        with self.connection.cursor() as cursor:
+            cursor.executemany(sql, list(zip(*values)))
+
+    def copy(self, model: type, columns: dict, constants: dict) -> None:
+        """
+        Streams the rows to `COPY` in its text format
+        """
+
+        # the generated strings have no tab, new line or backslash to escape
+        # and the booleans are read from "True" and "False"
+        values = [
+            (
+                repeat(copy_value(constants[field.attname]))
+                if field.attname in constants
+                else map(str, columns[field.attname])
+            )
+            for field in model._meta.concrete_fields
+        ]
+        buffer = io.StringIO()
+        buffer.writelines(f"{line}\n" for line in map("\t".join, zip(*values)))
+        buffer.seek(0)
+
+        sql = f"COPY {self.get_table(model)} FROM STDIN"
+        with self.connection.cursor() as cursor:
+            if hasattr(cursor, "copy_expert"):
+                # psycopg2
+                cursor.copy_expert(sql, buffer)
+            else:
+                with cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def get_table(self, model: type) -> str:
+        """
+        Returns the quoted table with its columns
+        """
+
+        quote = self.connection.ops.quote_name
+        columns = ", ".join(
+            quote(field.column) for field in model._meta.concrete_fields
+        )
+        return f"{quote(model._meta.db_table)} ({columns})"
+
+    # endregion
+
+    # region Empty database
+    def load_parallel(
+        self, catalogue: Catalogue, hotels: int, drafts: int, created_by_id
+    ) -> None:
+        """
+        Copies the batches of every table over its own connection, while the
+        next batches are generated
+
+        Every batch is copied in its own transaction, which is safe without
+        the foreign keys. At most two batches per table wait to be copied.
+        """
+
+        executors = {
+            model: ThreadPoolExecutor(max_workers=1, thread_name_prefix="seed")
+            for model in MODELS
+        }
+        pending: deque = deque()
+        try:
+            for batch in self.generate(catalogue, hotels, drafts, created_by_id):
+                for model, columns, constants in batch:
+                    pending.append(
+                        executors[model].submit(self.load, model, columns, constants)
+                    )
+                while len(pending) > 2 * len(MODELS):
+                    pending.popleft().result()
+            for future in pending:
+                future.result()
+        finally:
+            for executor in executors.values():
+                executor.submit(self.close)
+                executor.shutdown()
+
+    def get_definitions(self) -> Definitions:
+        tables = [model._meta.db_table for model in MODELS]
+        with self.connection.cursor() as cursor:
+            cursor.execute(INDEXES_SQL, [tables])
+            indexes = cursor.fetchall()
+            cursor.execute(CONSTRAINTS_SQL, [tables])
+            constraints = cursor.fetchall()
+
+        quote = self.connection.ops.quote_name
+        definitions = Definitions(drop=[], indexes=[], constraints=[])
+        for row in constraints:
+            table, name, kind, definition, index_name, index, deferrable, deferred = row
+            name = quote(name)
+            definitions.drop.append(f"ALTER TABLE {table} DROP CONSTRAINT {name}")
+            if kind == "u":
+                # built like the other indexes, then turned into the constraint
+                definition = f"UNIQUE USING INDEX {index_name}"
+                if deferrable:
+                    definition += " DEFERRABLE"
+                if deferred:
+                    definition += " INITIALLY DEFERRED"
+                definitions.indexes.append(index)
+            definitions.constraints.append(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+            )
+        for _, name, index in indexes:
+            definitions.drop.append(f"DROP INDEX {quote(name)}")
+            definitions.indexes.append(index)
+        # the unique constraints before the foreign keys that may use them
+        definitions.constraints.reverse()
+        return definitions
+
+    def drop(self, definitions: Definitions) -> None:
+        self.execute(definitions.drop)
+
+    def rebuild(self, definitions: Definitions) -> None:
+        """
+        Builds the indexes spread over one connection per CPU, they lock the
+        tables in share mode so many are built at once on the same table, and
+        then adds the constraints, the foreign keys read the other tables
+        """
+
+        workers = min(os.cpu_count() or 1, len(definitions.indexes)) or 1
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="seed"
+        ) as executor:
+            futures = [
+                executor.submit(self.execute, definitions.indexes[index::workers], True)
+                for index in range(workers)
+            ]
+            for future in futures:
+                future.result()
+
+        self.execute(definitions.constraints)
+
+    def execute(self, statements: list, close: bool = False) -> None:
+        """
+        Executes the statements in one transaction over the connection of the
+        current thread
+
+        close: close the connection after
+        """
+
+        try:
+            with transaction.atomic(using=self.using):
+                with self.connection.cursor() as cursor:
+                    for statement in statements:
+                        cursor.execute(statement)
+        finally:
+            if close:
+                self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def delete(self) -> None:
+        """
+        Deletes the rows loaded in the empty tables
+        """
+
+        quote = self.connection.ops.quote_name
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            for model in reversed(MODELS):
+                cursor.execute(f"DELETE FROM {quote(model._meta.db_table)}")
+
+    # endregion
+
+
+def seed_catalogue(
+    chains: int,
+    hotels: int,
+    drafts: int,
+    created_by,
+    seed: int = 0,
+    batch_size: int = 10_000,
+    empty_db: bool = False,
+) -> Catalogue:
+    """
+    Creates a synthetic catalogue, see `CatalogueSeeder`
+
+    chains: number of chains
+    hotels: number of hotels per chain
+    drafts: number of drafts per hotel
+    created_by: author of the drafts
+    seed: seed of the random values
+    empty_db: load the empty tables without their indexes and constraints
+    """
+
+    return CatalogueSeeder(seed=seed, batch_size=batch_size).run(
+        chains, hotels, drafts, created_by, empty_db=empty_db
+    )
@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Iterable, Iterator
+
+from .models import Hotel
+
+# exported column: model lookup, the chain columns are joined in SQL
+COLUMNS = {
+    "id": "id",
+    "name": "name",
+    "slug": "slug",
+    "location": "location",
+    "is_active": "is_active",
+    "photo": "photo",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "chain.title": "chain__title",
+    "chain.slug": "chain__slug",
+}
+
+BLOCK_SIZE = 64 * 1024
+
+
+def export_rows(queryset=None, chunk_size: int = 2000) -> Iterator[tuple]:
+    """
+    Reads the hotels with a server side cursor, in the order of `COLUMNS`
+
+    queryset: hotels to export, all of them by default
+    chunk_size: rows fetched at once
+    """
+
+    queryset = Hotel.objects.all() if queryset is None else queryset
+    rows = queryset.order_by("id").values_list(*COLUMNS.values())
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield tuple(
+            value.isoformat() if isinstance(value, (datetime, date)) else value
+            for value in row
+        )
+
+
+def write_ndjson(rows: Iterable[tuple]) -> Iterator[bytes]:
+    """
+    Writes one hotel object per line, in blocks of about `BLOCK_SIZE` bytes
+    """
+
+    columns = list(COLUMNS)
+    lines: list = []
+    size = 0
+    for row in rows:
+        line = json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= BLOCK_SIZE:
+            yield "".join(lines).encode()
+            lines, size = [], 0
+    if lines:
+        yield "".join(lines).encode()
+
+
+def write_csv(rows: Iterable[tuple]) -> Iterator[bytes]:
+    """
+    Writes a header row and one hotel per row, in blocks of about
+    `BLOCK_SIZE` bytes
+    """
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= BLOCK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+WRITERS = {"ndjson": write_ndjson, "csv": write_csv}
+
+
+def gzip_stream(blocks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Compresses a stream of blocks on the fly in the gzip format
+    """
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for block in blocks:
+        if data := compressor.compress(block):
+            yield data
+    yield compressor.flush()
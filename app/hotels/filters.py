@@ -1,19 +1,103 @@
+from functools import reduce
+from operator import and_, or_
+
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Cast, Greatest, Upper
+
 from .models import Hotel, HotelChain
 from django_filters import rest_framework as filters
 
 
+class SearchFilter(filters.CharFilter):
+    """
+    Fuzzy search on some fields, ranked by similarity
+
+    Every word of the value must match one of the fields. On PostgreSQL a
+    word matches with the `pg_trgm` word similarity operator (typo tolerant)
+    or a substring match, both served by the GIN trigram indexes on the upper
+    cased fields, and the rows are ranked by the similarity of the whole
+    value. Other databases fall back to a substring match of every word,
+    ranked exact, prefix and then contained matches.
+    """
+
+    def __init__(self, search_fields: tuple, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.search_fields = search_fields
+
+    def filter(self, queryset, value):
+        value = (value or "").strip()
+        if not value:
+            return queryset
+
+        if connections[queryset.db].vendor == "postgresql":
+            queryset = self.trigram_search(queryset, value.upper())
+        else:
+            queryset = self.substring_search(queryset, value)
+        return queryset.order_by("-rank", "-id")
+
+    def trigram_search(self, queryset, value: str):
+        condition = reduce(
+            and_,
+            [
+                reduce(
+                    or_,
+                    [
+                        Q(TrigramWordSimilar(Upper(field), word))
+                        | Q(**{f"{field}__icontains": word})
+                        for field in self.search_fields
+                    ],
+                )
+                for word in value.split()
+            ],
+        )
+        ranks = [TrigramSimilarity(Upper(field), value) for field in self.search_fields]
+        rank = Greatest(*ranks) if len(ranks) > 1 else ranks[0]
+        # `similarity()` is a real, the cursors of the keyset pagination
+        # compare the rank with the double read back from the page
+        rank = Cast(rank, FloatField())
+        return queryset.filter(condition).annotate(rank=rank)
+
+    def substring_search(self, queryset, value: str):
+        condition = reduce(
+            and_,
+            [
+                reduce(
+                    or_,
+                    [
+                        Q(**{f"{field}__icontains": word})
+                        for field in self.search_fields
+                    ],
+                )
+                for word in value.split()
+            ],
+        )
+        whens = []
+        for score, lookup in ((3.0, "iexact"), (2.0, "istartswith")):
+            whens += [
+                When(**{f"{field}__{lookup}": value}, then=Value(score))
+                for field in self.search_fields
+            ]
+        rank = Case(*whens, default=Value(1.0), output_field=FloatField())
+        return queryset.filter(condition).annotate(rank=rank)
+
+
 class HotelChainFilter(filters.FilterSet):
-    name = filters.CharFilter(lookup_expr="icontains")
+    name = filters.CharFilter(field_name="title", lookup_expr="icontains")
+    search = SearchFilter(search_fields=("title",))
 
     class Meta:
         model = HotelChain
-        fields = ("name",)
+        fields = ("name", "search")
 
 
 class HotelFilter(filters.FilterSet):
     name = filters.CharFilter(lookup_expr="icontains")
     location = filters.CharFilter(lookup_expr="icontains")
+    search = SearchFilter(search_fields=("name", "location"))
 
     class Meta:
         model = Hotel
-        fields = ("name", "location")
+        fields = ("name", "location", "search")
@@ -0,0 +1,68 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models.fields.files import FieldFile
+
+from PIL import Image, ImageOps
+
+
+def variant_name(name: str, variant: str) -> str:
+    """
+    Returns the path of a variant, next to the photo
+
+    name: path of the photo, like `hotels/<uuid>.png`
+    variant: name of the variant, like `thumbnail`
+    return: `hotels/<uuid>_thumbnail.webp`
+    """
+
+    path = PurePosixPath(name)
+    return str(path.with_name(f"{path.stem}_{variant}.webp"))
+
+
+def render_variant(image: Image.Image, size: tuple, crop: bool) -> bytes:
+    """
+    Resizes the image and encodes it as WebP
+
+    image: RGB or RGBA image
+    size: (width, height) of the variant
+    crop: crops the image to the exact size, otherwise it fits in it without
+    upscaling
+    """
+
+    if crop:
+        image = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+    else:
+        image = image.copy()
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+
+    buffer = BytesIO()
+    image.save(buffer, "WEBP", quality=settings.HOTEL_PHOTO_VARIANT_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def generate_variants(photo: FieldFile) -> dict:
+    """
+    Generates the `HOTEL_PHOTO_VARIANTS` of a photo in its storage, named by
+    their content like the photo
+
+    photo: the photo of a hotel
+    return: the path of each variant
+    raises: OSError if the photo cannot be read as an image
+    """
+
+    with photo.open("rb") as file:
+        # applies the camera orientation, the variants have no EXIF
+        image = ImageOps.exif_transpose(Image.open(file))
+
+    if image.mode not in ("RGB", "RGBA"):
+        transparent = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if transparent else "RGB")
+
+    variants = {}
+    for variant, (width, height, crop) in settings.HOTEL_PHOTO_VARIANTS.items():
+        content = ContentFile(render_variant(image, (width, height), crop))
+        name = variant_name(photo.name, variant)
+        variants[variant] = photo.storage.save(name, content)
+    return variants
@@ -0,0 +1,272 @@
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_generation
+from .matchers import chain_matcher
+from .models import Hotel, HotelChain
+from .slugs import allocate_slugs
+from .tasks import send_notification_emails
+
+TRUE_VALUES = {"1", "true", "t", "yes", "y", "on"}
+
+LOCATIONS = {location for location, _ in settings.HOTEL_LOCATIONS}
+
+
+def _decode(lines: Iterable) -> Iterator[str]:
+    for line in lines:
+        yield line.decode("utf-8") if isinstance(line, bytes) else line
+
+
+def read_ndjson(lines: Iterable) -> Iterator[dict]:
+    """
+    Reads one hotel per line of a NDJSON stream
+
+    lines: bytes or str lines
+    """
+
+    for line in _decode(lines):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            row = {"error": f"Invalid JSON: {error}"}
+        yield row if isinstance(row, dict) else {"error": "Expected an object"}
+
+
+def read_csv(lines: Iterable) -> Iterator[dict]:
+    """
+    Reads one hotel per row of a CSV stream with a header row
+
+    lines: bytes or str lines
+    """
+
+    yield from csv.DictReader(_decode(lines))
+
+
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
+
+
+@dataclass
+class ImportReport:
+    """
+    Progress and throughput of an import
+    """
+
+    MAX_ERRORS = 100
+
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    chains_created: int = 0
+    errors: list = field(default_factory=list)
+    started_at: float = field(default_factory=perf_counter)
+
+    def add_error(self, line: int, message: str) -> None:
+        """
+        Counts a failed row, only the first `MAX_ERRORS` are kept
+        """
+
+        self.failed += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    @property
+    def elapsed(self) -> float:
+        return perf_counter() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "chains_created": self.chains_created,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.errors,
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"{self.rows} rows, {self.created} created, {self.updated} updated, "
+            f"{self.failed} failed, {self.rows_per_second:.1f} rows/sec"
+        )
+
+
+class HotelImporter:
+    """
+    Imports hotels in chunks with bulk queries
+
+    Every chunk is written in its own transaction. Chains are resolved or
+    created in batch, slugs are generated in bulk and `bulk_create` /
+    `bulk_update` bypass the per row signals, so the chain auto assignment
+    and the creation notification are done here: one summarised email per
+    chain once the import ends.
+    """
+
+    FIELDS = ("location", "is_active", "chain", "updated_at")
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        notify: bool = True,
+        progress: Optional[Callable[[ImportReport], None]] = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.notify = notify
+        self.progress = progress
+        self.report = ImportReport()
+        self.created_by_chain: dict = {}
+
+    def run(self, rows: Iterable[dict]) -> ImportReport:
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.chunk_size)):
+            self.import_chunk(chunk)
+            if self.progress:
+                self.progress(self.report)
+
+        if self.notify:
+            self.send_notifications()
+        return self.report
+
+    def clean(self, row: dict, line: int) -> Optional[dict]:
+        """
+        Validates a row and returns the hotel values, None if it is invalid
+        """
+
+        def fail(message: str) -> None:
+            self.report.add_error(line, message)
+
+        if "error" in row:
+            return fail(row["error"])
+
+        name = str(row.get("name") or "").strip()
+        if not name:
+            return fail("name: This field is required.")
+        if len(name) > Hotel._meta.get_field("name").max_length:
+            return fail("name: Ensure this field has no more than 50 characters.")
+
+        values: dict = {"name": name}
+
+        location = row.get("location")
+        if location:
+            if location not in LOCATIONS:
+                return fail(f'location: "{location}" is not a valid choice.')
+            values["location"] = location
+
+        is_active = row.get("is_active")
+        if is_active not in (None, ""):
+            values["is_active"] = str(is_active).strip().lower() in TRUE_VALUES
+
+        chain = row.get("chain", row.get("chain.title"))
+        if isinstance(chain, dict):
+            chain = chain.get("title")
+        if chain:
+            chain = str(chain).strip().title()
+            if len(chain) > HotelChain._meta.get_field("title").max_length:
+                return fail("chain: Ensure this field has no more than 50 characters.")
+            values["chain"] = chain
+
+        return values
+
+    def resolve_chains(self, titles: set) -> dict:
+        """
+        Returns the chains by title, creating the missing ones in bulk
+        """
+
+        chains = {
+            chain.title: chain for chain in HotelChain.objects.filter(title__in=titles)
+        }
+
+        missing = sorted(titles - set(chains))
+        if missing:
+            slugs = allocate_slugs(HotelChain, missing)
+            created = HotelChain.objects.bulk_create(
+                [HotelChain(title=title, slug=slugs[title]) for title in missing]
+            )
+            chains.update({chain.title: chain for chain in created})
+            self.report.chains_created += len(created)
+            chain_matcher.invalidate()
+            transaction.on_commit(chain_matcher.invalidate)
+
+        return chains
+
+    def import_chunk(self, chunk: list) -> None:
+        first_line = self.report.rows + 1
+        self.report.rows += len(chunk)
+
+        hotels: dict = {}
+        for line, row in enumerate(chunk, start=first_line):
+            values = self.clean(row, line)
+            if values:
+                hotels[values["name"]] = values
+
+        if not hotels:
+            return
+
+        with transaction.atomic():
+            chains = self.resolve_chains(
+                {values["chain"] for values in hotels.values() if "chain" in values}
+            )
+            for values in hotels.values():
+                if "chain" in values:
+                    values["chain"] = chains[values["chain"]]
+
+            now = timezone.now()
+            existing = Hotel.objects.filter(name__in=hotels).select_for_update()
+            updated = []
+            for hotel in existing:
+                for key, value in hotels.pop(hotel.name).items():
+                    setattr(hotel, key, value)
+                hotel.updated_at = now
+                hotel.assign_chain()
+                updated.append(hotel)
+            Hotel.objects.bulk_update(updated, self.FIELDS)
+
+            slugs = allocate_slugs(Hotel, list(hotels))
+            created = []
+            for name, values in hotels.items():
+                hotel = Hotel(slug=slugs[name], **values)
+                hotel.assign_chain()
+                created.append(hotel)
+            Hotel.objects.bulk_create(created)
+
+            # bulk queries bypass the signals that maintain the counters
+            HotelChain.objects.count_hotel_changes(  # type: ignore
+                [(hotel.counted_state, hotel.get_counted_state()) for hotel in updated]
+                + [(None, hotel.get_counted_state()) for hotel in created]
+            )
+            bump_generation(Hotel, HotelChain)
+
+        self.report.updated += len(updated)
+        self.report.created += len(created)
+        for hotel in created:
+            if hotel.chain_id:
+                self.created_by_chain.setdefault(hotel.chain_id, []).append(hotel)
+
+    def send_notifications(self) -> None:
+        chains = HotelChain.objects.filter(pk__in=self.created_by_chain).exclude(
+            email=""
+        )
+        emails = [
+            chain.hotels_creation_email(self.created_by_chain[chain.pk])
+            for chain in chains
+        ]
+        if emails:
+            # one task for all the chains, sent over one connection
+            send_notification_emails.delay(emails)
@@ -0,0 +1,167 @@
+import smtplib
+from contextlib import contextmanager
+from threading import Lock, local
+from time import monotonic, perf_counter
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from celery.utils.log import get_task_logger
+
+logger = get_task_logger(__name__)
+
+# errors of a connection closed by the server, the message is sent again
+# over a new connection
+DISCONNECTED = (smtplib.SMTPServerDisconnected, ConnectionError)
+
+
+def deduplicate_messages(messages: Iterable[tuple]) -> list:
+    """
+    Removes the recipients that already get a message with the same subject
+    and body, and the duplicated recipients of every message
+
+    The messages are not merged, so no recipient sees the addresses of
+    another message.
+
+    messages: (subject, message, recipients) tuples
+    return: (subject, message, recipients) tuples, without the messages left
+    without recipients
+    """
+
+    seen: dict = {}
+    deduplicated = []
+    for subject, message, recipients in messages:
+        sent = seen.setdefault((subject, message), set())
+        recipients = [
+            recipient
+            for recipient in dict.fromkeys(recipients)
+            if recipient not in sent
+        ]
+        if recipients:
+            sent.update(recipients)
+            deduplicated.append((subject, message, recipients))
+    return deduplicated
+
+
+class Mailer:
+    """
+    Sends emails over a persistent connection per thread
+
+    The connection of the `EMAIL_BACKEND` is kept open between tasks and
+    closed once it has been idle for `EMAIL_POOL_MAX_IDLE` seconds, before
+    the SMTP server drops it. Errors are logged and not raised, like
+    `fail_silently`.
+    """
+
+    def __init__(self) -> None:
+        self._local = local()
+        self._lock = Lock()
+        self.sent = 0
+        self.seconds = 0.0
+
+    def _get_connection(self):
+        connection = getattr(self._local, "connection", None)
+        used_at = getattr(self._local, "used_at", 0.0)
+        if connection and monotonic() - used_at > settings.EMAIL_POOL_MAX_IDLE:
+            self.close()
+            connection = None
+
+        if connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:  # pragma: no cover
+                logger.exception("Error closing the email connection")
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        """
+        Yields the pooled connection of the thread
+        """
+
+        try:
+            yield self._get_connection()
+        except Exception:
+            self.close()
+            raise
+        finally:
+            self._local.used_at = monotonic()
+
+    def send_messages(self, messages: list) -> int:
+        """
+        Sends email messages over the pooled connection, once more over a new
+        connection if the server closed it
+
+        The messages are sent one at a time, so only the ones that did not go
+        through are sent again over the new connection.
+
+        messages: EmailMessage instances
+        return: the number of messages sent
+        """
+
+        if not messages:
+            return 0
+
+        start = perf_counter()
+        sent = position = 0
+        for attempt in range(2):
+            try:
+                with self.connection() as connection:
+                    while position < len(messages):
+                        sent += connection.send_messages([messages[position]]) or 0
+                        position += 1
+                break
+            except DISCONNECTED:
+                if attempt:
+                    logger.exception("Email connection lost")
+            except Exception:
+                logger.exception("Error sending emails")
+                break
+
+        self.record(sent, perf_counter() - start)
+        return sent
+
+    def send(self, messages: Iterable[tuple]) -> int:
+        """
+        Sends the messages, each recipient gets a subject and body once
+
+        messages: (subject, message, recipients) tuples
+        return: the number of messages sent
+        """
+
+        return self.send_messages(
+            [
+                EmailMessage(subject, message, settings.EMAIL_NO_REPLY, recipients)
+                for subject, message, recipients in deduplicate_messages(messages)
+            ]
+        )
+
+    def record(self, sent: int, seconds: float) -> None:
+        with self._lock:
+            self.sent += sent
+            self.seconds += seconds
+
+    def stats(self) -> dict:
+        """
+        Returns the messages sent by this process and its throughput
+        """
+
+        with self._lock:
+            rate = self.sent / self.seconds if self.seconds else 0.0
+            return {
+                "sent": self.sent,
+                "seconds": round(self.seconds, 3),
+                "messages_per_second": round(rate, 1),
+            }
+
+
+mailer = Mailer()
@@ -0,0 +1,282 @@
+import json
+import platform
+import statistics
+from collections import Counter
+from time import perf_counter
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.hotels.cache import bump_generation
+from app.hotels.catalogue import WORDS, seed_catalogue
+from app.hotels.models import Hotel, HotelChain, HotelDraft
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def summarize(latencies: list, queries: list, statuses: Counter) -> dict:
+    """
+    Returns the throughput, latency percentiles (milliseconds) and query
+    counts of the requests of a scenario
+    """
+
+    total = sum(latencies)
+    milliseconds = sorted(latency * 1000 for latency in latencies)
+    if len(milliseconds) > 1:
+        cuts = statistics.quantiles(milliseconds, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = milliseconds[0]
+
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / total, 1) if total else None,
+        "latency_ms": {
+            "mean": round(statistics.fmean(milliseconds), 3),
+            "p50": round(p50, 3),
+            "p95": round(p95, 3),
+            "p99": round(p99, 3),
+            "max": round(milliseconds[-1], 3),
+        },
+        "queries": {
+            "median": statistics.median(queries),
+            "max": max(queries),
+        },
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a synthetic catalogue and measures the throughput, latency "
+        "percentiles and queries of the hotels, chains and drafts API with "
+        "the Django test client. Results are written as JSON. Runs inside a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chains", type=int, default=100)
+        parser.add_argument("--hotels", type=int, default=20, help="Per chain")
+        parser.add_argument("--drafts", type=int, default=1, help="Per hotel")
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per scenario"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--warm",
+            action="store_true",
+            help="Keeps the response cache between requests, cold by default",
+        )
+        parser.add_argument(
+            "--output", default="-", help="File of the JSON results, - for stdout"
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.requests = options["requests"]
+        hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+
+        with override_settings(ALLOWED_HOSTS=hosts), transaction.atomic():
+            user = get_user_model().objects.create_reviewer(  # type: ignore
+                email="bench@example.com", password=None
+            )
+            self.catalogue = seed_catalogue(
+                options["chains"],
+                options["hotels"],
+                options["drafts"],
+                created_by=user,
+                seed=options["seed"],
+            )
+            self.client = Client(
+                HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+            )
+            scenarios = {
+                name: self.run(*scenario)
+                for name, scenario in self.get_scenarios().items()
+            }
+            transaction.set_rollback(True)
+
+        # responses of the rolled back rows may be cached
+        bump_generation(Hotel, HotelChain)
+
+        results = json.dumps(
+            {"meta": self.get_meta(), "scenarios": scenarios}, indent=2
+        )
+        if options["output"] == "-":
+            self.stdout.write(results)
+        else:
+            with open(options["output"], "w") as file:
+                file.write(results + "\n")
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def get_meta(self) -> dict:
+        return {
+            "seed": self.options["seed"],
+            "chains": self.options["chains"],
+            "hotels_per_chain": self.options["hotels"],
+            "drafts_per_hotel": self.options["drafts"],
+            "requests": self.requests,
+            "cache": "warm" if self.options["warm"] else "cold",
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+        }
+
+    def get_scenarios(self) -> dict:
+        """
+        Returns the scenarios by name: the method and a function returning
+        the path and the body of the i-th request
+        """
+
+        def ids(values: range) -> tuple:
+            return values.start, values.stop - 1
+
+        chains = list(
+            HotelChain.objects.filter(pk__range=ids(self.catalogue.chains))
+            .order_by("pk")
+            .values_list("slug", flat=True)
+        )
+        hotels = list(
+            Hotel.objects.filter(pk__range=ids(self.catalogue.hotels))
+            .order_by("pk")
+            .values_list("slug", flat=True)
+        )
+        drafts = list(
+            HotelDraft.objects.filter(pk__range=ids(self.catalogue.drafts)).order_by(
+                "pk"
+            )
+        )
+        locations = [location for location, _ in settings.HOTEL_LOCATIONS]
+
+        def pick(values: list, i: int):
+            return values[i % len(values)]
+
+        return {
+            "hotels.list": ("get", lambda i: (reverse("hotel-list"), None)),
+            "hotels.detail": (
+                "get",
+                lambda i: (reverse("hotel-detail", args=[pick(hotels, i)]), None),
+            ),
+            "hotels.filter": (
+                "get",
+                lambda i: (reverse("hotel-list"), {"search": pick(WORDS, i)}),
+            ),
+            "hotels.create": (
+                "post",
+                lambda i: (
+                    reverse("hotel-list"),
+                    {
+                        "name": f"bench hotel {i}",
+                        "location": pick(locations, i),
+                        "chain": {"title": f"bench hotel chain {i}"},
+                    },
+                ),
+            ),
+            "hotels.update": (
+                "patch",
+                lambda i: (
+                    reverse("hotel-detail", args=[pick(hotels, i)]),
+                    {"location": pick(locations, i + 1)},
+                ),
+            ),
+            "chains.list": ("get", lambda i: (reverse("hotelchain-list"), None)),
+            "chains.detail": (
+                "get",
+                lambda i: (reverse("hotelchain-detail", args=[pick(chains, i)]), None),
+            ),
+            "chains.filter": (
+                "get",
+                lambda i: (reverse("hotelchain-list"), {"search": pick(WORDS, i)}),
+            ),
+            "chains.create": (
+                "post",
+                lambda i: (reverse("hotelchain-list"), {"title": f"bench chain {i}"}),
+            ),
+            "chains.update": (
+                "patch",
+                lambda i: (
+                    reverse("hotelchain-detail", args=[pick(chains, i)]),
+                    {"price_range": i % 4 + 1},
+                ),
+            ),
+            "drafts.list": ("get", lambda i: (reverse("hoteldraft-list"), None)),
+            "drafts.detail": (
+                "get",
+                lambda i: (
+                    reverse("hoteldraft-detail", args=[pick(drafts, i).slug]),
+                    None,
+                ),
+            ),
+            "drafts.create": (
+                "post",
+                lambda i: (
+                    reverse("hoteldraft-list"),
+                    {
+                        "name": f"bench draft {i}",
+                        "hotel": pick(hotels, i),
+                        "location": pick(locations, i),
+                        "chain": {"title": f"bench draft chain {i}"},
+                    },
+                ),
+            ),
+            "drafts.update": (
+                "patch",
+                lambda i: (
+                    reverse("hoteldraft-detail", args=[pick(drafts, i).slug]),
+                    {"location": pick(locations, i + 1)},
+                ),
+            ),
+            # already approved drafts are skipped once every draft is used
+            "drafts.approve": (
+                "post",
+                lambda i: (
+                    reverse("hoteldraft-approve"),
+                    {"ids": [pick(drafts, i).pk]},
+                ),
+            ),
+        }
+
+    def run(self, method: str, build) -> dict:
+        """
+        Sends the requests of a scenario, timing each one
+        """
+
+        request = getattr(self.client, method)
+        latencies, queries, statuses = [], [], Counter()
+
+        for i in range(self.requests):
+            path, data = build(i)
+            kwargs = {}
+            if method != "get":
+                kwargs["content_type"] = "application/json"
+            if not self.options["warm"]:
+                bump_generation(Hotel, HotelChain)
+
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = perf_counter()
+                response = request(path, data, **kwargs)
+                latencies.append(perf_counter() - start)
+
+            queries.append(counter.count)
+            statuses[response.status_code] += 1
+
+        return summarize(latencies, queries, statuses)
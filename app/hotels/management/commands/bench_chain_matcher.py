@@ -0,0 +1,69 @@
+import random
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.text import slugify
+
+from app.hotels.catalogue import WORDS
+from app.hotels.matchers import chain_matcher
+from app.hotels.models import Hotel, HotelChain
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares hotel saves/sec resolving the auto assign chain with the "
+        "database lookup and with the in-memory matcher. Runs inside a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chains", type=int, default=10_000)
+        parser.add_argument("--saves", type=int, default=500)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        with transaction.atomic():
+            self.seed_chains(rng, options["chains"])
+            names = [
+                f"{rng.choice(WORDS)} {rng.choice(WORDS)} hotel {i}"
+                for i in range(options["saves"] * 2)
+            ]
+            database = self.run(names[: options["saves"]], self.database_lookup)
+            matcher = self.run(names[options["saves"] :], None)
+            transaction.set_rollback(True)
+
+        chain_matcher.invalidate()
+
+        self.stdout.write(f"chains: {options['chains']}, saves: {options['saves']}")
+        self.stdout.write(f"database lookup: {database:.1f} saves/sec")
+        self.stdout.write(f"in-memory matcher: {matcher:.1f} saves/sec")
+
+    def seed_chains(self, rng: random.Random, size: int) -> None:
+        chains = []
+        for i in range(size):
+            title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}".title()
+            chains.append(
+                HotelChain(title=title, slug=slugify(title), auto_assign=True)
+            )
+        HotelChain.objects.bulk_create(chains, batch_size=1000)
+        chain_matcher.invalidate()
+
+    @staticmethod
+    def database_lookup(hotel: Hotel) -> None:
+        chains = HotelChain.objects.filter_by_title_with_auto_assign(hotel.name)  # type: ignore
+        hotel.chain = chains.first()
+
+    def run(self, names: list, resolve) -> float:
+        # warm the matcher index, it is built once per process
+        chain_matcher.match(names[0])
+
+        start = perf_counter()
+        for name in names:
+            hotel = Hotel(name=name)
+            if resolve:
+                resolve(hotel)
+            hotel.save()
+        return len(names) / (perf_counter() - start)
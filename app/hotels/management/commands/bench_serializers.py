@@ -0,0 +1,132 @@
+import json
+import platform
+from time import perf_counter
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from app.hotels.catalogue import seed_catalogue
+from app.hotels.views import HotelChainViewSet, HotelViewSet
+
+
+def serialize(view, rows: int) -> list:
+    """
+    Returns the data of the first rows of the list with the serializer
+    """
+
+    queryset = view.get_queryset()[:rows]
+    return view.get_serializer(queryset, many=True).data
+
+
+def read(view, rows: int) -> list:
+    """
+    Returns the data of the first rows of the list with the row reader
+    """
+
+    reader = view.reader_class(context=view.get_serializer_context())
+    queryset = view.get_queryset().prefetch_related(None)
+    return reader.to_representation(queryset.values(*reader.columns)[:rows])
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a synthetic catalogue and measures the rows per second of the "
+        "hotels and chains lists built by the serializers and by the row "
+        "readers, queries included. Results are written as JSON. Runs inside "
+        "a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chains", type=int, default=100)
+        parser.add_argument("--hotels", type=int, default=20, help="Per chain")
+        parser.add_argument(
+            "--rows", type=int, default=1000, help="Rows of every measure"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Measures, the best one is kept"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output", default="-", help="File of the JSON results, - for stdout"
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+
+        with override_settings(ALLOWED_HOSTS=hosts), transaction.atomic():
+            user = get_user_model().objects.create_reviewer(  # type: ignore
+                email="bench@example.com", password=None
+            )
+            seed_catalogue(
+                options["chains"],
+                options["hotels"],
+                0,
+                created_by=user,
+                seed=options["seed"],
+            )
+            request = Request(RequestFactory().get("/"))
+            lists = {
+                "hotels.list": HotelViewSet(
+                    request=request, action="list", format_kwarg=None, kwargs={}
+                ),
+                "chains.list": HotelChainViewSet(
+                    request=request, action="list", format_kwarg=None, kwargs={}
+                ),
+            }
+            results = {name: self.run(view) for name, view in lists.items()}
+            transaction.set_rollback(True)
+
+        results = json.dumps({"meta": self.get_meta(), "lists": results}, indent=2)
+        if options["output"] == "-":
+            self.stdout.write(results)
+        else:
+            with open(options["output"], "w") as file:
+                file.write(results + "\n")
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def get_meta(self) -> dict:
+        return {
+            "seed": self.options["seed"],
+            "chains": self.options["chains"],
+            "hotels_per_chain": self.options["hotels"],
+            "repeat": self.options["repeat"],
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+        }
+
+    def run(self, view) -> dict:
+        """
+        Measures the serializer and the reader on the same rows
+        """
+
+        renderer = JSONRenderer()
+        measures = {}
+        contents = []
+        for name, build in (("serializer", serialize), ("reader", read)):
+            best = None
+            for _ in range(self.options["repeat"]):
+                start = perf_counter()
+                data = build(view, self.options["rows"])
+                elapsed = perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            contents.append(renderer.render(data))
+            measures[name] = {
+                "rows": len(data),
+                "ms": round(best * 1000, 3),
+                "rows_per_sec": round(len(data) / best) if best else None,
+            }
+
+        serializer, reader = measures["serializer"]["ms"], measures["reader"]["ms"]
+        return {
+            **measures,
+            "speedup": round(serializer / reader, 2) if reader else None,
+            "identical": contents[0] == contents[1],
+        }
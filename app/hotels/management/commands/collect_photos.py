@@ -0,0 +1,104 @@
+import posixpath
+from datetime import timedelta
+from typing import Iterator
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from app.config.storage import photo_storage
+from app.hotels.models import StoredFile
+
+
+def walk(storage, directory: str = "") -> Iterator[str]:
+    """
+    Yields the name of every file of the storage
+    """
+
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield posixpath.join(directory, name)
+    for name in directories:
+        yield from walk(storage, posixpath.join(directory, name))
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the photo files without references and the files of the "
+        "media root that are not stored files, once they are older than "
+        "HOTEL_PHOTO_GC_GRACE seconds"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace",
+            type=int,
+            default=settings.HOTEL_PHOTO_GC_GRACE,
+            help="Seconds a file is kept after its last use",
+        )
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Recomputes the references from the hotels and drafts first",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Lists the files, deletes none"
+        )
+
+    def handle(self, *args, **options):
+        storage = photo_storage()
+        limit = timezone.now() - timedelta(seconds=options["grace"])
+        self.dry_run = options["dry_run"]
+        self.deleted = self.freed = 0
+
+        if options["recount"]:
+            fixed = StoredFile.objects.recount()  # type: ignore
+            self.stdout.write(f"{fixed} stored files recounted")
+
+        with transaction.atomic():
+            unreferenced = list(
+                StoredFile.objects.filter(references=0, updated_at__lt=limit)
+                .select_for_update(skip_locked=True)
+                .values_list("pk", "name")
+            )
+            collected = [
+                pk for pk, name in unreferenced if self.collect(storage, name, limit)
+            ]
+            if not self.dry_run:
+                StoredFile.objects.filter(pk__in=collected).delete()
+
+        # files of failed uploads and of rolled back transactions
+        stored = set(StoredFile.objects.values_list("name", flat=True))
+        for name in walk(storage):
+            if name not in stored:
+                self.collect(storage, name, limit)
+
+        action = "to delete" if self.dry_run else "deleted"
+        self.stdout.write(f"{self.deleted} files {action}, {self.freed} bytes")
+
+    def collect(self, storage, name: str, limit) -> bool:
+        """
+        Deletes a file unless it was used after the limit, see
+        `ContentAddressedStorage.delete_unused`
+
+        return: False if the file was kept
+        """
+
+        if not storage.exists(name):
+            return True
+
+        if self.dry_run:
+            if storage.get_modified_time(name) >= limit:
+                return False
+            self.stdout.write(name)
+            size = storage.size(name)
+        else:
+            # rechecked once the file is moved aside, an identical upload may
+            # be reusing it
+            size = storage.delete_unused(name, limit.timestamp())
+            if size is None:
+                return False
+        self.deleted += 1
+        self.freed += size
+        return True
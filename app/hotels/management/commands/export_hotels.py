@@ -0,0 +1,42 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.hotels.exporters import WRITERS, export_rows, gzip_stream
+
+
+class Command(BaseCommand):
+    help = "Writes every hotel to a NDJSON or CSV file, gzipped if it ends in .gz"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to write, - to write stdout")
+        parser.add_argument(
+            "--format",
+            choices=sorted(WRITERS),
+            help="Format of the file, guessed from its extension by default",
+        )
+        parser.add_argument("--gzip", action="store_true", help="Compress the file")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        compress = options["gzip"] or path.endswith(".gz")
+        extension = path.removesuffix(".gz").rsplit(".", 1)[-1].lower()
+        file_format = options["format"] or extension
+        if file_format not in WRITERS:
+            raise CommandError(f"Unknown format, use --format {'|'.join(WRITERS)}")
+
+        stream = WRITERS[file_format](export_rows(chunk_size=options["chunk_size"]))
+        if compress:
+            stream = gzip_stream(stream)
+
+        if path == "-":
+            for block in stream:
+                sys.stdout.buffer.write(block)
+            sys.stdout.buffer.flush()
+            return
+
+        with open(path, "wb") as file:
+            for block in stream:
+                file.write(block)
+        self.stdout.write(f"Hotels exported to {path}")
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from app.hotels.models import Hotel
+from app.hotels.tasks import generate_photo_variants
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the photo variants of the hotels, the ones without variants "
+        "by default"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true", help="Generates them again for all hotels"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Hotels per task"
+        )
+
+    def handle(self, *args, **options):
+        hotels = Hotel.objects.exclude(photo="")
+        if not options["all"]:
+            hotels = hotels.filter(photo_variants={})
+
+        ids = list(hotels.order_by("pk").values_list("pk", flat=True))
+        size = options["batch_size"]
+        for start in range(0, len(ids), size):
+            generate_photo_variants.delay(ids[start : start + size])
+        self.stdout.write(f"Photo variants of {len(ids)} hotels queued")
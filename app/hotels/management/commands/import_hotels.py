@@ -0,0 +1,45 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.hotels.importers import READERS, HotelImporter
+
+
+class Command(BaseCommand):
+    help = "Creates or updates hotels (by name) from a NDJSON or CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, - to read stdin")
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Format of the file, guessed from its extension by default",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--no-notify",
+            action="store_true",
+            help="Do not send the creation emails to the chains",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or path.rsplit(".", 1)[-1].lower()
+        if file_format not in READERS:
+            raise CommandError(f"Unknown format, use --format {'|'.join(READERS)}")
+
+        importer = HotelImporter(
+            chunk_size=options["chunk_size"],
+            notify=not options["no_notify"],
+            progress=lambda report: self.stdout.write(str(report)),
+        )
+
+        if path == "-":
+            report = importer.run(READERS[file_format](sys.stdin))
+        else:
+            with open(path, encoding="utf-8", newline="") as file:
+                report = importer.run(READERS[file_format](file))
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(f"Imported {report}"))
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.hotels.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the tombstones older than HOTEL_TOMBSTONE_RETENTION_DAYS, "
+        "sync tokens older than that require a full sync"
+    )
+
+    def handle(self, *args, **options):
+        limit = timezone.now() - timedelta(days=settings.HOTEL_TOMBSTONE_RETENTION_DAYS)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=limit).delete()
+        self.stdout.write(f"{deleted} tombstones deleted")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from app.hotels.cache import bump_generation
+from app.hotels.models import HotelChain
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the stored hotel counters of the chains that are out of "
+        "sync with their hotels"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "chains", nargs="*", type=int, help="Chain ids to check, all by default"
+        )
+
+    def handle(self, *args, **options):
+        fixed = HotelChain.objects.recount(options["chains"] or None)  # type: ignore
+        if fixed:
+            bump_generation(HotelChain)
+        self.stdout.write(f"{fixed} chains recounted")
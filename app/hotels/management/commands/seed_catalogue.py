@@ -0,0 +1,70 @@
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from app.hotels.catalogue import CatalogueSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates a deterministic synthetic catalogue of chains, hotels and "
+        "drafts with COPY on PostgreSQL, without model signals, notifications "
+        "or tasks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chains", type=int, default=1000)
+        parser.add_argument("--hotels", type=int, default=100, help="Per chain")
+        parser.add_argument("--drafts", type=int, default=1, help="Per hotel")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Hotels generated and loaded at once",
+        )
+        parser.add_argument(
+            "--empty-db",
+            action="store_true",
+            help=(
+                "Load the empty tables of a PostgreSQL database in parallel, "
+                "without their secondary indexes, unique constraints and "
+                "foreign keys, which are rebuilt afterwards. Not one "
+                "transaction, never on a database in use"
+            ),
+        )
+        parser.add_argument(
+            "--author",
+            default="seed@example.com",
+            help="Email of the author of the drafts, created as a reviewer",
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        author = User.objects.filter(email=options["author"]).first()
+        if author is None:
+            author = User.objects.create_reviewer(  # type: ignore
+                email=options["author"], password=None
+            )
+
+        seeder = CatalogueSeeder(seed=options["seed"], batch_size=options["batch_size"])
+        start = perf_counter()
+        try:
+            catalogue = seeder.run(
+                options["chains"],
+                options["hotels"],
+                options["drafts"],
+                created_by=author,
+                empty_db=options["empty_db"],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        elapsed = perf_counter() - start
+
+        rows = len(catalogue.chains) + len(catalogue.hotels) + len(catalogue.drafts)
+        self.stdout.write(
+            f"{len(catalogue.chains)} chains, {len(catalogue.hotels)} hotels and "
+            f"{len(catalogue.drafts)} drafts created in {elapsed:.1f} seconds "
+            f"({rows / elapsed:.0f} rows/sec)"
+        )
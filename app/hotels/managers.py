@@ -1,12 +1,15 @@
-from typing import Any
-from django.db import models
-from django.db.models import Q, F
+from collections import Counter, defaultdict
+from typing import Any, Iterable, Optional
+from django.db import models, transaction
+from django.db.models import Q, F, Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Now
 from django.apps import apps
 
 from functools import reduce
 
 HotelModel = lambda: apps.get_model("hotels", "Hotel")
 HotelChainModel = lambda: apps.get_model("hotels", "HotelChain")
+HotelDraftModel = lambda: apps.get_model("hotels", "HotelDraft")
 
 
 class HotelChainManager(models.Manager):
@@ -35,6 +38,71 @@ class HotelChainManager(models.Manager):
         )
         return self.filter(query)
 
+    def count_hotel_changes(self, changes: Iterable[tuple]) -> None:
+        """
+        Updates the stored hotel counters of the chains with F() expressions,
+        one UPDATE per distinct change of the counters
+
+        changes: (old, new) pairs of hotel (chain_id, is_active) states,
+        None for a hotel that did not exist or was deleted
+        """
+
+        deltas: dict = defaultdict(lambda: [0, 0])
+        for old, new in changes:
+            for state, sign in ((old, -1), (new, 1)):
+                if state and state[0]:
+                    deltas[state[0]][0] += sign
+                    deltas[state[0]][1] += sign * bool(state[1])
+
+        chains_by_delta: dict = defaultdict(list)
+        for chain_id, (hotels, active) in deltas.items():
+            if hotels or active:
+                chains_by_delta[(hotels, active)].append(chain_id)
+
+        for (hotels, active), chain_ids in chains_by_delta.items():
+            self.filter(pk__in=chain_ids).update(
+                hotel_count=F("hotel_count") + hotels,
+                active_hotel_count=F("active_hotel_count") + active,
+                updated_at=Now(),
+            )
+
+    def recount(self, chain_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recomputes the stored hotel counters of the chains that are out of sync
+
+        chain_ids: chains to check, all of them by default
+        return: the number of chains fixed
+        """
+
+        hotels = (
+            HotelModel()
+            .objects.filter(chain=OuterRef("pk"))
+            .order_by()
+            .values("chain")
+            .annotate(counted=Count("pk"))
+            .values("counted")
+        )
+        hotel_count = Coalesce(Subquery(hotels), 0)
+        active_hotel_count = Coalesce(Subquery(hotels.filter(is_active=True)), 0)
+
+        chains = self.all() if chain_ids is None else self.filter(pk__in=chain_ids)
+        with transaction.atomic():
+            out_of_sync = list(
+                chains.annotate(
+                    hotels_counted=hotel_count, active_counted=active_hotel_count
+                )
+                .exclude(
+                    hotel_count=F("hotels_counted"),
+                    active_hotel_count=F("active_counted"),
+                )
+                .values_list("pk", flat=True)
+            )
+            return self.filter(pk__in=out_of_sync).update(
+                hotel_count=hotel_count,
+                active_hotel_count=active_hotel_count,
+                updated_at=Now(),
+            )
+
 
 class AbstractHotelManager(models.Manager):
     def nested_create(self, **kwargs: Any) -> Any:
@@ -61,3 +129,92 @@ class AbstractHotelManager(models.Manager):
             instance.chain = chain
         instance.save()
         return instance
+
+
+class HotelManager(AbstractHotelManager):
+    def set_active(self, queryset: Any, is_active: bool) -> int:
+        """
+        Activates or deactivates the hotels of the queryset in bulk, keeping
+        the hotel counters of their chains in sync
+
+        queryset: hotels to update
+        is_active: new value
+        return: the number of hotels changed
+        """
+
+        with transaction.atomic():
+            changed = list(
+                queryset.exclude(is_active=is_active)
+                .select_for_update()
+                .values_list("pk", "chain_id")
+            )
+            self.filter(pk__in=[pk for pk, _ in changed]).update(
+                is_active=is_active, updated_at=Now()
+            )
+            HotelChainModel().objects.count_hotel_changes(
+                ((chain_id, not is_active), (chain_id, is_active))
+                for _, chain_id in changed
+            )
+        return len(changed)
+
+
+class StoredFileManager(models.Manager):
+    def count_references(self, changes: Iterable[tuple]) -> None:
+        """
+        Updates the references of the photo files with F() expressions, one
+        UPDATE per distinct change of the references
+
+        changes: (old, new) pairs of the file names used by a hotel or draft,
+        empty for an instance that did not exist or was deleted
+        """
+
+        deltas: Counter = Counter()
+        for old, new in changes:
+            deltas.subtract(name for name in old if name)
+            deltas.update(name for name in new if name)
+
+        names_by_delta: dict = defaultdict(list)
+        for name, delta in deltas.items():
+            if delta:
+                names_by_delta[delta].append(name)
+        if not names_by_delta:
+            return
+
+        self.bulk_create(
+            [self.model(name=name) for name, delta in deltas.items() if delta > 0],
+            ignore_conflicts=True,
+        )
+        for delta, names in names_by_delta.items():
+            self.filter(name__in=names).update(
+                references=Greatest(F("references") + delta, Value(0)),
+                updated_at=Now(),
+            )
+
+    def recount(self) -> int:
+        """
+        Recomputes the references of all the files from the photos of the
+        hotels and drafts
+
+        return: the number of files fixed
+        """
+
+        counted: Counter = Counter()
+        hotels = HotelModel().objects.exclude(photo="")
+        for photo, variants in hotels.values_list("photo", "photo_variants"):
+            counted.update([photo, *(variants or {}).values()])
+        drafts = HotelDraftModel().objects.exclude(photo="")
+        counted.update(drafts.values_list("photo", flat=True))
+
+        with transaction.atomic():
+            stored = dict(self.values_list("name", "references"))
+            self.bulk_create(
+                [self.model(name=name) for name in counted.keys() - stored.keys()],
+                ignore_conflicts=True,
+            )
+            fixed = 0
+            for name in counted.keys() | stored.keys():
+                if stored.get(name) != counted[name]:
+                    fixed += self.filter(name=name).update(
+                        references=counted[name], updated_at=Now()
+                    )
+            return fixed
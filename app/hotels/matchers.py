@@ -0,0 +1,142 @@
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from threading import Lock, local
+from typing import Optional
+from weakref import ref
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .managers import HotelChainModel
+
+
+class ChainMatcher:
+    """
+    Process-local index of the auto assign chains
+
+    Every word of a chain title is indexed by all its suffixes in a sorted
+    list, so the chains whose title contains a given word are found with a
+    binary search instead of a `title__icontains` scan of the chains table.
+
+    The index is built lazily and rebuilt after `invalidate`, which is called
+    from the `HotelChain` signals. A version stored in the cache lets other
+    processes notice the invalidation.
+
+    An index built inside a transaction may contain uncommitted chains, so it
+    is only kept for the current thread and dropped once that transaction is
+    rolled back.
+    """
+
+    VERSION_KEY = "hotels:chain-matcher:version"
+    MIN_TITLE_LENGTH = 3
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._version: Optional[int] = None
+        self._index: tuple = ([], {}, {}, {})
+        self._transient = local()
+
+    @staticmethod
+    def tokenize(text: str) -> list:
+        return text.lower().split()
+
+    def build(self) -> tuple:
+        """
+        Loads the auto assign chains and builds the suffix index
+
+        return: the sorted suffixes, the chains of each suffix and word, and
+        the title length of each chain
+        """
+
+        chains = HotelChainModel().objects.filter(auto_assign=True)
+
+        postings: dict = defaultdict(set)
+        words: dict = defaultdict(set)
+        lengths = {}
+        for pk, title in chains.values_list("pk", "title"):
+            if len(title) <= self.MIN_TITLE_LENGTH:
+                continue
+
+            lengths[pk] = len(title)
+            for word in set(self.tokenize(title)):
+                words[word].add(pk)
+                for i in range(len(word)):
+                    postings[word[i:]].add(pk)
+
+        return sorted(postings), dict(postings), dict(words), lengths
+
+    def invalidate(self) -> None:
+        """
+        Drops the index of this process and tells the other ones to rebuild
+        """
+
+        with self._lock:
+            self._version = None
+        self._transient.__dict__.clear()
+        try:
+            cache.incr(self.VERSION_KEY)
+        except ValueError:
+            cache.add(self.VERSION_KEY, 1, timeout=None)
+
+    def _get_index(self) -> tuple:
+        version = cache.get_or_set(self.VERSION_KEY, 0, timeout=None)
+        if self._version is not None and self._version == version:
+            return self._index
+
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            index = self.build()
+            with self._lock:
+                self._index, self._version = index, version
+            return index
+
+        # only Django references the guard, it is dropped on rollback and
+        # drops the index of the transaction on commit
+        guard = getattr(self._transient, "guard", None)
+        if guard is None or guard() is None:
+            index = self.build()
+            guard = self._transient.__dict__.clear
+            self._transient.guard, self._transient.index = ref(guard), index
+            transaction.on_commit(guard)
+        return self._transient.index
+
+    @staticmethod
+    def _lookup(suffixes: list, postings: dict, word: str) -> set:
+        found: set = set()
+        for suffix in suffixes[bisect_left(suffixes, word) :]:
+            if not suffix.startswith(word):
+                break
+            found |= postings[suffix]
+        return found
+
+    def match(self, name: str) -> Optional[int]:
+        """
+        Returns the pk of the chain that best matches the hotel name
+
+        A chain matches when any word of the name is contained in its title.
+        Chains are ranked by the number of matched words, then by the number
+        of words equal to a title word, then by the shortest title and
+        finally by pk, so the result is deterministic.
+
+        name: hotel name
+        return: the chain pk if any chain matches, None otherwise
+        """
+
+        suffixes, postings, words, lengths = self._get_index()
+
+        matched: Counter = Counter()
+        exact: Counter = Counter()
+        for word in set(self.tokenize(name)):
+            matched.update(self._lookup(suffixes, postings, word))
+            exact.update(words.get(word, ()))
+
+        if not matched:
+            return None
+
+        return min(
+            matched,
+            key=lambda pk: (-matched[pk], -exact[pk], lengths[pk], pk),
+        )
+
+
+chain_matcher = ChainMatcher()
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:17
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0023_alter_hotel_location_alter_hoteldraft_location"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="hotel",
+            name="related_hotels",
+        ),
+    ]
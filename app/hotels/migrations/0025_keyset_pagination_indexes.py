@@ -0,0 +1,31 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0024_remove_hotel_related_hotels"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="hotel",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="hotel_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hotelchain",
+            index=models.Index(fields=["title", "id"], name="hotelchain_title_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="hoteldraft",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="hoteldraft_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0025_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=50, verbose_name="Model")),
+                ("object_id", models.BigIntegerField(verbose_name="Object Id")),
+                ("slug", models.CharField(max_length=250, verbose_name="Slug")),
+                (
+                    "deleted_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Deleted At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Tombstone",
+                "verbose_name_plural": "Tombstones",
+                "indexes": [
+                    models.Index(
+                        fields=["model", "deleted_at"],
+                        name="tombstone_model_deleted_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# GIN trigram indexes on the upper cased columns, they serve the similarity
+# operator of the search and the `UPPER(...) LIKE '%x%'` of `icontains`
+INDEXES = (
+    ("hotel_name_trgm_idx", "hotels_hotel", "name"),
+    ("hotel_location_trgm_idx", "hotels_hotel", "location"),
+    ("hotelchain_title_trgm_idx", "hotels_hotelchain", "title"),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin (UPPER({column}::text) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, _, _ in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0026_tombstone"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:39
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_hotels(apps, schema_editor):
+    Hotel = apps.get_model("hotels", "Hotel")
+    HotelChain = apps.get_model("hotels", "HotelChain")
+
+    hotels = (
+        Hotel.objects.filter(chain=OuterRef("pk"))
+        .order_by()
+        .values("chain")
+        .annotate(counted=Count("pk"))
+        .values("counted")
+    )
+    HotelChain.objects.update(
+        hotel_count=Coalesce(Subquery(hotels), 0),
+        active_hotel_count=Coalesce(Subquery(hotels.filter(is_active=True)), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0027_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hotelchain",
+            name="active_hotel_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Active Hotel Count"
+            ),
+        ),
+        migrations.AddField(
+            model_name="hotelchain",
+            name="hotel_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Hotel Count"
+            ),
+        ),
+        migrations.RunPython(count_hotels, migrations.RunPython.noop),
+    ]
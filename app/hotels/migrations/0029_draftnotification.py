@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0028_hotelchain_hotel_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DraftNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "draft",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="hotels.hoteldraft",
+                        verbose_name="Draft",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Draft Notification",
+                "verbose_name_plural": "Draft Notifications",
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0029_draftnotification"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hotel",
+            name="photo_variants",
+            field=models.JSONField(
+                blank=True, default=dict, editable=False, verbose_name="Photo Variants"
+            ),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:06
+
+import app.config.storage
+import app.config.utils
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def count_references(apps, schema_editor):
+    Hotel = apps.get_model("hotels", "Hotel")
+    HotelDraft = apps.get_model("hotels", "HotelDraft")
+    StoredFile = apps.get_model("hotels", "StoredFile")
+
+    references: Counter = Counter()
+    hotels = Hotel.objects.exclude(photo="")
+    for photo, variants in hotels.values_list("photo", "photo_variants").iterator():
+        references.update([photo, *(variants or {}).values()])
+    drafts = HotelDraft.objects.exclude(photo="")
+    references.update(drafts.values_list("photo", flat=True).iterator())
+
+    StoredFile.objects.bulk_create(
+        [StoredFile(name=name, references=count) for name, count in references.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0030_hotel_photo_variants"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="hotel",
+            name="photo",
+            field=models.ImageField(
+                blank=True,
+                storage=app.config.storage.photo_storage,
+                upload_to=app.config.utils.photo_directory_path,
+                verbose_name="Photo",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="hoteldraft",
+            name="photo",
+            field=models.ImageField(
+                blank=True,
+                storage=app.config.storage.photo_storage,
+                upload_to=app.config.utils.photo_directory_path,
+                verbose_name="Photo",
+            ),
+        ),
+        migrations.CreateModel(
+            name="StoredFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=255, unique=True, verbose_name="Name"),
+                ),
+                (
+                    "references",
+                    models.PositiveIntegerField(default=0, verbose_name="References"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Stored File",
+                "verbose_name_plural": "Stored Files",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("references", 0)),
+                        fields=["updated_at"],
+                        name="storedfile_unreferenced_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
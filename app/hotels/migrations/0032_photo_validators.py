@@ -0,0 +1,38 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:12
+
+import app.config.storage
+import app.config.utils
+import app.hotels.uploads
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0031_stored_files"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="hotel",
+            name="photo",
+            field=models.ImageField(
+                blank=True,
+                storage=app.config.storage.photo_storage,
+                upload_to=app.config.utils.photo_directory_path,
+                validators=[app.hotels.uploads.validate_photo],
+                verbose_name="Photo",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="hoteldraft",
+            name="photo",
+            field=models.ImageField(
+                blank=True,
+                storage=app.config.storage.photo_storage,
+                upload_to=app.config.utils.photo_directory_path,
+                validators=[app.hotels.uploads.validate_photo],
+                verbose_name="Photo",
+            ),
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:38
+
+import app.hotels.slugs
+import re
+
+from django.db import migrations, models
+
+SUFFIX = re.compile(r"^(.+)-(\d+)$")
+
+
+def count_slugs(apps, schema_editor):
+    """
+    Stores the last index of every base slug in use, a slug is taken as the
+    first slug of its own base and as the `<index>` slug of its prefix
+    """
+
+    SlugCounter = apps.get_model("hotels", "SlugCounter")
+
+    counters = []
+    for name in ("HotelChain", "Hotel", "HotelDraft"):
+        model = apps.get_model("hotels", name)
+        last: dict = {}
+        for slug in model.objects.values_list("slug", flat=True).iterator():
+            last[slug] = max(last.get(slug, 0), 1)
+            match = SUFFIX.match(slug)
+            if match:
+                base, index = match.group(1), int(match.group(2))
+                last[base] = max(last.get(base, 0), index)
+
+        scope = f"hotels.{name.lower()}.slug"
+        counters.extend(
+            SlugCounter(scope=scope, base=base, last_index=index)
+            for base, index in last.items()
+        )
+    SlugCounter.objects.bulk_create(counters, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0032_photo_validators"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlugCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scope", models.CharField(max_length=100, verbose_name="Scope")),
+                ("base", models.CharField(max_length=255, verbose_name="Base")),
+                (
+                    "last_index",
+                    models.PositiveIntegerField(default=0, verbose_name="Last Index"),
+                ),
+            ],
+            options={
+                "verbose_name": "Slug Counter",
+                "verbose_name_plural": "Slug Counters",
+            },
+        ),
+        migrations.AlterField(
+            model_name="hotel",
+            name="slug",
+            field=app.hotels.slugs.AllocatedSlugField(
+                editable=False, populate_from="name", unique=True, verbose_name="Slug"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="hotelchain",
+            name="slug",
+            field=app.hotels.slugs.AllocatedSlugField(
+                editable=False, populate_from="title", unique=True, verbose_name="Slug"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="hoteldraft",
+            name="slug",
+            field=app.hotels.slugs.AllocatedSlugField(
+                editable=False,
+                max_length=250,
+                populate_from="name",
+                unique=True,
+                verbose_name="Slug",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="slugcounter",
+            constraint=models.UniqueConstraint(
+                fields=("scope", "base"), name="slugcounter_scope_base_uniq"
+            ),
+        ),
+        migrations.RunPython(count_slugs, migrations.RunPython.noop),
+    ]
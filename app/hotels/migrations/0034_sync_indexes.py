@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-18 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0033_slug_counters"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="tombstone",
+            name="tombstone_model_deleted_idx",
+        ),
+        migrations.AddIndex(
+            model_name="hotel",
+            index=models.Index(
+                fields=["updated_at", "id"], name="hotel_updated_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hotelchain",
+            index=models.Index(
+                fields=["updated_at", "id"], name="hotelchain_updated_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["deleted_at", "id"], name="tombstone_deleted_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,212 @@
+from functools import cached_property
+from hashlib import sha1
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .cache import get_generations, record_lookup
+
+
+class CachedResponseMixin:
+    """
+    Caches the data of the list and retrieve responses
+
+    The key is built from the URL, the query params and the generation of
+    `cache_models`, which is bumped by the signals whenever one of them
+    changes, so the invalidation is exact. Responses carry an `X-Cache`
+    header with HIT or MISS.
+    """
+
+    cache_models: tuple = ()
+
+    def get_cache_key(self, request, prefix: str = "response") -> str:
+        query = sorted(request.query_params.lists())
+        url = f"{request.build_absolute_uri(request.path)}?{query}"
+        generations = ".".join(str(g) for g in get_generations(*self.cache_models))
+        digest = sha1(url.encode()).hexdigest()
+        return f"hotels:{prefix}:{self.basename}:{self.action}:{generations}:{digest}"
+
+    def cached_response(self, view, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+
+        data = cache.get(key)
+        if data is not None:
+            record_lookup(hit=True)
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.HOTEL_RESPONSE_CACHE_TIMEOUT)
+        record_lookup(hit=False)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Answers conditional list and retrieve requests before serialization
+
+    The strong ETag and the Last-Modified are computed with one aggregate
+    query over the rows of the response: `MAX(updated_at)`, the row count
+    and the `conditional_aggregates` of the related rows that are nested in
+    the response. `If-None-Match` / `If-Modified-Since` are answered with a
+    304. With `CachedResponseMixin` the aggregates are cached as well.
+    """
+
+    conditional_aggregates: dict = {}
+
+    def get_validators(self, request, *args, **kwargs) -> dict:
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+
+        return queryset.aggregate(
+            last_modified=Max("updated_at"),
+            count=Count("pk", distinct=True),
+            **self.conditional_aggregates,
+        )
+
+    def get_cached_validators(self, request, *args, **kwargs) -> dict:
+        if not isinstance(self, CachedResponseMixin):
+            return self.get_validators(request, *args, **kwargs)
+
+        key = self.get_cache_key(request, prefix="validators")
+        validators = cache.get(key)
+        if validators is None:
+            validators = self.get_validators(request, *args, **kwargs)
+            cache.set(key, validators, settings.HOTEL_RESPONSE_CACHE_TIMEOUT)
+        return validators
+
+    def conditional_response(self, view, request, *args, **kwargs):
+        validators = self.get_cached_validators(request, *args, **kwargs)
+
+        values = "|".join(f"{k}={v}" for k, v in sorted(validators.items()))
+        resource = f"{request.get_full_path()}|{request.accepted_renderer.format}"
+        etag = f'"{sha1(f"{resource}|{values}".encode()).hexdigest()}"'
+
+        timestamps = [v for v in validators.values() if hasattr(v, "timestamp")]
+        # HTTP dates have a precision of seconds
+        last_modified = int(max(timestamps).timestamp()) if timestamps else None
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+
+def split_names(value: str) -> list:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    `?fields=name,slug` serializes only those fields in the list and retrieve
+    responses, and `?expand=chain` adds the nested serializers embedded, see
+    `SparseFieldsMixin`. The omitted nested serializers are replaced by the pk.
+
+    The queryset only reads the model fields used by the requested fields,
+    `get_queryset` should skip the joins and prefetches of the omitted ones.
+    """
+
+    @cached_property
+    def sparse_fieldset(self) -> Optional[tuple]:
+        """
+        Returns the requested (fields, expand), None if every field is
+        serialized
+        """
+
+        params = self.request.query_params  # type: ignore
+        if self.action not in ("list", "retrieve") or "fields" not in params:  # type: ignore
+            return None
+
+        serializer_class = self.get_serializer_class()  # type: ignore
+        expand = split_names(params.get("expand", ""))
+        fields = list(dict.fromkeys(split_names(params["fields"]) + expand))
+
+        errors = {}
+        unknown = set(fields) - set(serializer_class().fields)
+        if unknown:
+            errors["fields"] = [f"Unknown fields: {', '.join(sorted(unknown))}."]
+        unknown = set(expand) - set(serializer_class.expandable_fields)
+        if unknown:
+            errors["expand"] = [f"Not expandable: {', '.join(sorted(unknown))}."]
+        if errors:
+            raise ValidationError(errors)
+
+        return fields, expand
+
+    def get_sparse_queryset(self, queryset):
+        """
+        Defers the model fields not used by the requested fields
+        """
+
+        fields, _ = self.sparse_fieldset  # type: ignore
+        sources = self.get_serializer_class().get_sparse_sources(fields)  # type: ignore
+
+        # the ordering values are read by the keyset pagination
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        ordering = {name.lstrip("-") for name in queryset.query.order_by}
+        return queryset.only("pk", *sources, *(ordering & model_fields))
+
+    def get_serializer(self, *args, **kwargs):
+        if self.sparse_fieldset is not None:
+            kwargs["fields"], kwargs["expand"] = self.sparse_fieldset
+        return super().get_serializer(*args, **kwargs)  # type: ignore
+
+
+class RowReaderMixin:
+    """
+    Builds the list responses from `.values()` rows with `reader_class`
+    instead of the serializer, see `RowReader`, the data is the same
+    """
+
+    reader_class: Optional[type] = None
+
+    def use_reader(self) -> bool:
+        return self.reader_class is not None
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_reader():
+            return super().list(request, *args, **kwargs)  # type: ignore
+
+        reader = self.reader_class(context=self.get_serializer_context())  # type: ignore
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore
+        # the ordering values are read by the keyset pagination
+        ordering = [name.lstrip("-") for name in queryset.query.order_by]
+        columns = dict.fromkeys([*reader.columns, *ordering])
+        rows = queryset.prefetch_related(None).values(*columns)
+
+        page = self.paginate_queryset(rows)  # type: ignore
+        if page is not None:
+            return self.get_paginated_response(reader.to_representation(page))  # type: ignore
+        return Response(reader.to_representation(rows))
@@ -1,20 +1,32 @@
-from typing import Union
+from typing import Optional, Union
 
-from django.db import models
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
-from autoslug import AutoSlugField
-
+from app.config.storage import photo_storage
 from app.config.utils import photo_directory_path
 from .tasks import send_notification_email
-from .managers import AbstractHotelManager, HotelChainManager
+from .managers import (
+    AbstractHotelManager,
+    HotelChainManager,
+    HotelManager,
+    StoredFileManager,
+)
+from .matchers import chain_matcher
+from .slugs import AllocatedSlugField
+from .uploads import validate_photo
 
 
 User = get_user_model()
 
+# sent once per batch of drafts approved in bulk, see `HotelDraft.approve_many`
+drafts_approved = Signal()
+
 
 class TimestampedModel(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
@@ -58,7 +70,7 @@ class HotelChain(TimestampedModel):
         max_length=50,
         db_index=True,
     )
-    slug = AutoSlugField(
+    slug = AllocatedSlugField(
         verbose_name=_("Slug"),
         populate_from="title",
         unique=True,
@@ -90,6 +102,15 @@ class HotelChain(TimestampedModel):
         help_text=_("Email to receive notifications when a hotel is created"),
     )
 
+    # maintained by the hotel signals and bulk paths, see
+    # `HotelChainManager.count_hotel_changes`
+    hotel_count = models.PositiveIntegerField(
+        verbose_name=_("Hotel Count"), default=0, editable=False
+    )
+    active_hotel_count = models.PositiveIntegerField(
+        verbose_name=_("Active Hotel Count"), default=0, editable=False
+    )
+
     objects = HotelChainManager()
 
     def __str__(self):
@@ -98,6 +119,14 @@ class HotelChain(TimestampedModel):
     class Meta:
         verbose_name = "Hotel Chain"
         verbose_name_plural = "Hotel Chains"
+        indexes = [
+            # keyset pagination of the chains list
+            models.Index(fields=["title", "id"], name="hotelchain_title_id_idx"),
+            # changes since a sync token
+            models.Index(
+                fields=["updated_at", "id"], name="hotelchain_updated_at_id_idx"
+            ),
+        ]
 
     @property
     def price_tag(self) -> str:
@@ -113,15 +142,48 @@ class HotelChain(TimestampedModel):
     def number_of_hotels(self) -> int:
         """
         Returns the number of hotels in the chain
+        Reads the stored counter, so it does not run any query
 
         :return: number of hotels
         """
 
-        return self.hotel_set.count()  # type: ignore
+        return self.hotel_count
 
     def get_absolute_url(self) -> str:
         return reverse("hotelchain-detail", kwargs={"slug": self.slug})
 
+    def hotels_creation_email(self, hotels: list) -> Optional[tuple]:
+        """
+        Returns one email to the chain with the information (url) of all the
+        hotels created in bulk
+
+        hotels: created hotels of the chain
+        return: (subject, message, recipients), None if the chain has no email
+        """
+
+        if not self.email:
+            return None
+
+        links = "<br>".join(
+            f"<a href='{hotel.get_absolute_url()}'>{hotel}</a>" for hotel in hotels
+        )
+
+        subject = "New hotels created"
+        message = f"These hotels have been created:<br>{links}"
+        return subject, message, [self.email]
+
+    def hotels_creation_email_notification(self, hotels: list) -> None:
+        """
+        Sends one email to the chain with the information (url) of all the
+        hotels created in bulk
+
+        hotels: created hotels of the chain
+        """
+
+        email = self.hotels_creation_email(hotels)
+        if email:
+            send_notification_email.delay(*email)
+
 
 class AbstractHotel(TimestampedModel):
     """
@@ -144,6 +206,8 @@ class AbstractHotel(TimestampedModel):
         unique=False,
         blank=True,
         upload_to=photo_directory_path,
+        storage=photo_storage,
+        validators=[validate_photo],
     )
     is_active = models.BooleanField(
         verbose_name=_("Is Active"), default=False, db_index=True
@@ -161,9 +225,44 @@ class AbstractHotel(TimestampedModel):
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.stored_photo = instance.get_photo_name()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs) -> None:
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None:
+            self.stored_photo = self.get_photo_name()
+
+    def get_photo_name(self) -> Optional[str]:
+        """
+        Returns the path of the photo, None if it is deferred
+        """
+
+        if "photo" in self.get_deferred_fields():
+            return None
+        return self.photo.name or ""
+
+    def photo_changed(self) -> bool:
+        """
+        Returns True if the photo is not the stored one
+        """
+
+        name = self.get_photo_name()
+        return name is not None and name != getattr(self, "stored_photo", "")
+
+    def photo_files(self) -> list:
+        """
+        Returns the files of the photo storage used by the instance
+        """
+
+        return [self.photo.name] if self.photo else []
+
 
 class Hotel(AbstractHotel):
-    slug = AutoSlugField(  # type: ignore
+    slug = AllocatedSlugField(  # type: ignore
         verbose_name=_("Slug"),
         populate_from="name",
         unique=True,
@@ -188,13 +287,72 @@ class Hotel(AbstractHotel):
         null=True,
         blank=True,
     )
-    related_hotels = models.ManyToManyField(
-        "self", verbose_name=_("Related Hotels"), blank=True
+    # path of each `HOTEL_PHOTO_VARIANTS` of the photo, see `images`
+    photo_variants = models.JSONField(
+        verbose_name=_("Photo Variants"), default=dict, blank=True, editable=False
     )
 
+    objects = HotelManager()
+
     def __str__(self):
         return f"{self.name}, {self.location}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.counted_state = instance.get_counted_state()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs) -> None:
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        # a deferred field load must not count unsaved changes as stored
+        if fields is None:
+            self.counted_state = self.get_counted_state()
+
+    def save(self, *args, **kwargs) -> None:
+        # the variants are stored by their task, a hotel loaded before it
+        # finished must not overwrite them with its outdated copy
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not args
+            and not self.photo_changed()
+        ):
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name != "photo_variants"
+            ]
+        super().save(*args, **kwargs)
+
+    def get_counted_state(self) -> Optional[tuple]:
+        """
+        Returns the state of the hotel counted by the chain counters
+
+        :return: (chain_id, is_active), None if any of them is deferred
+        """
+
+        if {"chain_id", "is_active"} & self.get_deferred_fields():
+            return None
+        return self.chain_id, self.is_active  # type: ignore
+
+    def photo_files(self) -> list:
+        if not self.photo:
+            return []
+        return [self.photo.name, *self.photo_variants.values()]
+
+    @property
+    def photo_variant_urls(self) -> dict:
+        if not self.photo:
+            return {}
+        return {
+            variant: self.photo.storage.url(name)
+            for variant, name in self.photo_variants.items()
+        }
+
     @property
     def full_name(self):
         if self.chain:
@@ -205,6 +363,12 @@ class Hotel(AbstractHotel):
     class Meta:
         verbose_name = "Hotel"
         verbose_name_plural = "Hotels"
+        indexes = [
+            # keyset pagination of the hotels list
+            models.Index(fields=["-created_at", "-id"], name="hotel_created_at_id_idx"),
+            # changes since a sync token
+            models.Index(fields=["updated_at", "id"], name="hotel_updated_at_id_idx"),
+        ]
 
     def get_absolute_url(self) -> str:
         return reverse("hotel-detail", kwargs={"slug": self.slug})
@@ -212,47 +376,73 @@ class Hotel(AbstractHotel):
     def assign_chain(self) -> None:
         """
         Assigns the chain based on the name and auto assign flag of the chain
+        The chain is resolved by the in-memory `chain_matcher`
 
         If the chain is already set, return
         """
 
         # if the chain is already set, return
-        if self.chain:
+        if self.chain_id:  # type: ignore
             return
 
-        chain = HotelChain.objects.filter_by_title_with_auto_assign(self.name)  # type: ignore
-        if chain:
-            self.chain = chain.first()
+        chain_id = chain_matcher.match(self.name)
+        if chain_id:
+            self.chain_id = chain_id
 
-    def creation_email_notification(self) -> None:
+    def creation_email(self) -> Optional[tuple]:
         """
-        Sends an email to the recipient with the hotel information (url)
+        Returns the email to the chain with the hotel information (url)
 
-        recipient: recipient email
+        return: (subject, message, recipients), None if the chain has no email
         """
 
         if not self.chain:
-            return
+            return None
         if not self.chain.email:
-            return
+            return None
 
         hotel_url = self.get_absolute_url()
 
         subject = "New hotel created"
         message = f"This hotel has been created: <a href='{hotel_url}'>{self}</a>"
         recipients = [self.chain.email]  # type: ignore
-        send_notification_email.delay(subject, message, recipients)
+        return subject, message, recipients
 
-    def assign_related_hotels(self) -> None:
+    def creation_email_notification(self) -> None:
         """
-        Assigns the related hotels based on the chain
-        If the chain is not set, clears the related hotels
+        Sends an email to the recipient with the hotel information (url)
         """
-        if self.chain:
-            related_hotels = Hotel.objects.filter(chain=self.chain).exclude(pk=self.pk)  # type: ignore
-            self.related_hotels.set(related_hotels)
-        else:
-            self.related_hotels.clear()
+
+        email = self.creation_email()
+        if email:
+            send_notification_email.delay(*email)
+
+    @property
+    def related_hotels(self) -> models.QuerySet:
+        """
+        Returns the hotels of the same chain
+        Derived from the chain membership, so saving a hotel does not need
+        to maintain any relation
+
+        :return: related hotels
+        """
+
+        if not self.chain_id:  # type: ignore
+            return Hotel.objects.none()  # type: ignore
+        return Hotel.objects.filter(chain_id=self.chain_id).exclude(pk=self.pk)  # type: ignore
+
+    @property
+    def related_hotel_ids(self) -> list:
+        """
+        Returns the ids of the hotels of the same chain
+        Reads the chain members when they are prefetched (see `HotelViewSet`)
+
+        :return: related hotel ids
+        """
+
+        if not self.chain_id:  # type: ignore
+            return []
+        return [hotel.pk for hotel in self.chain.hotel_set.all() if hotel.pk != self.pk]  # type: ignore
 
 
 class HotelDraft(AbstractHotel):
@@ -273,7 +463,7 @@ class HotelDraft(AbstractHotel):
         null=False,
         db_index=True,
     )
-    slug = AutoSlugField(  # type: ignore
+    slug = AllocatedSlugField(  # type: ignore
         verbose_name=_("Slug"),
         populate_from="name",
         unique=True,
@@ -311,13 +501,22 @@ class HotelDraft(AbstractHotel):
         verbose_name = _("Hotel Draft")
         verbose_name_plural = _("Hotel Drafts")
         ordering = ["-created_at"]
+        indexes = [
+            # keyset pagination of the drafts list
+            models.Index(
+                fields=["-created_at", "-id"], name="hoteldraft_created_at_id_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"({self.status}) {self.hotel} - by {self.created_by}"
 
-    def approved_and_save(self) -> bool:
+    def apply_to_hotel(self) -> bool:
         """
-        Approves the hotel draft
+        Applies the changes of the draft to its hotel and approves the draft,
+        in memory
+
+        :return: False if the draft was already approved
         """
 
         if self.status == self.STATUS_APPROVED:
@@ -331,20 +530,110 @@ class HotelDraft(AbstractHotel):
 
         if self.photo and self.photo != self.hotel.photo:
             self.hotel.photo = self.photo  # type: ignore
+            self.hotel.photo_variants = {}
 
-        if self.chain and self.chain != self.hotel.chain:
-            self.hotel.chain = self.chain
+        if self.chain_id and self.chain_id != self.hotel.chain_id:  # type: ignore
+            self.hotel.chain_id = self.chain_id  # type: ignore
 
         if self.is_active != self.hotel.is_active:
             self.hotel.is_active = self.is_active
 
-        self.hotel.save()
-
         self.status = self.STATUS_APPROVED
+        return True
+
+    def approved_and_save(self) -> bool:
+        """
+        Approves the hotel draft
+        """
+
+        if not self.apply_to_hotel():
+            return False
+
+        self.hotel.save()
         self.save()
 
         return True
 
+    @classmethod
+    def approve_many(cls, draft_ids, batch_size: int = 500) -> list:
+        """
+        Approves many hotel drafts, with `approved_and_save` semantics
+
+        Every batch is approved in one transaction: the drafts and their
+        hotels are locked, the changes are applied in memory and saved with
+        `bulk_update`, and `drafts_approved` is sent once instead of the
+        per row signals.
+
+        draft_ids: ids of the drafts, the approved ones are skipped
+        batch_size: drafts per transaction
+        :return: the approved drafts
+        """
+
+        ids = sorted(set(draft_ids))
+        approved: list = []
+        for start in range(0, len(ids), batch_size):
+            approved += cls._approve_batch(ids[start : start + batch_size])
+        return approved
+
+    @classmethod
+    def _approve_batch(cls, ids: list) -> list:
+        with transaction.atomic():
+            drafts = list(
+                cls.objects.filter(pk__in=ids)
+                .exclude(status=cls.STATUS_APPROVED)
+                .select_for_update()
+                .order_by("pk")
+            )
+            if not drafts:
+                return []
+
+            hotels = {
+                hotel.pk: hotel
+                for hotel in Hotel.objects.filter(
+                    pk__in={draft.hotel_id for draft in drafts}  # type: ignore
+                )
+                .select_for_update()
+                .order_by("pk")
+            }
+            counted = {pk: hotel.get_counted_state() for pk, hotel in hotels.items()}
+            files = {pk: hotel.photo_files() for pk, hotel in hotels.items()}
+
+            now = timezone.now()
+            for draft in drafts:
+                draft.hotel = hotels[draft.hotel_id]  # type: ignore
+                draft.apply_to_hotel()
+                draft.updated_at = now
+            for hotel in hotels.values():
+                hotel.assign_chain()
+                hotel.updated_at = now
+
+            Hotel.objects.bulk_update(
+                hotels.values(),
+                (
+                    "name",
+                    "location",
+                    "photo",
+                    "photo_variants",
+                    "chain",
+                    "is_active",
+                    "updated_at",
+                ),
+            )
+            cls.objects.bulk_update(drafts, ("status", "updated_at"))
+
+            # bulk queries bypass the signals that maintain the counters
+            HotelChain.objects.count_hotel_changes(  # type: ignore
+                (counted[pk], hotel.get_counted_state()) for pk, hotel in hotels.items()
+            )
+            StoredFile.objects.count_references(  # type: ignore
+                (files[pk], hotel.photo_files()) for pk, hotel in hotels.items()
+            )
+            drafts_approved.send(
+                sender=cls, drafts=drafts, hotels=list(hotels.values())
+            )
+
+        return drafts
+
     def get_absolute_url(self):
         return reverse("hoteldraft-detail", kwargs={"slug": self.slug})
 
@@ -360,6 +649,11 @@ class HotelDraft(AbstractHotel):
         if not self.hotel.chain.email:
             return
 
+        if settings.HOTEL_DRAFT_DIGEST:
+            # sent with the next digest, see `send_draft_digests`
+            DraftNotification.objects.create(draft=self)
+            return
+
         draft_url = self.hotel.get_absolute_url()
 
         subject = "New hotel created"
@@ -368,3 +662,121 @@ class HotelDraft(AbstractHotel):
             User.objects.filter(is_reviewer=True).values_list("email", flat=True)
         )
         send_notification_email.delay(subject, message, recipients)
+
+    def digest_line(self) -> str:
+        """
+        Returns the line of the draft in the reviewers digest
+        """
+
+        draft_url = self.hotel.get_absolute_url()
+        return f"{ self.created_by }: <a href='{ draft_url }'>{ self.hotel.name }</a>"
+
+
+class DraftNotification(models.Model):
+    """
+    Buffer of the drafts to notify to the reviewers in the next digest
+
+    draft: created hotel draft
+    created_at: date of the draft creation
+    """
+
+    draft = models.ForeignKey(
+        HotelDraft,
+        verbose_name=_("Draft"),
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(verbose_name=_("Created At"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Draft Notification")
+        verbose_name_plural = _("Draft Notifications")
+
+    def __str__(self):
+        return f"{self.draft} notification"
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted hotel or hotel chain, used by the delta sync
+
+    model: model name of the deleted instance
+    object_id: pk of the deleted instance
+    slug: slug of the deleted instance
+    deleted_at: date of the deletion
+    """
+
+    model = models.CharField(verbose_name=_("Model"), max_length=50)
+    object_id = models.BigIntegerField(verbose_name=_("Object Id"))
+    slug = models.CharField(verbose_name=_("Slug"), max_length=250)
+    deleted_at = models.DateTimeField(verbose_name=_("Deleted At"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Tombstone")
+        verbose_name_plural = _("Tombstones")
+        indexes = [
+            # deletions since a sync token and purge of the old tombstones
+            models.Index(
+                fields=["deleted_at", "id"], name="tombstone_deleted_at_id_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted at {self.deleted_at}"
+
+
+class StoredFile(models.Model):
+    """
+    Reference count of a file of the photo storage, the files without
+    references are deleted by the `collect_photos` command
+
+    name: path of the file in the storage
+    references: photos and photo variants of the hotels and drafts that use it
+    updated_at: date of the last change of the references
+    """
+
+    name = models.CharField(verbose_name=_("Name"), max_length=255, unique=True)
+    references = models.PositiveIntegerField(verbose_name=_("References"), default=0)
+    updated_at = models.DateTimeField(verbose_name=_("Updated At"), auto_now=True)
+
+    objects = StoredFileManager()
+
+    class Meta:
+        verbose_name = _("Stored File")
+        verbose_name_plural = _("Stored Files")
+        indexes = [
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(references=0),
+                name="storedfile_unreferenced_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.references} references)"
+
+
+class SlugCounter(models.Model):
+    """
+    Last index of the slugs allocated from a base slug, see `allocate_slugs`
+
+    scope: model and field of the slugs
+    base: slug made from the value, without index
+    last_index: index of the last slug allocated, the base itself is 1
+    """
+
+    scope = models.CharField(verbose_name=_("Scope"), max_length=100)
+    base = models.CharField(verbose_name=_("Base"), max_length=255)
+    last_index = models.PositiveIntegerField(verbose_name=_("Last Index"), default=0)
+
+    class Meta:
+        verbose_name = _("Slug Counter")
+        verbose_name_plural = _("Slug Counters")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "base"], name="slugcounter_scope_base_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.base} ({self.last_index})"
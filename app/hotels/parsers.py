@@ -0,0 +1,25 @@
+from rest_framework.parsers import BaseParser
+
+from .importers import read_csv, read_ndjson
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses a NDJSON stream lazily into an iterator of rows
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return read_ndjson(stream or [])
+
+
+class CSVParser(BaseParser):
+    """
+    Parses a CSV stream with a header row lazily into an iterator of rows
+    """
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return read_csv(stream or [])
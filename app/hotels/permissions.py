@@ -9,3 +9,12 @@ class IsStaffUserOrReadOnly(permissions.BasePermission):
             and request.user.is_authenticated
             and request.user.is_staff
         )
+
+
+class IsReviewer(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return bool(
+            request.user
+            and request.user.is_authenticated
+            and (request.user.is_reviewer or request.user.is_superuser)
+        )
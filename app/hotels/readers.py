@@ -0,0 +1,208 @@
+from collections import defaultdict
+from datetime import timezone
+from operator import itemgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from app.config.metrics import TimedSerializerMixin
+from .models import Hotel, HotelChain
+from .serializers import HotelChainSerializer, HotelSerializer
+
+# lookup value reversed once, then replaced by the lookup of every row
+LOOKUP_MARKER = "lookup-marker"
+
+# fields whose representation is the value read from the database
+PLAIN_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+)
+
+
+class RowReader:
+    """
+    Read-only representation of `serializer_class` built from `.values()`
+    rows, for the list responses
+
+    The fields, and so the order of the keys, are taken from the serializer,
+    but every field is converted by a function of the row prepared once:
+    the plain values are taken as they are, the hyperlinks are formatted
+    from a URL reversed once instead of calling `reverse()` for every row,
+    and the `<name>` method fields are `convert_<name>` methods of the
+    reader. The data is the same as the serializer one.
+
+    context: serializer context, with the request
+    """
+
+    serializer_class: type = serializers.ModelSerializer
+
+    def __init__(self, context: dict) -> None:
+        self.context = context
+        self.request = context.get("request")
+        fields = self.serializer_class(context=context).fields
+        self.converters = [
+            (name, self.get_converter(name, field)) for name, field in fields.items()
+        ]
+
+    @property
+    def columns(self) -> list:
+        """
+        Returns the model fields read in the rows
+        """
+
+        model = self.serializer_class.Meta.model
+        return [field.attname for field in model._meta.concrete_fields]
+
+    def get_converter(self, name: str, field):
+        """
+        Returns the function of a row returning the value of a field
+        """
+
+        method = getattr(self, f"convert_{name}", None)
+        if method is not None:
+            return method
+        if isinstance(field, serializers.HyperlinkedIdentityField):
+            return self.get_url_converter(field)
+        if isinstance(field, serializers.DateTimeField):
+            return self.get_datetime_converter(field)
+        if isinstance(field, serializers.FileField):
+            return self.get_file_converter(field)
+        if isinstance(field, PLAIN_FIELDS):
+            return itemgetter(field.source)
+        raise ImproperlyConfigured(
+            f"{type(self).__name__} can not convert the {name} field, "
+            f"add a convert_{name} method"
+        )
+
+    def get_url_converter(self, field):
+        # see `HyperlinkedRelatedField.to_representation`
+        format = self.context.get("format")
+        if format and field.format and field.format != format:
+            format = field.format
+
+        kwargs = {field.lookup_url_kwarg: LOOKUP_MARKER}
+        url = field.reverse(
+            field.view_name, kwargs=kwargs, request=self.request, format=format
+        )
+        # the slugs have no character quoted in the URLs
+        prefix, _, suffix = url.rpartition(LOOKUP_MARKER)
+        lookup = field.lookup_field
+        return lambda row: serializers.Hyperlink(f"{prefix}{row[lookup]}{suffix}", None)
+
+    def get_datetime_converter(self, field):
+        source = field.source
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if output_format is None or output_format.lower() != ISO_8601:
+            return lambda row: field.to_representation(row[source])
+
+        # see `DateTimeField.to_representation`, the stored values are aware
+        zone = (
+            field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        )
+
+        def convert(row):
+            value = row[source]
+            if not value:
+                return None
+            if zone is not None:
+                value = value.astimezone(zone)
+            else:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            value = value.isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return convert
+
+    def get_file_converter(self, field):
+        source = field.source
+        storage = self.serializer_class.Meta.model._meta.get_field(source).storage
+        use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+        if not use_url:
+            return lambda row: row[source] or None
+        return lambda row: (
+            self.build_url(storage.url(row[source])) if row[source] else None
+        )
+
+    def build_url(self, url: str) -> str:
+        return self.request.build_absolute_uri(url) if self.request else url
+
+    def prepare(self, rows: list) -> None:
+        """
+        Reads the data related to the rows before they are converted
+        """
+
+    def to_representation(self, rows) -> list:
+        rows = list(rows)
+        self.prepare(rows)
+        converters = self.converters
+        return [{name: convert(row) for name, convert in converters} for row in rows]
+
+
+class HotelChainReader(TimedSerializerMixin, RowReader):
+    """
+    Reads hotel chains like `HotelChainSerializer`
+    """
+
+    serializer_class = HotelChainSerializer
+
+    def convert_price_tag(self, row: dict) -> str:
+        return HotelChain.PRICE_TAGS[row["price_range"]]
+
+    def convert_number_of_hotels(self, row: dict) -> int:
+        return row["hotel_count"]
+
+
+class HotelReader(TimedSerializerMixin, RowReader):
+    """
+    Reads hotels like `HotelSerializer`
+
+    The chains and the ids of their hotels are read with one query each, as
+    the prefetches of `HotelViewSet` do.
+    """
+
+    serializer_class = HotelSerializer
+
+    def __init__(self, context: dict) -> None:
+        super().__init__(context)
+        self.chain_reader = HotelChainReader(context)
+        self.storage = Hotel._meta.get_field("photo").storage
+        self.chains: dict = {}
+        self.members: dict = {}
+
+    def prepare(self, rows: list) -> None:
+        chain_ids = {row["chain_id"] for row in rows} - {None}
+
+        chains = list(
+            HotelChain.objects.filter(pk__in=chain_ids).values(
+                *self.chain_reader.columns
+            )
+        )
+        self.chains = {
+            row["id"]: data
+            for row, data in zip(chains, self.chain_reader.to_representation(chains))
+        }
+
+        self.members = defaultdict(list)
+        members = Hotel.objects.filter(chain__in=chain_ids).order_by("pk")
+        for chain_id, pk in members.values_list("chain", "pk"):
+            self.members[chain_id].append(pk)
+
+    def convert_chain(self, row: dict):
+        return self.chains.get(row["chain_id"])
+
+    def convert_related_hotels(self, row: dict) -> list:
+        # see `Hotel.related_hotel_ids`
+        members = self.members.get(row["chain_id"], ())
+        return [pk for pk in members if pk != row["id"]]
+
+    def convert_photo_variants(self, row: dict) -> dict:
+        # see `HotelSerializer.get_photo_variants`
+        if not row["photo"]:
+            return {}
+        return {
+            variant: self.build_url(self.storage.url(name))
+            for variant, name in row["photo_variants"].items()
+        }
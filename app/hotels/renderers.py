@@ -0,0 +1,27 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders a NDJSON export, the rows are streamed by the view so only the
+    error responses are rendered here
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode() + b"\n"
+
+
+class CSVRenderer(NDJSONRenderer):
+    """
+    Renders a CSV export, the rows are streamed by the view so only the
+    error responses are rendered here
+    """
+
+    media_type = "text/csv"
+    format = "csv"
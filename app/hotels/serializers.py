@@ -1,15 +1,72 @@
+from django.db import models
 from django.forms import model_to_dict
 from django.contrib.auth import get_user_model
 
 from rest_framework import serializers
 from rest_framework.fields import SerializerMethodField
 
-from .models import Hotel, HotelChain, HotelDraft
+from app.config.metrics import TimedSerializerMixin
+from .models import Hotel, HotelChain, HotelDraft, Tombstone
 
 User = get_user_model()
 
 
-class HotelChainSerializer(serializers.HyperlinkedModelSerializer):
+class PhotoField(serializers.FileField):
+    """
+    Photo upload validated by `validate_photo` from the image header, unlike
+    `ImageField` that verifies the whole image
+    """
+
+
+# the photos of the hotels and drafts are `PhotoField`
+PHOTO_FIELD_MAPPING = {
+    **serializers.ModelSerializer.serializer_field_mapping,
+    models.ImageField: PhotoField,
+}
+
+
+class SparseFieldsMixin:
+    """
+    Serializes only the `fields` given to the constructor (all by default),
+    see `SparseFieldsetMixin`
+
+    The nested serializers are embedded when they are in `expand` or when
+    every field is serialized, otherwise they are replaced by the pk.
+    """
+
+    # nested serializers that can be expanded
+    expandable_fields: tuple = ()
+    # model fields read by the fields not backed by a model field of their name
+    sparse_sources: dict = {}
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is None:
+            return
+
+        for name in set(self.fields) - set(fields):
+            self.fields.pop(name)
+        for name in set(self.expandable_fields) & set(self.fields) - set(expand):
+            self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    @classmethod
+    def get_sparse_sources(cls, fields) -> set:
+        """
+        Returns the model fields read to serialize the fields
+        """
+
+        model = cls.Meta.model  # type: ignore
+        model_fields = {field.name for field in model._meta.concrete_fields}
+        sources = set()
+        for name in fields:
+            default = (name,) if name in model_fields else ()
+            sources.update(cls.sparse_sources.get(name, default))
+        return sources
+
+
+class HotelChainSerializer(
+    TimedSerializerMixin, serializers.HyperlinkedModelSerializer
+):
     """
     Serializes hotel chains
     """
@@ -28,26 +85,45 @@ class HotelChainSerializer(serializers.HyperlinkedModelSerializer):
 
     class Meta:
         model = HotelChain
-        fields = "__all__"
+        exclude = ("hotel_count", "active_hotel_count")
 
 
-class HotelSerializer(serializers.ModelSerializer):
+class HotelSerializer(
+    SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer
+):
     """
     Serializes hotels
     """
 
+    expandable_fields = ("chain",)
+    sparse_sources = {
+        "url": ("slug",),
+        "related_hotels": ("chain",),
+        "photo_variants": ("photo", "photo_variants"),
+    }
+
     url = serializers.HyperlinkedIdentityField(
         view_name="hotel-detail", lookup_field="slug"
     )
+    serializer_field_mapping = PHOTO_FIELD_MAPPING
+
     chain = HotelChainSerializer()
     related_hotels = SerializerMethodField()
+    photo_variants = SerializerMethodField()
 
     class Meta:
         model = Hotel
         fields = "__all__"
 
     def get_related_hotels(self, obj):
-        return obj.related_hotels.values_list("pk", flat=True)
+        return obj.related_hotel_ids
+
+    def get_photo_variants(self, obj):
+        request = self.context.get("request")
+        return {
+            variant: request.build_absolute_uri(url) if request else url
+            for variant, url in obj.photo_variant_urls.items()
+        }
 
     def create(self, validated_data) -> Hotel:
         return Hotel.objects.nested_create(**validated_data)  # type: ignore
@@ -68,11 +144,13 @@ class HotelSerializer(serializers.ModelSerializer):
         return instance
 
 
-class HotelDraftSerializer(serializers.ModelSerializer):
+class HotelDraftSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializes hotel drafts
     """
 
+    serializer_field_mapping = PHOTO_FIELD_MAPPING
+
     url = serializers.HyperlinkedIdentityField(
         view_name="hoteldraft-detail", lookup_field="slug"
     )
@@ -110,3 +188,25 @@ class HotelDraftSerializer(serializers.ModelSerializer):
             instance.chain = chain
         instance.save()
         return instance
+
+
+class TombstoneSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializes the deletions of the delta sync
+    """
+
+    id = serializers.IntegerField(source="object_id")
+
+    class Meta:
+        model = Tombstone
+        fields = ("model", "id", "slug", "deleted_at")
+
+
+class HotelDraftApproveSerializer(serializers.Serializer):
+    """
+    Validates the ids of the drafts to approve in bulk
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False
+    )
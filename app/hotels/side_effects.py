@@ -0,0 +1,48 @@
+from collections import defaultdict
+from threading import local
+from typing import Callable, Hashable
+from weakref import ref
+
+from django.db import transaction
+
+
+class OnCommitBuffer:
+    """
+    Collects values during a transaction and hands all of them to `flush` in
+    one call once it commits, so N saves produce one side effect
+
+    Outside a transaction the values are flushed right away. Values of a
+    transaction that is rolled back are dropped: Django discards the flush
+    callback, and as the buffer only keeps a weak reference to it, the
+    buffer notices it is gone on the next use.
+    """
+
+    def __init__(self, flush: Callable[[dict], None]) -> None:
+        self.flush = flush
+        self._local = local()
+
+    def add(self, key: Hashable, *values: Hashable) -> None:
+        """
+        Adds values under a key, flushed as `{key: set(values)}`
+        """
+
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            self.flush({key: set(values)})
+            return
+
+        callback = getattr(self._local, "callback", None)
+        callback = callback() if callback is not None else None
+        if callback is None:
+            pending: dict = defaultdict(set)
+
+            # a new function each time, only referenced by Django until the
+            # transaction commits or is rolled back
+            def callback():
+                self._local.callback = None
+                self.flush(dict(pending))
+
+            callback.pending = pending  # type: ignore
+            self._local.callback = ref(callback)
+            transaction.on_commit(callback)
+        callback.pending[key].update(values)
@@ -1,7 +1,34 @@
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import Hotel, HotelChain, HotelDraft
+from .cache import bump_generation
+from .matchers import chain_matcher
+from .models import (
+    Hotel,
+    HotelChain,
+    HotelDraft,
+    StoredFile,
+    Tombstone,
+    drafts_approved,
+)
+from .side_effects import OnCommitBuffer
+from .tasks import generate_photo_variants, send_hotels_creation_notifications
+
+# hotels created by chain, notified in one task once the transaction commits
+hotels_created = OnCommitBuffer(
+    lambda pending: send_hotels_creation_notifications.delay(
+        sorted(set().union(*pending.values()))
+    )
+)
+
+# hotels with a new photo, their variants are generated once the transaction
+# commits, when the photo is visible to the worker
+photos_changed = OnCommitBuffer(
+    lambda pending: generate_photo_variants.delay(
+        sorted(set().union(*pending.values()))
+    )
+)
 
 
 @receiver(pre_save, sender=Hotel)
@@ -12,17 +39,55 @@ def hotel_signal_pre_save(instance: Hotel, **kargs) -> None:
     instance.assign_chain()
 
 
+def read_counted_state(instance: Hotel):
+    return (
+        Hotel.objects.filter(pk=instance.pk)
+        .values_list("chain_id", "is_active")
+        .first()
+    )
+
+
+@receiver(pre_save, sender=Hotel)
+def hotel_signal_load_counted_state(instance: Hotel, **kwargs) -> None:
+    """
+    Signal to read the counted state of a hotel that was not loaded from the
+    database with it (deferred fields or a hotel built with its pk)
+    """
+    if getattr(instance, "counted_state", None) is None and instance.pk:
+        instance.counted_state = read_counted_state(instance)
+
+
+@receiver(post_save, sender=Hotel)
+def hotel_signal_count_hotels(instance: Hotel, created: bool, **kwargs) -> None:
+    """
+    Signal to update the hotel counters of the old and new chain
+    """
+    old = None if created else getattr(instance, "counted_state", None)
+    new = instance.get_counted_state() or read_counted_state(instance)
+    HotelChain.objects.count_hotel_changes([(old, new)])  # type: ignore
+    instance.counted_state = new
+
+
+@receiver(post_delete, sender=Hotel)
+def hotel_signal_uncount_hotels(instance: Hotel, **kwargs) -> None:
+    """
+    Signal to update the hotel counters of the chain of a deleted hotel
+    """
+    old = getattr(instance, "counted_state", None) or instance.get_counted_state()
+    HotelChain.objects.count_hotel_changes([(old, None)])  # type: ignore
+
+
 @receiver(post_save, sender=Hotel)
 def hotel_signal_post_save(instance: Hotel, created: bool, **kargs) -> None:
     """
-    Signal to assign the chain and related hotels to the instance
     If the instance is created, it sends an email to the recipient
+    The email is sent once the transaction commits, all the hotels created
+    in the same transaction are notified in one task
+    Related hotels are derived from the chain, so there is nothing to assign
     """
 
-    instance.assign_related_hotels()
-
-    if created:
-        instance.creation_email_notification()
+    if created and instance.chain_id:  # type: ignore
+        hotels_created.add(instance.chain_id, instance.pk)  # type: ignore
 
 
 @receiver(pre_save, sender=HotelChain)
@@ -30,6 +95,99 @@ def hotel_chain_signal_pre_save(instance: HotelChain, **kwargs):
     instance.title = instance.title.title()
 
 
+@receiver(pre_save, sender=Hotel)
+@receiver(pre_save, sender=HotelDraft)
+def hotel_signal_release_photo(sender, instance, **kwargs) -> None:
+    """
+    Signal to read the stored files of a replaced photo, released once it is
+    saved, and to drop the variants of the hotel so they are not served
+    until the new ones are generated
+    """
+    instance.released_files = []
+    if not instance.photo_changed():
+        return
+
+    if not instance._state.adding:
+        stored = sender.objects.filter(pk=instance.pk).first()
+        instance.released_files = stored.photo_files() if stored else []
+    if sender is Hotel:
+        instance.photo_variants = {}
+
+
+@receiver(post_save, sender=Hotel)
+@receiver(post_save, sender=HotelDraft)
+def hotel_signal_photo_changed(sender, instance, **kwargs) -> None:
+    """
+    Signal to count the references of the new photo and generate its
+    variants in a celery task
+    """
+    if not instance.photo_changed():
+        return
+
+    StoredFile.objects.count_references(  # type: ignore
+        [(getattr(instance, "released_files", []), instance.photo_files())]
+    )
+    if sender is Hotel and instance.photo:
+        photos_changed.add("hotels", instance.pk)
+    instance.stored_photo = instance.get_photo_name()
+
+
+@receiver(post_delete, sender=Hotel)
+@receiver(post_delete, sender=HotelDraft)
+def hotel_signal_release_photo_files(instance, **kwargs) -> None:
+    """
+    Signal to release the files of the photo of a deleted hotel or draft
+    """
+    StoredFile.objects.count_references([(instance.photo_files(), [])])  # type: ignore
+
+
+@receiver(post_save, sender=HotelChain)
+@receiver(post_delete, sender=HotelChain)
+def hotel_chain_signal_invalidate_matcher(**kwargs):
+    """
+    Signal to rebuild the auto assign chain index
+    It is invalidated again on commit, so other processes do not rebuild it
+    from data that is not committed yet
+    """
+    chain_matcher.invalidate()
+    transaction.on_commit(chain_matcher.invalidate)
+
+
+@receiver(post_save, sender=Hotel)
+@receiver(post_delete, sender=Hotel)
+@receiver(post_save, sender=HotelChain)
+@receiver(post_delete, sender=HotelChain)
+def hotel_signal_invalidate_responses(sender, **kwargs):
+    """
+    Signal to invalidate the cached responses built from the instance model
+    """
+    bump_generation(sender)
+
+
+@receiver(post_delete, sender=Hotel)
+@receiver(post_delete, sender=HotelChain)
+def hotel_signal_tombstone(sender, instance, **kwargs):
+    """
+    Signal to record the deletion for the delta sync
+    """
+    Tombstone.objects.create(
+        model=sender._meta.model_name, object_id=instance.pk, slug=instance.slug
+    )
+
+
+@receiver(drafts_approved, sender=HotelDraft)
+def hotel_draft_signal_approved(hotels: list, **kwargs) -> None:
+    """
+    Signal of a bulk approval, the cached responses are invalidated once for
+    all the hotels and the variants of the new photos are generated
+    """
+    bump_generation(Hotel, HotelChain)
+    for hotel in hotels:
+        if hotel.photo_changed():
+            photos_changed.add("hotels", hotel.pk)
+            hotel.stored_photo = hotel.get_photo_name()
+
+
 @receiver(post_save, sender=HotelDraft)
 def hotel_draft_signal_post_save(instance: HotelDraft, created: bool, **kwargs):
     if created:
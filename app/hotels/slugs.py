@@ -0,0 +1,150 @@
+from collections import Counter
+from typing import Iterable
+
+from django.apps import apps
+from django.db import connections, router
+
+from autoslug import AutoSlugField
+from autoslug.utils import crop_slug, get_prepopulated_value
+
+SlugCounterModel = lambda: apps.get_model("hotels", "SlugCounter")
+
+# counters sent in one statement
+BATCH_SIZE = 1000
+
+
+def base_slug(field, value: str) -> str:
+    """
+    Returns the slug of a value before making it unique, like `AutoSlugField`
+    """
+
+    slug = field.slugify(value or "") or field.model._meta.model_name
+    return field.slugify(crop_slug(field, slug))
+
+
+def suffixed_slug(field, base: str, index: int) -> str:
+    """
+    Returns the `index`-th slug of a base: the base, then `<base>-<index>`
+    """
+
+    if index == 1:
+        return base
+    tail = f"{field.index_sep}{index}"
+    return f"{base[: field.max_length - len(tail)]}{tail}"
+
+
+def reserve(model: type, scope: str, counts: dict, increment: bool) -> dict:
+    """
+    Upserts the counters of the bases, each row is locked until the end of
+    the transaction, so concurrent allocations of a base wait for each other
+
+    counts: number of slugs to reserve by base
+    increment: adds the counts to the stored counters, otherwise only the
+    missing counters are inserted
+    return: the counter of every incremented or inserted base
+    """
+
+    SlugCounter = SlugCounterModel()
+    using = router.db_for_write(model)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = quote(SlugCounter._meta.db_table)
+    last = quote("last_index")
+    conflict = (
+        f"DO UPDATE SET {last} = {table}.{last} + EXCLUDED.{last}"
+        if increment
+        else "DO NOTHING"
+    )
+
+    reserved = {}
+    # sorted, so concurrent allocations lock the counters in the same order
+    bases = sorted(counts)
+    with connection.cursor() as cursor:
+        for start in range(0, len(bases), BATCH_SIZE):
+            batch = bases[start : start + BATCH_SIZE]
+            values = ", ".join(["(%s, %s, %s)"] * len(batch))
+            params = [param for base in batch for param in (scope, base, counts[base])]
+            cursor.execute(
+                f"INSERT INTO {table} ({quote('scope')}, {quote('base')}, {last}) "
+                f"VALUES {values} ON CONFLICT ({quote('scope')}, {quote('base')}) "
+                f"{conflict} RETURNING {quote('base')}, {last}",
+                params,
+            )
+            reserved.update(cursor.fetchall())
+    return reserved
+
+
+def allocate_slugs(model: type, values: Iterable, field_name: str = "slug") -> dict:
+    """
+    Returns a unique slug for each value, using the `<slug>-<index>` scheme
+    of `AutoSlugField` without probing the table for every index
+
+    The last index of every base slug is kept in `SlugCounter`, the indexes
+    of a batch are reserved with one upsert of the counters. A suffixed slug
+    is itself the base of other values ("Hotel 2"), so it is claimed by
+    inserting its counter too. The slugs stored without the allocator are
+    skipped after one lookup. Safe under concurrent allocations, the
+    reserved indexes are released if the transaction is rolled back.
+
+    model: model with the slug field
+    values: values to slugify
+    field_name: name of the slug field
+    return: the slug of each value
+    """
+
+    field = model._meta.get_field(field_name)
+    scope = f"{model._meta.label_lower}.{field_name}"
+    manager = model._default_manager
+
+    pending = {value: base_slug(field, value) for value in values}
+    slugs: dict = {}
+    while pending:
+        counts = Counter(pending.values())
+        reserved = reserve(model, scope, counts, increment=True)
+
+        candidates, claims = {}, {}
+        for value, base in pending.items():
+            index = reserved[base] - counts[base] + 1
+            counts[base] -= 1
+            candidates[value] = slug = suffixed_slug(field, base, index)
+            if index > 1:
+                claims[slug] = 1
+
+        claimed = reserve(model, scope, claims, increment=False)
+        taken = set(
+            manager.filter(
+                **{f"{field_name}__in": list(candidates.values())}
+            ).values_list(field_name, flat=True)
+        )
+
+        retry, issued = {}, set(slugs.values())
+        for value, slug in candidates.items():
+            if (
+                slug in taken
+                or slug in issued
+                or (slug in claims and slug not in claimed)
+            ):
+                retry[value] = pending[value]
+            else:
+                slugs[value] = slug
+                issued.add(slug)
+        pending = retry
+    return slugs
+
+
+class AllocatedSlugField(AutoSlugField):
+    """
+    `AutoSlugField` that makes the slugs unique with `allocate_slugs`
+
+    The slug is populated when it is empty, a given slug is kept as it is,
+    so the rows of `bulk_create` can carry the slugs allocated in bulk.
+    `always_update` and `unique_with` are not supported.
+    """
+
+    def pre_save(self, instance, add):
+        slug = self.value_from_object(instance)
+        if not slug:
+            value = get_prepopulated_value(self, instance)
+            slug = allocate_slugs(self.model, [value], self.name)[value]
+            setattr(instance, self.attname, slug)
+        return slug
@@ -0,0 +1,89 @@
+import json
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+TOKEN_SALT = "hotels.changes"
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class ExpiredToken(Exception):
+    pass
+
+
+def make_token(moment: datetime) -> str:
+    """
+    Returns the opaque sync token of a moment
+
+    The token is signed so clients can not forge it, they only send it back.
+
+    moment: changes from this moment on are returned for the token
+    """
+
+    return signing.dumps(moment.isoformat(), salt=TOKEN_SALT)
+
+
+def read_token(token: str) -> datetime:
+    """
+    Returns the moment of a sync token
+
+    token: token from a previous changes response
+    return: the moment of the token
+    raise InvalidToken: if the token was not issued by this server
+    raise ExpiredToken: if the deletions since the token were purged
+    """
+
+    try:
+        moment = datetime.fromisoformat(signing.loads(token, salt=TOKEN_SALT))
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidToken("Invalid token.")
+
+    retention = timedelta(days=settings.HOTEL_TOMBSTONE_RETENTION_DAYS)
+    if moment < timezone.now() - retention:
+        raise ExpiredToken("Token expired, a full sync is required.")
+    return moment
+
+
+def next_token(now: Optional[datetime] = None) -> str:
+    """
+    Returns the token for the next sync
+
+    It is set `HOTEL_CHANGES_OVERLAP` seconds before now, so rows written by
+    transactions that were still open are not missed, they are sent again
+    in the next sync.
+    """
+
+    now = now or timezone.now()
+    return make_token(now - timedelta(seconds=settings.HOTEL_CHANGES_OVERLAP))
+
+
+def stream_changes(
+    token: str, sections: Iterable[tuple], chunk_size: int = 500
+) -> Iterator[bytes]:
+    """
+    Streams a JSON object with the token and a list of items by section,
+    rows are read with a server side iterator so the memory is bounded
+
+    token: token for the next sync
+    sections: (name, queryset, serialize) tuples, serialize returns the data
+    of an instance
+    chunk_size: rows fetched at once
+    """
+
+    renderer = JSONRenderer()
+    yield b'{"token": ' + json.dumps(token).encode()
+    for name, queryset, serialize in sections:
+        yield b", " + json.dumps(name).encode() + b": ["
+        separator = b""
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            yield separator + renderer.render(serialize(instance))
+            separator = b", "
+        yield b"]"
+    yield b"}"
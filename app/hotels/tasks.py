@@ -1,9 +1,18 @@
-from django.core.mail import send_mail
+from time import perf_counter
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mass_mail
 from django.conf import settings
+from django.db import transaction
 
 from celery import shared_task
 from celery.utils.log import get_task_logger
 
+from .cache import bump_generation
+from .images import generate_variants
+from .mail import mailer
+
 logger = get_task_logger(__name__)
 
 
@@ -17,6 +26,151 @@ def send_notification_email(subject, message, recipients):
     recipients: list of recipient emails
     """
 
-    send_mail(subject, message, settings.EMAIL_NO_REPLY, recipients, fail_silently=True)
+    mailer.send([(subject, message, recipients)])
 
     return f"Email sent to {', '.join(recipients)} successfully."
+
+
+@shared_task
+def send_notification_emails(messages):
+    """
+    Sends a batch of emails over the pooled connection, each recipient gets
+    the messages with the same subject and body once
+
+    messages: list of (subject, message, recipients)
+    """
+
+    sent = mailer.send(messages)
+
+    stats = mailer.stats()
+    logger.info(f"{sent} emails sent, {stats['messages_per_second']} messages/sec")
+    return f"{sent} emails sent."
+
+
+@shared_task
+def send_hotels_creation_notifications(hotel_ids):
+    """
+    Sends the creation email of the hotels, one per chain, over the pooled
+    connection
+
+    hotel_ids: ids of the created hotels, the ones that do not exist anymore
+    are skipped
+    """
+
+    Hotel = apps.get_model("hotels", "Hotel")
+
+    hotels_by_chain: dict = {}
+    hotels = (
+        Hotel.objects.filter(pk__in=hotel_ids, chain__isnull=False)
+        .exclude(chain__email="")
+        .select_related("chain")
+        .order_by("pk")
+    )
+    for hotel in hotels:
+        hotels_by_chain.setdefault(hotel.chain, []).append(hotel)
+
+    emails = [
+        (
+            hotels[0].creation_email()
+            if len(hotels) == 1
+            else chain.hotels_creation_email(hotels)
+        )
+        for chain, hotels in hotels_by_chain.items()
+    ]
+    sent = mailer.send(emails)
+    return f"{sent} emails sent."
+
+
+@shared_task
+def generate_photo_variants(hotel_ids):
+    """
+    Generates the WebP variants of the photo of the hotels, see
+    `HOTEL_PHOTO_VARIANTS`
+
+    hotel_ids: ids of the hotels, the ones without photo are skipped
+    """
+
+    Hotel = apps.get_model("hotels", "Hotel")
+    StoredFile = apps.get_model("hotels", "StoredFile")
+
+    generated = 0
+    hotels = Hotel.objects.filter(pk__in=hotel_ids).exclude(photo="").only("photo")
+    for hotel in hotels:
+        try:
+            variants = generate_variants(hotel.photo)
+        except OSError:
+            logger.exception(f"Error generating the photo variants of {hotel.pk}")
+            continue
+
+        with transaction.atomic():
+            # skipped if the photo changed meanwhile, its own task stores them
+            stored = (
+                Hotel.objects.select_for_update()
+                .filter(pk=hotel.pk, photo=hotel.photo.name)
+                .values_list("photo_variants", flat=True)
+                .first()
+            )
+            if stored is None:
+                continue
+            Hotel.objects.filter(pk=hotel.pk).update(photo_variants=variants)
+            StoredFile.objects.count_references([(stored.values(), variants.values())])
+            generated += 1
+
+    if generated:
+        bump_generation(Hotel)
+    return f"Photo variants of {generated} hotels generated."
+
+
+@shared_task
+def send_draft_digests():
+    """
+    Sends the drafts created since the last digest to every reviewer, one
+    email per reviewer and batch of `HOTEL_DRAFT_DIGEST_MAX_BATCH` drafts,
+    all of them over the same SMTP connection
+
+    Scheduled every `HOTEL_DRAFT_DIGEST_WINDOW` seconds by celery beat.
+    """
+
+    DraftNotification = apps.get_model("hotels", "DraftNotification")
+
+    recipients = list(
+        get_user_model()
+        .objects.filter(is_reviewer=True)
+        .exclude(email="")
+        .values_list("email", flat=True)
+    )
+
+    drafts = 0
+    with mailer.connection() as connection:
+        while True:
+            with transaction.atomic():
+                notifications = list(
+                    DraftNotification.objects.select_related(
+                        "draft__hotel", "draft__created_by"
+                    )
+                    .select_for_update(skip_locked=True, of=("self",))
+                    .order_by("pk")[: settings.HOTEL_DRAFT_DIGEST_MAX_BATCH]
+                )
+                if not notifications:
+                    break
+
+                lines = "<br>".join(n.draft.digest_line() for n in notifications)
+                count = len(notifications)
+                subject = f"{count} new hotel draft{'' if count == 1 else 's'}"
+                message = f"These hotels have been created as draft:<br>{lines}"
+                start = perf_counter()
+                sent = send_mass_mail(
+                    [
+                        (subject, message, settings.EMAIL_NO_REPLY, [recipient])
+                        for recipient in recipients
+                    ],
+                    connection=connection,
+                )
+                mailer.record(sent, perf_counter() - start)
+                DraftNotification.objects.filter(
+                    pk__in=[n.pk for n in notifications]
+                ).delete()
+                drafts += len(notifications)
+
+    logger.info(f"{drafts} drafts sent to {len(recipients)} reviewers")
+    return f"{drafts} drafts sent to {len(recipients)} reviewers."
@@ -1,9 +1,16 @@
+from io import BytesIO
+from unittest.mock import patch
+
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 from django.urls import reverse
 
+from PIL import Image
+
+from app.hotels.images import variant_name
 from app.hotels.models import photo_directory_path
 from app.hotels.models import Hotel, HotelChain
+from app.hotels.tasks import generate_photo_variants
 from ..base import image_path
 
 
@@ -96,6 +103,102 @@ class HotelPhotoDirectoryPathTestCase(TestCase):
         self.assertTrue(len(result), len(expected_path))
 
 
+class HotelPhotoVariantsTestCase(TestCase):
+    def setUp(self):
+        patcher = patch.object(generate_photo_variants, "delay")
+        self.delay = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_hotel(self, name: str = "test hotel") -> Hotel:
+        with open(image_path, "rb") as f:
+            with self.captureOnCommitCallbacks(execute=True):
+                hotel = Hotel.objects.create(
+                    name=name,
+                    photo=SimpleUploadedFile("test.png", f.read(), "image/png"),
+                )
+
+        self.delay.assert_called_once_with([hotel.pk])
+        self.delay.reset_mock()
+        generate_photo_variants([hotel.pk])
+        hotel.refresh_from_db()
+        return hotel
+
+    def test_variant_name(self):
+        result = variant_name("hotels/photo.png", "thumbnail")
+        expected = "hotels/photo_thumbnail.webp"
+        self.assertEqual(result, expected, msg=f"{expected} != {result}")
+
+    def test_variants_generated_on_commit(self):
+        hotel = self.create_hotel()
+
+        result = sorted(hotel.photo_variants)
+        expected = ["large", "small", "thumbnail"]
+        self.assertEqual(result, expected, msg=f"{expected} != {result}")
+
+        result = hotel.photo_variants["thumbnail"]
+        self.assertTrue(result.endswith(".webp"), msg=result)
+
+        with hotel.photo.storage.open(hotel.photo_variants["thumbnail"]) as f:
+            image = Image.open(f)
+            result = (image.format, image.size)
+        expected = ("WEBP", (100, 100))
+        self.assertEqual(result, expected, msg=f"{expected} != {result}")
+
+    def test_variant_urls(self):
+        hotel = self.create_hotel()
+
+        result = hotel.photo_variant_urls["small"]
+        expected = hotel.photo.storage.url(hotel.photo_variants["small"])
+        self.assertEqual(result, expected, msg=f"{expected} != {result}")
+
+    def test_variants_reset_when_the_photo_changes(self):
+        hotel = self.create_hotel()
+        buffer = BytesIO()
+        Image.new("RGB", (200, 100), "blue").save(buffer, "PNG")
+
+        hotel.photo = SimpleUploadedFile("blue.png", buffer.getvalue(), "image/png")
+        with self.captureOnCommitCallbacks() as callbacks:
+            hotel.save()
+
+        result = Hotel.objects.get(pk=hotel.pk).photo_variants
+        self.assertEqual(result, {}, msg=f"{{}} != {result}")
+
+        for callback in callbacks:
+            callback()
+        self.delay.assert_called_once_with([hotel.pk])
+        generate_photo_variants([hotel.pk])
+
+        result = Hotel.objects.get(pk=hotel.pk).photo_variants["large"]
+        with hotel.photo.storage.open(result) as f:
+            result = Image.open(f).size
+        expected = (200, 100)
+        self.assertEqual(result, expected, msg=f"{expected} != {result}")
+
+    def test_variants_kept_without_changes(self):
+        hotel = self.create_hotel()
+        expected = hotel.photo_variants
+
+        hotel.name = "renamed hotel"
+        with patch("app.hotels.signals.photos_changed.add") as add:
+            with self.captureOnCommitCallbacks(execute=True):
+                hotel.save()
+
+        add.assert_not_called()
+
+        result = Hotel.objects.get(pk=hotel.pk).photo_variants
+        self.assertEqual(result, expected, msg=f"{expected} != {result}")
+
+    def test_unreadable_photo(self):
+        hotel = Hotel.objects.create(
+            name="test hotel",
+            photo=SimpleUploadedFile("test.png", b"not an image", "image/png"),
+        )
+
+        result = generate_photo_variants(hotel_ids=[hotel.pk])
+        expected = "Photo variants of 0 hotels generated."
+        self.assertEqual(result, expected, msg=f"{expected} != {result}")
+
+
 class HotelAssignChainTestCase(TestCase):
     def setUp(self) -> None:
         self.hotel = Hotel.objects.create(name="test hotel")
@@ -181,8 +284,6 @@ class HotelAssignRelatedHotelsTestCase(TestCase):
         return super().setUp()
 
     def test_assign_related_hotels_with_chain(self):
-        self.hotel1.assign_related_hotels()
-
         expected = len([self.hotel2, self.hotel3, self.hotel4])
         result = self.hotel1.related_hotels.count()
 
@@ -1,7 +1,12 @@
+from io import StringIO
+
+from django.contrib.admin.sites import site
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 
-from app.hotels.models import HotelChain
+from app.hotels.importers import HotelImporter
+from app.hotels.models import Hotel, HotelChain
 
 
 class HotelChainTestCase(TestCase):
@@ -66,3 +71,95 @@ class HotelChainTestCase(TestCase):
         self.assertEqual(
             HotelChain.objects.filter(title="test hotel chain 3".title()).count(), 1
         )
+
+
+class HotelChainCountersTestCase(TestCase):
+    def setUp(self) -> None:
+        self.chain = HotelChain.objects.create(title="test hotel chain")
+        self.other = HotelChain.objects.create(title="other hotel chain")
+
+    def assert_counters(self, chain: HotelChain, hotels: int, active: int) -> None:
+        chain.refresh_from_db()
+
+        result = (chain.hotel_count, chain.active_hotel_count)
+        expected = (hotels, active)
+        self.assertEqual(result, expected, msg=f"{result} != {expected}")
+
+    def test_create(self):
+        Hotel.objects.create(name="test hotel", chain=self.chain, is_active=True)
+        Hotel.objects.create(name="test resort", chain=self.chain)
+
+        self.assert_counters(self.chain, 2, 1)
+        self.assertEqual(self.chain.number_of_hotels, 2)
+
+    def test_delete(self):
+        hotel = Hotel.objects.create(name="test hotel", chain=self.chain)
+        Hotel.objects.get(pk=hotel.pk).delete()
+
+        self.assert_counters(self.chain, 0, 0)
+
+    def test_change_chain(self):
+        hotel = Hotel.objects.create(
+            name="test hotel", chain=self.chain, is_active=True
+        )
+
+        hotel = Hotel.objects.get(pk=hotel.pk)
+        hotel.chain = self.other
+        hotel.save()
+
+        self.assert_counters(self.chain, 0, 0)
+        self.assert_counters(self.other, 1, 1)
+
+    def test_activation(self):
+        hotel = Hotel.objects.create(name="test hotel", chain=self.chain)
+
+        hotel.is_active = True
+        hotel.save()
+        hotel.save()
+
+        self.assert_counters(self.chain, 1, 1)
+
+    def test_save_deferred(self):
+        hotel = Hotel.objects.create(name="test hotel", chain=self.chain)
+
+        hotel = Hotel.objects.only("pk", "name").get(pk=hotel.pk)
+        hotel.is_active = True
+        hotel.save()
+
+        self.assert_counters(self.chain, 1, 1)
+
+    def test_admin_actions(self):
+        Hotel.objects.create(name="test hotel", chain=self.chain)
+        Hotel.objects.create(name="test resort", chain=self.other, is_active=True)
+        model_admin = site._registry[Hotel]
+
+        model_admin.hotel_make_active(None, Hotel.objects.all())
+        self.assert_counters(self.chain, 1, 1)
+        self.assert_counters(self.other, 1, 1)
+
+        model_admin.hotel_make_inactive(None, Hotel.objects.filter(chain=self.chain))
+        self.assert_counters(self.chain, 1, 0)
+        self.assert_counters(self.other, 1, 1)
+
+    def test_import(self):
+        Hotel.objects.create(name="test hotel", chain=self.chain)
+
+        rows = [
+            {"name": "test hotel", "chain": "other hotel chain", "is_active": "1"},
+            {"name": "test resort", "chain": "other hotel chain"},
+        ]
+        HotelImporter(notify=False).run(rows)
+
+        self.assert_counters(self.chain, 0, 0)
+        self.assert_counters(self.other, 2, 1)
+
+    def test_recount_chains(self):
+        Hotel.objects.create(name="test hotel", chain=self.chain, is_active=True)
+        HotelChain.objects.update(hotel_count=5, active_hotel_count=0)
+
+        output = StringIO()
+        call_command("recount_chains", stdout=output)
+
+        self.assertIn("2 chains recounted", output.getvalue())
+        self.assert_counters(self.chain, 1, 1)
+        self.assert_counters(self.other, 0, 0)
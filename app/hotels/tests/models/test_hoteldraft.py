@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from app.hotels.models import Hotel, HotelChain, HotelDraft
 from ..base import User
@@ -36,3 +38,57 @@ class HotelDraftTestCase(TestCase):
         draft.approved_and_save()
 
         self.assertEqual(draft.name, draft.hotel.name)
+
+    def test_approve_many(self):
+        resort = Hotel.objects.create(name="test resort")
+        drafts = [
+            HotelDraft.objects.create(
+                hotel=hotel, chain=self.chain, created_by=self.user, name=name
+            )
+            for hotel, name in ((self.hotel, "new hotel name"), (resort, "new resort"))
+        ]
+
+        approved = HotelDraft.approve_many([draft.pk for draft in drafts])
+
+        self.assertEqual(len(approved), 2)
+        result = sorted(Hotel.objects.values_list("name", flat=True))
+        self.assertEqual(result, ["new hotel name", "new resort"])
+        result = set(HotelDraft.objects.values_list("status", flat=True))
+        self.assertEqual(result, {HotelDraft.STATUS_APPROVED})
+
+        self.chain.refresh_from_db()
+        self.assertEqual(self.chain.hotel_count, 2)
+
+    def approve_queries(self, count: int) -> int:
+        drafts = []
+        for i in range(count):
+            hotel = Hotel.objects.create(name=f"hotel {count}-{i}")
+            drafts.append(
+                HotelDraft.objects.create(
+                    hotel=hotel,
+                    chain=self.chain,
+                    created_by=self.user,
+                    name=f"new hotel {count}-{i}",
+                )
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            approved = HotelDraft.approve_many([draft.pk for draft in drafts])
+
+        self.assertEqual(len(approved), count)
+        return len(context.captured_queries)
+
+    def test_approve_many_queries(self):
+        result = self.approve_queries(6)
+        expected = self.approve_queries(2)
+        self.assertEqual(result, expected, msg="Queries grow with the drafts")
+
+    def test_approve_many_skip_approved(self):
+        draft = HotelDraft.objects.create(
+            hotel=self.hotel, created_by=self.user, name="new hotel name"
+        )
+        draft.approved_and_save()
+
+        approved = HotelDraft.approve_many([draft.pk], batch_size=1)
+
+        self.assertEqual(approved, [])
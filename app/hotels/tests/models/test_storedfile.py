@@ -0,0 +1,143 @@
+from collections import Counter
+from io import BytesIO, StringIO
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from PIL import Image
+
+from app.config.storage import photo_storage
+from app.hotels.models import Hotel, HotelDraft, StoredFile
+from app.hotels.tasks import generate_photo_variants
+from ..base import User
+
+
+def make_photo(color: str = "red") -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGB", (60, 40), color).save(buffer, "PNG")
+    return SimpleUploadedFile(f"{color}.png", buffer.getvalue(), "image/png")
+
+
+class StoredFileTestCase(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.media = override_settings(MEDIA_ROOT=self.directory.name)
+        self.media.enable()
+
+    def tearDown(self):
+        self.media.disable()
+        self.directory.cleanup()
+
+    def references(self, name: str) -> int:
+        return StoredFile.objects.get(name=name).references
+
+    def test_photo_referenced(self):
+        hotel = Hotel.objects.create(name="test hotel", photo=make_photo())
+
+        result = self.references(hotel.photo.name)
+        self.assertEqual(result, 1, msg=f"Expected 1 reference, got {result}")
+
+    def test_same_photo_stored_once(self):
+        first = Hotel.objects.create(name="test hotel", photo=make_photo())
+        second = Hotel.objects.create(name="test resort", photo=make_photo())
+
+        self.assertEqual(first.photo.name, second.photo.name)
+        result = self.references(first.photo.name)
+        self.assertEqual(result, 2, msg=f"Expected 2 references, got {result}")
+
+    def test_variants_referenced(self):
+        with patch.object(generate_photo_variants, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                hotel = Hotel.objects.create(name="test hotel", photo=make_photo())
+        delay.assert_called_once_with([hotel.pk])
+        before = dict(StoredFile.objects.values_list("name", "references"))
+
+        generate_photo_variants([hotel.pk])
+        hotel.refresh_from_db()
+
+        self.assertTrue(hotel.photo_variants, msg="No variants generated")
+        # the variants of a small photo may be the same stored file
+        for name, count in Counter(hotel.photo_variants.values()).items():
+            result = self.references(name)
+            expected = before.get(name, 0) + count
+            self.assertEqual(result, expected, msg=f"{name} references")
+
+    def test_replaced_photo_released(self):
+        hotel = Hotel.objects.create(name="test hotel", photo=make_photo())
+        old = hotel.photo.name
+
+        hotel.photo = make_photo("blue")
+        hotel.save()
+
+        result = (self.references(old), self.references(hotel.photo.name))
+        expected = (0, 1)
+        self.assertEqual(result, expected, msg=f"Expected {expected}, got {result}")
+
+    def test_deleted_hotel_released(self):
+        hotel = Hotel.objects.create(name="test hotel", photo=make_photo())
+        hotel.delete()
+
+        result = self.references(hotel.photo.name)
+        self.assertEqual(result, 0, msg=f"Expected 0 references, got {result}")
+
+    def test_approved_draft_shares_photo(self):
+        hotel = Hotel.objects.create(name="test hotel")
+        draft = HotelDraft.objects.create(
+            hotel=hotel,
+            name="test hotel",
+            photo=make_photo(),
+            created_by=User.objects.create_user(email="test@test.com", password="foo"),
+        )
+
+        HotelDraft.approve_many([draft.pk])
+
+        result = self.references(draft.photo.name)
+        self.assertEqual(result, 2, msg=f"Expected 2 references, got {result}")
+
+    def test_recount(self):
+        hotel = Hotel.objects.create(name="test hotel", photo=make_photo())
+        StoredFile.objects.update(references=5)
+
+        result = StoredFile.objects.recount()  # type: ignore
+        self.assertEqual(result, 1, msg="One file fixed")
+
+        result = self.references(hotel.photo.name)
+        self.assertEqual(result, 1, msg=f"Expected 1 reference, got {result}")
+
+    def test_collect_photos(self):
+        storage = photo_storage()
+        hotel = Hotel.objects.create(name="test hotel", photo=make_photo())
+        released = Hotel.objects.create(name="test resort", photo=make_photo("blue"))
+        released.delete()
+        orphan = storage.save("hotels/orphan.png", ContentFile(b"orphan"))
+
+        output = StringIO()
+        call_command("collect_photos", grace=0, stdout=output)
+
+        self.assertTrue(storage.exists(hotel.photo.name), msg="Referenced photo")
+        self.assertFalse(storage.exists(released.photo.name), msg="Released photo")
+        self.assertFalse(storage.exists(orphan), msg="Photo without references")
+        self.assertFalse(StoredFile.objects.filter(name=released.photo.name).exists())
+        self.assertIn("2 files deleted", output.getvalue())
+
+    def test_collect_photos_grace(self):
+        storage = photo_storage()
+        orphan = storage.save("hotels/orphan.png", ContentFile(b"orphan"))
+
+        call_command("collect_photos", stdout=StringIO())
+
+        self.assertTrue(storage.exists(orphan), msg="Recent files are kept")
+
+    def test_collect_photos_dry_run(self):
+        storage = photo_storage()
+        orphan = storage.save("hotels/orphan.png", ContentFile(b"orphan"))
+
+        output = StringIO()
+        call_command("collect_photos", grace=0, dry_run=True, stdout=output)
+
+        self.assertTrue(storage.exists(orphan), msg="Nothing deleted in a dry run")
+        self.assertIn(orphan, output.getvalue())
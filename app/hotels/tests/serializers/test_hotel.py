@@ -1,10 +1,11 @@
+import hashlib
 from datetime import datetime, timezone
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import RequestFactory, TestCase
 from django.urls import reverse
 
-from app.hotels.models import Hotel, HotelChain, photo_directory_path
+from app.hotels.models import Hotel, HotelChain
 from app.hotels.serializers import HotelSerializer
 from ..base import image_path, TEST_LOCATION, ignore_fields, simple_msg
 
@@ -42,6 +43,7 @@ class HotelSerializerTestCase(TestCase):
             "slug": "test-hotel",
             "is_active": False,
             "location": TEST_LOCATION[0][0],
+            "photo_variants": {},
         }
 
         request = self.factory.get("/api/v1/hotels/")
@@ -64,11 +66,13 @@ class HotelSerializerTestCase(TestCase):
         self.assertEqual(len(results["created_at"]), len(expected_data["created_at"]))
         self.assertEqual(len(results["updated_at"]), len(expected_data["updated_at"]))
 
-        # Photo URL Generation
+        # Photo URL Generation, named by the content
+        with open(image_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
         expected_data_photo_url = (
-            f"http://testserver/media/{photo_directory_path(self.hotel, self.filename)}"
+            f"http://testserver/media/photos/{digest[:2]}/{digest[2:4]}/{digest}.png"
         )
-        self.assertEqual(len(results["photo"]), len(expected_data_photo_url))
+        self.assertEqual(results["photo"], expected_data_photo_url)
 
         # Remove the fields that are not relevant for the test
         # this fields are not relevant because they are dynamic
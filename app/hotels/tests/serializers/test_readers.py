@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from app.hotels.models import Hotel, HotelChain
+from app.hotels.readers import HotelChainReader, HotelReader
+from app.hotels.serializers import HotelChainSerializer, HotelSerializer
+from app.hotels.views import HotelChainViewSet, HotelViewSet
+from ..base import image_path
+
+
+# region Row Readers
+class RowReaderTestCase(TestCase):
+    """
+    The readers must render the same JSON as the serializers
+    """
+
+    def setUp(self) -> None:
+        self.context = {"request": Request(RequestFactory().get("/"))}
+
+        chain = HotelChain.objects.create(title="reader chain", price_range=3)
+        HotelChain.objects.create(title="empty chain", email="sales@empty.com")
+
+        with open(image_path, "rb") as f:
+            photo = SimpleUploadedFile("test.png", f.read(), "image/png")
+        Hotel.objects.create(name="reader hotel", chain=chain, photo=photo)
+        Hotel.objects.filter(name="reader hotel").update(
+            photo_variants={"thumbnail": "photos/reader_thumbnail.webp"}
+        )
+        Hotel.objects.create(name="reader sibling", chain=chain, is_active=True)
+        Hotel.objects.create(name="reader alone", location="barcelona")
+
+    def render(self, data) -> bytes:
+        return JSONRenderer().render(data)
+
+    def test_hotels(self):
+        queryset = Hotel.objects.order_by("-created_at", "-id")
+        reader = HotelReader(self.context)
+
+        result = self.render(reader.to_representation(queryset.values(*reader.columns)))
+        expected = self.render(
+            HotelSerializer(queryset, many=True, context=self.context).data
+        )
+        self.assertEqual(result, expected)
+        self.assertIn(b"/media/photos/reader_thumbnail.webp", result)
+
+    def test_chains(self):
+        queryset = HotelChain.objects.order_by("title", "id")
+        reader = HotelChainReader(self.context)
+
+        result = self.render(reader.to_representation(queryset.values(*reader.columns)))
+        expected = self.render(
+            HotelChainSerializer(queryset, many=True, context=self.context).data
+        )
+        self.assertEqual(result, expected)
+
+    def test_list_views(self):
+        for viewset, url in (
+            (HotelViewSet, reverse("hotel-list")),
+            (HotelChainViewSet, reverse("hotelchain-list")),
+        ):
+            result = self.client.get(url, {"count": "false"}).content
+            # the second response must not be the cached one
+            cache.clear()
+            with mock.patch.object(viewset, "reader_class", None):
+                expected = self.client.get(url, {"count": "false"}).content
+
+            self.assertEqual(result, expected, msg=url)
+            self.assertIn(b'"url":"http://testserver/api/v1/', result, msg=url)
@@ -0,0 +1,84 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.config.pagination import EstimatedCountPaginator
+from app.hotels.models import Hotel, HotelChain, HotelDraft
+from .base import User
+
+
+# region Changelist Query Count
+class AdminQueryCountTestCase(TestCase):
+    """
+    The number of queries of an admin page must not depend on its rows
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            email="admin@test.com", password="foo"
+        )
+        self.client.force_login(self.user)
+        self.chain = HotelChain.objects.create(title="admin chain")
+
+    def create_catalogue(self, size: int, offset: int = 0) -> None:
+        for i in range(offset, offset + size):
+            chain = HotelChain.objects.create(title=f"admin chain {i}")
+            hotel = Hotel.objects.create(name=f"admin hotel {i}", chain=chain)
+            Hotel.objects.create(name=f"admin sibling {i}", chain=self.chain)
+            HotelDraft.objects.create(
+                hotel=hotel,
+                name=f"admin draft {i}",
+                chain=chain,
+                created_by=self.user,
+            )
+
+    def count_queries(self, url: str) -> int:
+        ContentType.objects.clear_cache()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assert_constant_queries(self, url: str) -> None:
+        self.create_catalogue(2)
+        small = self.count_queries(url)
+
+        self.create_catalogue(10, offset=2)
+        large = self.count_queries(url)
+
+        self.assertEqual(small, large, msg=f"{small} queries grew to {large}")
+
+    def test_hoteldraft_changelist(self):
+        self.assert_constant_queries(reverse("admin:hotels_hoteldraft_changelist"))
+
+    def test_hotel_changelist(self):
+        self.assert_constant_queries(reverse("admin:hotels_hotel_changelist"))
+
+    def test_hotelchain_change(self):
+        url = reverse("admin:hotels_hotelchain_change", args=[self.chain.pk])
+        self.assert_constant_queries(url)
+
+    def test_hoteldraft_changelist_approved_without_chain(self):
+        self.create_catalogue(1)
+        HotelDraft.objects.update(status=HotelDraft.STATUS_APPROVED, chain=None)
+
+        response = self.client.get(reverse("admin:hotels_hoteldraft_changelist"))
+
+        self.assertEqual(response.status_code, 200)
+
+
+# region Estimated Count
+class EstimatedCountPaginatorTestCase(TestCase):
+    def test_exact_count_without_estimates(self):
+        HotelChain.objects.bulk_create(
+            [HotelChain(title=f"count chain {i}", slug=f"count-{i}") for i in range(3)]
+        )
+
+        paginator = EstimatedCountPaginator(HotelChain.objects.order_by("pk"), 2)
+
+        result = paginator.count
+        expected = 3
+        self.assertEqual(result, expected, msg=f"Expected {expected} chains")
@@ -0,0 +1,59 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from app.hotels.models import Hotel, HotelChain, HotelDraft
+
+
+class BenchApiTestCase(TestCase):
+    def test_bench_api(self):
+        output = StringIO()
+        call_command(
+            "bench_api", chains=2, hotels=3, drafts=1, requests=3, stdout=output
+        )
+        results = json.loads(output.getvalue())
+
+        result = results["meta"]["database"]
+        self.assertEqual(result, connection.vendor, msg=results["meta"])
+
+        for name, scenario in results["scenarios"].items():
+            result = list(scenario["status"])
+            self.assertTrue(
+                all(code < "400" for code in result), msg=f"{name}: {result}"
+            )
+            result = scenario["latency_ms"]
+            self.assertLessEqual(result["p50"], result["p99"], msg=name)
+
+        result = list(results["scenarios"])
+        self.assertIn("drafts.approve", result)
+        self.assertEqual(len(result), 15, msg=result)
+
+    def test_bench_api_rolled_back(self):
+        call_command("bench_api", chains=1, hotels=1, requests=1, stdout=StringIO())
+
+        result = (
+            HotelChain.objects.count(),
+            Hotel.objects.count(),
+            HotelDraft.objects.count(),
+        )
+        self.assertEqual(result, (0, 0, 0), msg="Nothing is kept")
+
+
+class BenchSerializersTestCase(TestCase):
+    def test_bench_serializers(self):
+        output = StringIO()
+        call_command(
+            "bench_serializers", chains=2, hotels=3, rows=5, repeat=1, stdout=output
+        )
+        results = json.loads(output.getvalue())
+
+        result = results["lists"]["hotels.list"]["reader"]["rows"]
+        self.assertEqual(result, 5, msg=results)
+        for name, measures in results["lists"].items():
+            self.assertTrue(measures["identical"], msg=name)
+
+        result = Hotel.objects.count()
+        self.assertEqual(result, 0, msg="Nothing is kept")
@@ -0,0 +1,116 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core import mail
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from app.hotels.catalogue import seed_catalogue
+from app.hotels.models import DraftNotification, Hotel, HotelChain, HotelDraft
+from .base import User
+
+
+def get_rows() -> list:
+    return [
+        list(HotelChain.objects.order_by("pk").values_list("slug", "price_range")),
+        list(Hotel.objects.order_by("pk").values_list("slug", "is_active")),
+        list(HotelDraft.objects.order_by("pk").values_list("slug", "status")),
+    ]
+
+
+class SeedCatalogueTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@test.com", password="foo")
+
+    def test_seed_catalogue(self):
+        catalogue = seed_catalogue(3, 4, 2, self.user)
+
+        result = (HotelChain.objects.count(), Hotel.objects.count())
+        self.assertEqual(result, (3, 12), msg="Chains and hotels")
+        result = list(HotelDraft.objects.values_list("pk", flat=True).order_by("pk"))
+        self.assertEqual(result, list(catalogue.drafts), msg="Ids of the drafts")
+
+    def test_counters(self):
+        seed_catalogue(3, 4, 0, self.user)
+
+        result = HotelChain.objects.recount()  # type: ignore
+        self.assertEqual(result, 0, msg="Counters computed while generated")
+
+    def test_deterministic(self):
+        seed_catalogue(2, 3, 1, self.user, seed=7)
+        expected = get_rows()
+        HotelDraft.objects.all().delete()
+        Hotel.objects.all().delete()
+        HotelChain.objects.all().delete()
+
+        seed_catalogue(2, 3, 1, self.user, seed=7)
+        self.assertEqual(get_rows(), expected, msg="Same seed, same catalogue")
+
+    def test_continues_ids(self):
+        catalogue = seed_catalogue(1, 2, 1, self.user)
+
+        hotel = Hotel.objects.create(name="test hotel")
+        self.assertGreater(hotel.pk, catalogue.hotels[-1])
+
+    def test_no_notifications(self):
+        seed_catalogue(1, 2, 1, self.user)
+
+        self.assertFalse(DraftNotification.objects.exists())
+        self.assertEqual(len(mail.outbox), 0, msg="No emails sent")
+
+    def test_command(self):
+        output = StringIO()
+        call_command("seed_catalogue", chains=2, hotels=3, drafts=2, stdout=output)
+
+        self.assertIn("2 chains, 6 hotels and 12 drafts created", output.getvalue())
+        self.assertTrue(User.objects.filter(email="seed@example.com").exists())
+
+    def test_empty_db_not_empty(self):
+        seed_catalogue(1, 2, 1, self.user)
+
+        with self.assertRaises(ValueError):
+            seed_catalogue(1, 2, 1, self.user, empty_db=True)
+        self.assertEqual(Hotel.objects.count(), 2, msg="Nothing loaded")
+
+    def test_command_empty_db_not_empty(self):
+        seed_catalogue(1, 2, 1, self.user)
+
+        with self.assertRaises(CommandError):
+            call_command("seed_catalogue", chains=1, empty_db=True, stdout=StringIO())
+
+
+@skipUnless(connection.vendor == "postgresql", "Empty database load")
+class SeedEmptyCatalogueTestCase(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@test.com", password="foo")
+
+    def get_definitions(self) -> list:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT pg_get_indexdef(indexrelid) FROM pg_index
+                WHERE indrelid::regclass::text LIKE 'hotels_hotel%%'
+                UNION ALL
+                SELECT conname || pg_get_constraintdef(oid) FROM pg_constraint
+                WHERE conrelid::regclass::text LIKE 'hotels_hotel%%'
+                """)
+            return sorted(cursor.fetchall())
+
+    def test_empty_db(self):
+        definitions = self.get_definitions()
+        seed_catalogue(3, 4, 2, self.user, seed=7, batch_size=4)
+        expected = get_rows()
+        HotelDraft.objects.all().delete()
+        Hotel.objects.all().delete()
+        HotelChain.objects.all().delete()
+
+        catalogue = seed_catalogue(
+            3, 4, 2, self.user, seed=7, batch_size=4, empty_db=True
+        )
+        self.assertEqual(get_rows(), expected, msg="Same catalogue")
+        self.assertEqual(self.get_definitions(), definitions, msg="Rebuilt")
+        self.assertEqual(HotelChain.objects.recount(), 0)  # type: ignore
+
+        hotel = Hotel.objects.create(name="test hotel")
+        self.assertGreater(hotel.pk, catalogue.hotels[-1], msg="Sequences reset")
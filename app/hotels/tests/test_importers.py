@@ -0,0 +1,105 @@
+import gzip
+from io import StringIO
+from tempfile import NamedTemporaryFile
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+
+from app.hotels.importers import HotelImporter, read_csv, read_ndjson
+from app.hotels.models import Hotel, HotelChain
+from app.hotels.tasks import send_notification_emails
+
+
+class HotelImporterTestCase(TestCase):
+    def test_read_ndjson(self):
+        rows = list(read_ndjson([b'{"name": "a"}\n', b"\n", b"[1]\n", b"{\n"]))
+
+        self.assertEqual(rows[0], {"name": "a"})
+        self.assertEqual(rows[1], {"error": "Expected an object"})
+        self.assertIn("error", rows[2])
+
+    def test_read_csv(self):
+        rows = list(read_csv(["name,chain\n", "a,b\n"]))
+
+        self.assertEqual(rows, [{"name": "a", "chain": "b"}])
+
+    def test_import(self):
+        rows = [
+            {"name": f"import hotel {i}", "chain": "import chain"} for i in range(5)
+        ]
+
+        report = HotelImporter(chunk_size=2).run(rows)
+
+        result = (report.rows, report.created, report.chains_created, report.failed)
+        self.assertEqual(result, (5, 5, 1, 0), msg=str(report))
+
+        result = Hotel.objects.filter(chain__title="Import Chain").count()
+        self.assertEqual(result, 5, msg=str(report))
+
+        result = set(Hotel.objects.values_list("slug", flat=True))
+        expected = {f"import-hotel-{i}" for i in range(5)}
+        self.assertSetEqual(result, expected)
+
+    def test_import_auto_assign(self):
+        chain = HotelChain.objects.create(title="sunny resorts", auto_assign=True)
+
+        HotelImporter().run([{"name": "sunny madrid"}])
+
+        result = Hotel.objects.get(name="sunny madrid").chain
+        self.assertEqual(result, chain, msg=f"{result} != {chain}")
+
+    def test_import_invalid_location(self):
+        report = HotelImporter().run([{"name": "hotel", "location": "nowhere"}])
+
+        result = (report.created, report.failed)
+        self.assertEqual(result, (0, 1), msg=str(report))
+
+    def test_one_notification_per_chain(self):
+        HotelChain.objects.create(title="mail chain", email="chain@example.com")
+        HotelChain.objects.create(title="other chain", email="other@example.com")
+        rows = [{"name": f"mail hotel {i}", "chain": "mail chain"} for i in range(3)]
+        rows.append({"name": "other hotel", "chain": "other chain"})
+
+        with mock.patch.object(send_notification_emails, "delay") as delay:
+            HotelImporter(chunk_size=1).run(rows)
+
+        delay.assert_called_once()
+        (emails,) = delay.call_args.args
+        result = sorted(recipients for _, _, recipients in emails)
+        expected = [["chain@example.com"], ["other@example.com"]]
+        self.assertEqual(result, expected, msg=emails)
+
+        send_notification_emails(emails)
+
+        result = sorted(message.to for message in mail.outbox)
+        self.assertEqual(result, expected, msg=mail.outbox)
+
+    def test_import_hotels_command(self):
+        with NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write("name,location\ncommand hotel,sevilla\n")
+            file.flush()
+
+            out = StringIO()
+            call_command("import_hotels", file.name, "--no-notify", stdout=out)
+
+        self.assertIn("1 created", out.getvalue())
+        self.assertTrue(Hotel.objects.filter(name="command hotel").exists())
+
+
+class ExportHotelsCommandTestCase(TestCase):
+    def test_round_trip(self):
+        chain = HotelChain.objects.create(title="sunny resorts")
+        Hotel.objects.create(name="sunny madrid", location="madrid", chain=chain)
+
+        with NamedTemporaryFile(suffix=".csv.gz") as file:
+            call_command("export_hotels", file.name, stdout=StringIO())
+            Hotel.objects.all().delete()
+
+            with gzip.open(file.name, "rt", newline="") as export:
+                HotelImporter(notify=False).run(read_csv(export))
+
+        hotel = Hotel.objects.get(name="sunny madrid")
+        self.assertEqual(hotel.location, "madrid")
+        self.assertEqual(hotel.chain, chain)
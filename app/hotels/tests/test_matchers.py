@@ -0,0 +1,87 @@
+from django.db import transaction
+from django.test import TestCase
+
+from app.hotels.matchers import chain_matcher
+from app.hotels.models import Hotel, HotelChain
+
+
+class ChainMatcherTestCase(TestCase):
+    def setUp(self) -> None:
+        self.chain = HotelChain.objects.create(title="sunny resorts", auto_assign=True)
+
+    def test_match(self):
+        result = chain_matcher.match("Sunny Beach")
+        self.assertEqual(result, self.chain.pk, msg=f"{result} != {self.chain.pk}")
+
+    def test_match_substring(self):
+        result = chain_matcher.match("resort madrid")
+        self.assertEqual(result, self.chain.pk, msg=f"{result} != {self.chain.pk}")
+
+    def test_no_match(self):
+        result = chain_matcher.match("rainy inn")
+        self.assertIsNone(result, msg=f"{result} != None")
+
+    def test_without_queries(self):
+        chain_matcher.match("warm up")
+
+        with self.assertNumQueries(0):
+            chain_matcher.match("sunny")
+
+    def test_ignore_no_auto_assign(self):
+        HotelChain.objects.filter(pk=self.chain.pk).delete()
+        HotelChain.objects.create(title="sunny resorts", auto_assign=False)
+
+        result = chain_matcher.match("sunny")
+        self.assertIsNone(result, msg=f"{result} != None")
+
+    def test_ignore_short_title(self):
+        HotelChain.objects.create(title="inn", auto_assign=True)
+
+        result = chain_matcher.match("inn")
+        self.assertIsNone(result, msg=f"{result} != None")
+
+    def test_best_match(self):
+        chain = HotelChain.objects.create(title="sunny beach hotels", auto_assign=True)
+
+        result = chain_matcher.match("sunny beach")
+        self.assertEqual(result, chain.pk, msg=f"{result} != {chain.pk}")
+
+    def test_deterministic_tie(self):
+        HotelChain.objects.create(title="sunny hotels", auto_assign=True)
+
+        # same number of matched words, the shortest title wins
+        result = chain_matcher.match("sunny")
+        expected = HotelChain.objects.get(title="Sunny Hotels").pk
+        self.assertEqual(result, expected, msg=f"{result} != {expected}")
+
+    def test_invalidate_on_save(self):
+        chain_matcher.match("warm up")
+
+        self.chain.title = "rainy resorts"
+        self.chain.save()
+
+        result = chain_matcher.match("rainy")
+        self.assertEqual(result, self.chain.pk, msg=f"{result} != {self.chain.pk}")
+
+    def test_invalidate_on_delete(self):
+        chain_matcher.match("warm up")
+
+        self.chain.delete()
+
+        result = chain_matcher.match("sunny")
+        self.assertIsNone(result, msg=f"{result} != None")
+
+    def test_rolled_back_chain(self):
+        with transaction.atomic():
+            chain = HotelChain.objects.create(title="rainy resorts", auto_assign=True)
+            result = chain_matcher.match("rainy")
+            self.assertEqual(result, chain.pk, msg=f"{result} != {chain.pk}")
+            transaction.set_rollback(True)
+
+        result = chain_matcher.match("rainy")
+        self.assertIsNone(result, msg=f"{result} != None")
+
+    def test_assign_chain(self):
+        hotel = Hotel.objects.create(name="sunny madrid")
+
+        self.assertEqual(hotel.chain, self.chain, msg=f"{hotel.chain} != {self.chain}")
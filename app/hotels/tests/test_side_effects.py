@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.core import mail
+from django.db import transaction
+from django.test import TestCase
+
+from app.hotels.models import Hotel, HotelChain
+from app.hotels.side_effects import OnCommitBuffer
+from app.hotels.tasks import send_hotels_creation_notifications
+
+
+class OnCommitBufferTestCase(TestCase):
+    def setUp(self):
+        self.flushed = []
+        self.buffer = OnCommitBuffer(self.flushed.append)
+
+    def test_coalesce(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.buffer.add("chain", 1)
+            self.buffer.add("chain", 2)
+            self.buffer.add("other", 3)
+
+            self.assertEqual(self.flushed, [])
+
+        expected = [{"chain": {1, 2}, "other": {3}}]
+        self.assertEqual(self.flushed, expected, msg=self.flushed)
+
+    def test_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.buffer.add("chain", 1)
+                transaction.set_rollback(True)
+
+            self.buffer.add("chain", 2)
+
+        expected = [{"chain": {2}}]
+        self.assertEqual(self.flushed, expected, msg=self.flushed)
+
+    def test_next_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.buffer.add("chain", 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.buffer.add("chain", 2)
+
+        expected = [{"chain": {1}}, {"chain": {2}}]
+        self.assertEqual(self.flushed, expected, msg=self.flushed)
+
+
+class HotelCreationSideEffectsTestCase(TestCase):
+    def setUp(self):
+        self.chain = HotelChain.objects.create(title="test chain", email="c@test.com")
+        mail.outbox = []
+
+        patcher = mock.patch.object(send_hotels_creation_notifications, "delay")
+        self.delay = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_notifications_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            hotel = Hotel.objects.create(name="test hotel", chain=self.chain)
+
+            self.delay.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+        self.delay.assert_called_once_with([hotel.pk])
+
+    def test_notifications_coalesced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            hotels = [
+                Hotel.objects.create(name=f"test hotel {i}", chain=self.chain)
+                for i in range(3)
+            ]
+
+        self.delay.assert_called_once_with([hotel.pk for hotel in hotels])
+
+    def test_no_notifications_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Hotel.objects.create(name="test hotel", chain=self.chain)
+                transaction.set_rollback(True)
+
+        self.delay.assert_not_called()
+
+    def test_send_notifications(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            hotels = [
+                Hotel.objects.create(name=f"test hotel {i}", chain=self.chain)
+                for i in range(3)
+            ]
+            other = HotelChain.objects.create(title="other chain", email="o@test.com")
+            hotels.append(Hotel.objects.create(name="other hotel", chain=other))
+
+        result = send_hotels_creation_notifications([hotel.pk for hotel in hotels])
+
+        self.assertEqual(result, "2 emails sent.")
+        result = [(message.subject, message.to) for message in mail.outbox]
+        expected = [
+            ("New hotels created", ["c@test.com"]),
+            ("New hotel created", ["o@test.com"]),
+        ]
+        self.assertEqual(result, expected, msg=result)
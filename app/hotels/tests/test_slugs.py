@@ -0,0 +1,66 @@
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.hotels.models import Hotel, HotelChain, HotelDraft
+from app.hotels.slugs import allocate_slugs
+from .base import User
+
+
+class AllocateSlugsTestCase(TestCase):
+    def test_allocate_slugs(self):
+        Hotel.objects.create(name="test hotel")
+        Hotel.objects.create(name="test´hotel")
+
+        result = allocate_slugs(Hotel, ["Test Hotel", "new hotel", "test-hotel"])
+        expected = {
+            "Test Hotel": "test-hotel-3",
+            "new hotel": "new-hotel",
+            "test-hotel": "test-hotel-4",
+        }
+        self.assertDictEqual(result, expected)
+
+    def test_same_name(self):
+        hotel = Hotel.objects.create(name="hotel central")
+        user = User.objects.create_user(email="test@test.com", password="foo")
+        for _ in range(20):
+            HotelDraft.objects.create(
+                hotel=hotel, name="hotel central", created_by=user
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            result = allocate_slugs(HotelDraft, ["Hotel Central"])
+
+        self.assertEqual(result, {"Hotel Central": "hotel-central-21"})
+        self.assertLessEqual(len(context), 3, msg="Independent of the index")
+
+    def test_suffixed_slug_claimed(self):
+        Hotel.objects.create(name="hotel")
+        Hotel.objects.create(name="hotel´")
+
+        hotel = Hotel.objects.create(name="hotel 2")
+
+        result = hotel.slug
+        self.assertEqual(result, "hotel-2-2", msg="hotel-2 is taken")
+
+    def test_slug_stored_without_allocator(self):
+        hotel = Hotel.objects.create(name="test hotel")
+        Hotel.objects.filter(pk=hotel.pk).update(slug="new-hotel")
+
+        result = allocate_slugs(Hotel, ["new hotel"])
+        self.assertEqual(result, {"new hotel": "new-hotel-2"})
+
+    def test_rolled_back(self):
+        with transaction.atomic():
+            allocate_slugs(HotelChain, ["new chain"])
+            transaction.set_rollback(True)
+
+        result = allocate_slugs(HotelChain, ["new chain"])
+        self.assertEqual(result, {"new chain": "new-chain"}, msg="Index released")
+
+    def test_slug_kept_on_update(self):
+        chain = HotelChain.objects.create(title="new chain")
+        chain.title = "updated chain"
+        chain.save()
+
+        self.assertEqual(chain.slug, "new-chain")
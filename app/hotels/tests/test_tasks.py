@@ -1,9 +1,20 @@
-from django.test import TestCase
+import smtplib
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
 
 from celery.result import AsyncResult
 from celery.exceptions import TimeoutError
 
-from ..tasks import send_notification_email
+from app.hotels.mail import deduplicate_messages, mailer
+from app.hotels.models import DraftNotification, Hotel, HotelChain, HotelDraft
+from .base import User
+from ..tasks import (
+    send_draft_digests,
+    send_notification_email,
+    send_notification_emails,
+)
 
 
 class TestTasks(TestCase):
@@ -20,3 +31,134 @@ class TestTasks(TestCase):
             self.assertEqual(result, expected, f"Expected: {expected}, got: {result}")
         except TimeoutError:
             self.fail("Task execution timed out")
+
+
+class TestDraftDigests(TestCase):
+    def setUp(self):
+        self.reviewers = ["reviewer1@test.com", "reviewer2@test.com"]
+        for email in self.reviewers:
+            User.objects.create_reviewer(email=email, password="foo")  # type: ignore
+        self.user = User.objects.get(email=self.reviewers[0])
+
+        chain = HotelChain.objects.create(title="test chain", email="chain@test.com")
+        self.hotel = Hotel.objects.create(name="test hotel", chain=chain)
+        mail.outbox = []
+
+    def create_drafts(self, size: int) -> None:
+        for i in range(size):
+            HotelDraft.objects.create(
+                hotel=self.hotel, name=f"draft {i}", created_by=self.user
+            )
+
+    def test_drafts_are_buffered(self):
+        self.create_drafts(3)
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(DraftNotification.objects.count(), 3)
+
+    def test_send_draft_digests(self):
+        self.create_drafts(3)
+
+        result = send_draft_digests()
+
+        expected = "3 drafts sent to 2 reviewers."
+        self.assertEqual(result, expected, f"Expected: {expected}, got: {result}")
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), self.reviewers)
+        self.assertEqual(mail.outbox[0].subject, "3 new hotel drafts")
+        self.assertEqual(DraftNotification.objects.count(), 0)
+
+    @override_settings(HOTEL_DRAFT_DIGEST_MAX_BATCH=2)
+    def test_send_draft_digests_max_batch(self):
+        self.create_drafts(3)
+
+        send_draft_digests()
+
+        result = sorted(m.subject for m in mail.outbox)
+        expected = ["1 new hotel draft"] * 2 + ["2 new hotel drafts"] * 2
+        self.assertEqual(result, expected, f"Expected: {expected}, got: {result}")
+
+    def test_send_draft_digests_empty(self):
+        send_draft_digests()
+
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class TestNotificationEmails(TestCase):
+    def setUp(self):
+        mail.outbox = []
+
+    def test_deduplicate_messages(self):
+        messages = [
+            ("subject", "message", ["a@test.com", "b@test.com"]),
+            ("subject", "message", ["b@test.com", "c@test.com"]),
+            ("other", "message", ["a@test.com", "a@test.com"]),
+            ("subject", "message", ["a@test.com"]),
+            ("empty", "message", []),
+        ]
+
+        result = deduplicate_messages(messages)
+        expected = [
+            ("subject", "message", ["a@test.com", "b@test.com"]),
+            ("subject", "message", ["c@test.com"]),
+            ("other", "message", ["a@test.com"]),
+        ]
+        self.assertEqual(result, expected, f"Expected: {expected}, got: {result}")
+
+    def test_send_notification_emails(self):
+        messages = [
+            ("subject", "message", ["a@test.com"]),
+            ("subject", "message", ["a@test.com", "b@test.com"]),
+        ]
+
+        result = send_notification_emails(messages)
+
+        self.assertEqual(result, "2 emails sent.")
+        result = [message.to for message in mail.outbox]
+        expected = [["a@test.com"], ["b@test.com"]]
+        self.assertEqual(result, expected, f"Expected: {expected}, got: {result}")
+
+    def test_resend_after_disconnection(self):
+        class Connection:
+            def __init__(self, fail_at=None):
+                self.sent, self.fail_at = [], fail_at
+
+            def open(self):
+                pass
+
+            def close(self):
+                pass
+
+            def send_messages(self, messages):
+                if len(self.sent) == self.fail_at:
+                    raise smtplib.SMTPServerDisconnected()
+                self.sent.extend(message.subject for message in messages)
+                return len(messages)
+
+        connections = [Connection(fail_at=2), Connection()]
+        mailer.close()
+        self.addCleanup(mailer.close)
+
+        with mock.patch("app.hotels.mail.get_connection", side_effect=connections):
+            result = mailer.send(
+                [(f"subject {i}", "message", ["a@test.com"]) for i in range(4)]
+            )
+
+        self.assertEqual(result, 4)
+        result = [connection.sent for connection in connections]
+        expected = [["subject 0", "subject 1"], ["subject 2", "subject 3"]]
+        self.assertEqual(result, expected, f"Expected: {expected}, got: {result}")
+
+    def test_pooled_connection(self):
+        with mailer.connection() as first:
+            pass
+        with mailer.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+
+    def test_stats(self):
+        sent = mailer.stats()["sent"]
+
+        mailer.send([("subject", "message", ["a@test.com"])])
+
+        self.assertEqual(mailer.stats()["sent"], sent + 1)
@@ -0,0 +1,116 @@
+from io import BytesIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from PIL import Image
+from rest_framework import status
+
+from app.hotels.models import Hotel
+from app.hotels.uploads import PhotoTooLarge, PhotoUploadHandler, validate_photo
+from .views.base import TestSetup
+
+
+def make_photo(size: tuple = (60, 40), format: str = "PNG") -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, format)
+    return SimpleUploadedFile(f"photo.{format.lower()}", buffer.getvalue())
+
+
+# region Validation
+class ValidatePhotoTestCase(SimpleTestCase):
+    def assert_invalid(self, file, code: str) -> None:
+        with self.assertRaises(ValidationError) as context:
+            validate_photo(file)
+
+        result = context.exception.code
+        self.assertEqual(result, code, msg=context.exception.messages)
+
+    def test_valid_photo(self):
+        validate_photo(make_photo())
+
+    @override_settings(HOTEL_PHOTO_MAX_BYTES=100)
+    def test_too_large(self):
+        self.assert_invalid(make_photo((200, 200)), "photo_too_large")
+
+    @override_settings(HOTEL_PHOTO_MAX_PIXELS=100)
+    def test_too_many_pixels(self):
+        self.assert_invalid(make_photo((20, 20)), "photo_too_many_pixels")
+
+    def test_not_an_image(self):
+        self.assert_invalid(SimpleUploadedFile("photo.png", b"text"), "invalid_image")
+
+    def test_format(self):
+        self.assert_invalid(make_photo(format="BMP"), "invalid_image_format")
+
+
+# region Upload Handler
+class PhotoUploadHandlerTestCase(SimpleTestCase):
+    def make_handler(self, field_name: str = "photo") -> PhotoUploadHandler:
+        handler = PhotoUploadHandler()
+        handler.new_file(field_name, "photo.png", "image/png", None)
+        return handler
+
+    @override_settings(HOTEL_PHOTO_MAX_BYTES=10)
+    def test_stops_large_photos(self):
+        handler = self.make_handler()
+        handler.receive_data_chunk(b"x" * 8, 0)
+
+        with self.assertRaises(PhotoTooLarge):
+            handler.receive_data_chunk(b"x" * 8, 8)
+
+    @override_settings(HOTEL_PHOTO_MAX_BYTES=10)
+    def test_content_length(self):
+        handler = PhotoUploadHandler()
+
+        with self.assertRaises(PhotoTooLarge):
+            handler.new_file("photo", "photo.png", "image/png", 20)
+
+    def test_streams_to_a_temporary_file(self):
+        handler = self.make_handler()
+        handler.receive_data_chunk(b"photo", 0)
+
+        file = handler.file_complete(5)
+        self.assertTrue(file.temporary_file_path(), msg="Written to disk")
+        file.close()
+
+    def test_other_fields_passed_on(self):
+        handler = self.make_handler("file")
+
+        result = handler.receive_data_chunk(b"data", 0)
+        self.assertEqual(result, b"data", msg="Handled by the next handlers")
+        self.assertIsNone(handler.file_complete(4))
+
+
+# region API
+class PhotoUploadTestCase(TestSetup):
+    def post_hotel(self, photo) -> dict:
+        data = {"name": "uploaded hotel", "chain.title": "test chain", "photo": photo}
+        return self.client.post(reverse("hotel-list"), data, format="multipart")
+
+    @override_settings(HOTEL_PHOTO_MAX_BYTES=100)
+    def test_large_photo_rejected(self):
+        response = self.post_hotel(make_photo((200, 200)))
+
+        result = response.status_code
+        expected = status.HTTP_400_BAD_REQUEST
+        self.assertEqual(result, expected, msg=response.json())
+        self.assertFalse(Hotel.objects.filter(name="uploaded hotel").exists())
+
+    @override_settings(HOTEL_PHOTO_MAX_PIXELS=100)
+    def test_large_dimensions_rejected(self):
+        response = self.post_hotel(make_photo((20, 20)))
+
+        result = response.status_code
+        expected = status.HTTP_400_BAD_REQUEST
+        self.assertEqual(result, expected, msg=response.json())
+        self.assertIn("photo", response.json())
+
+    def test_photo_uploaded(self):
+        response = self.post_hotel(make_photo())
+
+        result = response.status_code
+        expected = status.HTTP_201_CREATED
+        self.assertEqual(result, expected, msg=response.json())
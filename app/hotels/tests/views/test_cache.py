@@ -0,0 +1,94 @@
+from django.contrib.admin.sites import site
+from django.urls import reverse
+
+from rest_framework import status
+
+from app.hotels.cache import response_cache_stats
+from app.hotels.models import Hotel, HotelChain
+from .base import TestSetup
+
+
+# region Response Cache
+class ResponseCacheTestCase(TestSetup):
+    def setUp(self):
+        super().setUp()
+
+        # anonymous reads
+        self.client.credentials()  # type: ignore
+
+        self.url = reverse("hotel-list")
+
+    def get(self, url: str, expected_cache: str, **params):
+        response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        self.assertEqual(response["X-Cache"], expected_cache, msg=response.json())
+        return response
+
+    def test_hit(self):
+        first = self.get(self.url, "MISS")
+
+        with self.assertNumQueries(0):
+            second = self.get(self.url, "HIT")
+
+        self.assertEqual(first.json(), second.json())
+
+    def test_query_params(self):
+        self.get(self.url, "MISS")
+        self.get(self.url, "MISS", name="resort")
+        self.get(self.url, "HIT", name="resort")
+
+    def test_detail(self):
+        url = reverse("hotel-detail", kwargs={"slug": "test-hotel-test-land"})
+
+        self.get(url, "MISS")
+        self.get(url, "HIT")
+
+    def test_invalidate_on_hotel_save(self):
+        self.get(self.url, "MISS")
+
+        hotel = Hotel.objects.get(name="test hotel")
+        hotel.name = "renamed hotel"
+        hotel.save()
+
+        response = self.get(self.url, "MISS")
+        names = [item["name"] for item in response.json()["results"]]
+        self.assertIn("renamed hotel", names)
+
+    def test_invalidate_on_hotel_delete(self):
+        self.get(self.url, "MISS")
+
+        Hotel.objects.get(name="test hotel").delete()
+
+        response = self.get(self.url, "MISS")
+        self.assertEqual(response.json()["count"], 1, msg=response.json())
+
+    def test_invalidate_on_chain_save(self):
+        url = reverse("hotelchain-list")
+        self.get(url, "MISS")
+        self.get(self.url, "MISS")
+
+        HotelChain.objects.create(title="cache chain")
+
+        self.get(url, "MISS")
+        self.get(self.url, "MISS")
+
+    def test_invalidate_on_admin_action(self):
+        self.get(self.url, "MISS")
+
+        model_admin = site._registry[Hotel]
+        model_admin.hotel_make_active(None, Hotel.objects.all())
+
+        response = self.get(self.url, "MISS")
+        result = {item["is_active"] for item in response.json()["results"]}
+        self.assertEqual(result, {True}, msg=response.json())
+
+    def test_stats(self):
+        before = response_cache_stats()
+
+        self.get(self.url, "MISS")
+        self.get(self.url, "HIT")
+
+        after = response_cache_stats()
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(after["misses"] - before["misses"], 1)
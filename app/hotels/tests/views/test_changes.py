@@ -0,0 +1,114 @@
+import json
+from datetime import timedelta
+
+from django.contrib.admin.sites import site
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+
+from app.hotels.models import Hotel, HotelChain
+from app.hotels.sync import make_token
+from .base import TestSetup
+
+
+# region Delta Sync
+@override_settings(HOTEL_CHANGES_OVERLAP=0)
+class HotelChangesTestCase(TestSetup):
+    def setUp(self):
+        super().setUp()
+
+        self.url = reverse("hotel-changes")
+
+    def get_changes(self, **params) -> dict:
+        response = self.client.get(self.url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_full_sync(self):
+        result = self.get_changes()
+
+        self.assertEqual(
+            {hotel["name"] for hotel in result["hotels"]},
+            {"test hotel", "test resort"},
+        )
+        self.assertEqual([chain["title"] for chain in result["chains"]], ["Test Chain"])
+        self.assertEqual(result["deleted"], [])
+        self.assertTrue(result["token"])
+
+    def test_no_changes(self):
+        token = make_token(timezone.now())
+
+        result = self.get_changes(since=token)
+
+        expected = {"hotels": [], "chains": [], "deleted": []}
+        self.assertEqual({key: result[key] for key in expected}, expected)
+
+    def test_changes_since_token(self):
+        token = make_token(timezone.now())
+
+        hotel = Hotel.objects.get(name="test hotel")
+        hotel.location = "barcelona"
+        hotel.save()
+        Hotel.objects.create(name="new hotel")
+
+        result = self.get_changes(since=token)
+
+        self.assertEqual(
+            [hotel["name"] for hotel in result["hotels"]], ["test hotel", "new hotel"]
+        )
+
+    def test_deleted_since_token(self):
+        token = make_token(timezone.now())
+
+        hotel = Hotel.objects.get(name="test resort")
+        pk = hotel.pk
+        hotel.delete()
+        HotelChain.objects.get(title="Test Chain").delete()
+
+        result = self.get_changes(since=token)
+
+        expected = [
+            {"model": "hotel", "id": pk, "slug": "test-resort-somewhere"},
+            {"model": "hotelchain", "slug": "test-chain"},
+        ]
+        for item, values in zip(result["deleted"], expected):
+            self.assertEqual(item, {**item, **values})
+        self.assertEqual(len(result["deleted"]), len(expected))
+
+    def test_next_token(self):
+        token = self.get_changes()["token"]
+
+        Hotel.objects.create(name="new hotel")
+
+        result = self.get_changes(since=token)
+        self.assertEqual([hotel["name"] for hotel in result["hotels"]], ["new hotel"])
+
+    def test_invalid_token(self):
+        response = self.client.get(self.url, {"since": "forged"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("since", response.json())
+
+    def test_expired_token(self):
+        token = make_token(timezone.now() - timedelta(days=365))
+
+        response = self.client.get(self.url, {"since": token})
+
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_admin_action_is_a_change(self):
+        token = make_token(timezone.now())
+
+        Hotel.objects.filter(name="test hotel").update(is_active=False)
+        self.assertEqual(self.get_changes(since=token)["hotels"], [])
+
+        site._registry[Hotel].hotel_make_active(None, Hotel.objects.all())
+        result = self.get_changes(since=token)
+
+        self.assertEqual(len(result["hotels"]), 2)
+
+
+# endregion
@@ -0,0 +1,119 @@
+from django.urls import reverse
+
+from rest_framework import status
+
+from app.hotels.models import Hotel, HotelChain, HotelDraft
+from ..base import User
+from .base import TestSetup
+
+
+# region Conditional GET
+class ConditionalGetTestCase(TestSetup):
+    def setUp(self):
+        super().setUp()
+
+        self.url = reverse("hotel-list")
+
+    def test_headers(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        self.assertTrue(response["ETag"].startswith('"'), msg=response["ETag"])
+        self.assertIn("Last-Modified", response)
+
+    def test_if_none_match(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        result = response.status_code
+        expected = status.HTTP_304_NOT_MODIFIED
+        self.assertEqual(result, expected)
+
+    def test_if_none_match_anonymous_without_queries(self):
+        self.client.credentials()  # type: ignore
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        result = response.status_code
+        expected = status.HTTP_304_NOT_MODIFIED
+        self.assertEqual(result, expected)
+
+    def test_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        hotel = Hotel.objects.get(name="test hotel")
+        hotel.is_active = True
+        hotel.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_filtered_list(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(
+            self.url, {"name": "resort"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+
+    def test_detail(self):
+        chain = HotelChain.objects.first()
+        hotel = Hotel.objects.get(slug="test-hotel-test-land")
+        hotel.chain = chain
+        hotel.save()
+
+        url = reverse("hotel-detail", kwargs={"slug": hotel.slug})
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # the nested chain is part of the hotel representation
+        chain.description = "updated description"  # type: ignore
+        chain.save()  # type: ignore
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+
+    def test_detail_not_found(self):
+        url = reverse("hotel-detail", kwargs={"slug": "missing"})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_chain_list_modified_by_hotels(self):
+        url = reverse("hotelchain-list")
+        etag = self.client.get(url)["ETag"]
+
+        chain = HotelChain.objects.first()
+        Hotel.objects.create(name="conditional hotel", chain=chain)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+
+    def test_draft_list(self):
+        HotelDraft.objects.create(
+            hotel=Hotel.objects.get(name="test hotel"),
+            name="conditional draft",
+            created_by=User.objects.first(),
+        )
+        url = reverse("hoteldraft-list")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
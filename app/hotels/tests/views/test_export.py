@@ -0,0 +1,74 @@
+import csv
+import gzip
+import json
+
+from django.urls import reverse
+
+from rest_framework import status
+
+from app.hotels.models import Hotel, HotelChain
+from .base import TestSetup
+
+
+# region Export
+class HotelExportTestCase(TestSetup):
+    def setUp(self):
+        super().setUp()
+
+        self.url = reverse("hotel-export")
+
+        chain = HotelChain.objects.create(title="export chain")
+        Hotel.objects.filter(name="test hotel").update(chain=chain)
+
+    def get_content(self, response) -> str:
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        response = self.client.get(self.url, {"format": "ndjson"})
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self.get_content(response).splitlines()]
+
+        result = [(row["name"], row["chain.title"]) for row in rows]
+        expected = [("test hotel", "Export Chain"), ("test resort", None)]
+        self.assertEqual(result, expected)
+
+    def test_export_csv(self):
+        response = self.client.get(self.url, {"format": "csv"})
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(self.get_content(response).splitlines()))
+
+        result = [(row["name"], row["chain.title"]) for row in rows]
+        expected = [("test hotel", "Export Chain"), ("test resort", "")]
+        self.assertEqual(result, expected)
+
+    def test_export_default_format(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+    def test_export_filters(self):
+        response = self.client.get(self.url, {"format": "ndjson", "name": "resort"})
+
+        rows = [json.loads(line) for line in self.get_content(response).splitlines()]
+        self.assertEqual([row["name"] for row in rows], ["test resort"])
+
+    def test_export_gzip(self):
+        response = self.client.get(
+            self.url, {"format": "csv"}, HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        content = gzip.decompress(b"".join(response.streaming_content)).decode()
+        self.assertEqual(len(content.splitlines()), 3)
+
+    def test_export_unknown_format(self):
+        response = self.client.get(self.url, {"format": "xml"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+# endregion
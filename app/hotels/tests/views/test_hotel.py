@@ -370,3 +370,75 @@ class HotelViewSetNoAuthTestCase(TestSetup):
         result = response.status_code
         expected = status.HTTP_401_UNAUTHORIZED
         self.assertEqual(result, expected)
+
+
+# region HotelView Bulk
+class HotelBulkViewSetTestCase(TestSetup):
+    """
+    Test cases for the bulk import of HotelViewSet API
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        self.url = reverse("hotel-bulk")
+
+    def test_bulk_ndjson(self):
+        data = "\n".join(
+            [
+                '{"name": "bulk hotel 1", "location": "madrid", "chain": "bulk chain"}',
+                '{"name": "bulk hotel 2", "chain": {"title": "bulk chain"}}',
+                '{"name": "test hotel", "is_active": true}',
+            ]
+        )
+
+        response = self.client.post(self.url, data, content_type="application/x-ndjson")
+
+        result = response.status_code
+        expected = status.HTTP_200_OK
+        self.assertEqual(result, expected, msg=response.json())
+
+        result = (response.json().get("created"), response.json().get("updated"))
+        expected = (2, 1)
+        self.assertEqual(result, expected, msg=response.json())
+
+        chain = HotelChain.objects.get(title="Bulk Chain")
+        result = chain.hotel_set.count()  # type: ignore
+        self.assertEqual(result, 2, msg=response.json())
+
+        result = Hotel.objects.get(name="test hotel").is_active
+        self.assertTrue(result, msg=response.json())
+
+    def test_bulk_csv(self):
+        data = "name,location,chain\nbulk hotel,barcelona,\n,madrid,\n"
+
+        response = self.client.post(self.url, data, content_type="text/csv")
+
+        result = response.status_code
+        expected = status.HTTP_200_OK
+        self.assertEqual(result, expected, msg=response.json())
+
+        result = (response.json().get("created"), response.json().get("failed"))
+        expected = (1, 1)
+        self.assertEqual(result, expected, msg=response.json())
+
+        result = response.json().get("errors")[0].get("line")
+        self.assertEqual(result, 2, msg=response.json())
+
+    def test_bulk_unsupported_media_type(self):
+        response = self.client.post(self.url, [{"name": "hotel"}], format="json")
+
+        result = response.status_code
+        expected = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        self.assertEqual(result, expected, msg=response.json())
+
+    def test_bulk_without_authentication(self):
+        self.client.credentials()  # type: ignore
+
+        response = self.client.post(
+            self.url, '{"name": "bulk hotel"}', content_type="application/x-ndjson"
+        )
+
+        result = response.status_code
+        expected = status.HTTP_401_UNAUTHORIZED
+        self.assertEqual(result, expected, msg=response.json())
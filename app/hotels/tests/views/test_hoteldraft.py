@@ -1,4 +1,8 @@
+from unittest import mock
+
+from django.contrib.admin.sites import site
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory
 from django.urls import reverse
 from django.conf import settings
 
@@ -203,3 +207,74 @@ class HotelDraftViewSetNoAuthTestCase(TestSetup):
             result = response.status_code
             expected = status.HTTP_401_UNAUTHORIZED
             self.assertEqual(result, expected, msg=response.json())
+
+
+# region HotelDraftView Approve
+class HotelDraftApproveTestCase(TestSetup):
+    """
+    Test cases for the bulk approval of HotelDraftViewSet API
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        self.url = reverse("hoteldraft-approve")
+        self.drafts = [
+            HotelDraft.objects.create(
+                hotel=Hotel.objects.get(name=name),
+                name=f"approved {name}",
+                created_by=User.objects.first(),
+            )
+            for name in ("test hotel", "test resort")
+        ]
+
+    def test_approve(self):
+        ids = [draft.pk for draft in self.drafts]
+
+        response = self.client.post(self.url, {"ids": ids}, format="json")
+
+        result = response.status_code
+        expected = status.HTTP_200_OK
+        self.assertEqual(result, expected, msg=response.json())
+
+        result = response.json().get("approved")
+        self.assertEqual(result, ids, msg=response.json())
+
+        result = sorted(Hotel.objects.values_list("name", flat=True))
+        expected = ["approved test hotel", "approved test resort"]
+        self.assertEqual(result, expected)
+
+    def test_approve_invalid(self):
+        response = self.client.post(self.url, {"ids": []}, format="json")
+
+        result = response.status_code
+        expected = status.HTTP_400_BAD_REQUEST
+        self.assertEqual(result, expected, msg=response.json())
+
+    def test_approve_not_reviewer(self):
+        user = {"email": "user@test.com", "password": "foo"}
+        User.objects.create_user(**user)  # type: ignore
+        response = self.client.post(reverse("token_obtain_pair"), user, format="json")
+        token = response.json().get("access")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")  # type: ignore
+
+        response = self.client.post(self.url, {"ids": [1]}, format="json")
+
+        result = response.status_code
+        expected = status.HTTP_403_FORBIDDEN
+        self.assertEqual(result, expected, msg=response.json())
+        self.assertEqual(HotelDraft.objects.filter(status="approved").count(), 0)
+
+    def test_admin_make_approve(self):
+        request = RequestFactory().post("/")
+        request.user = User.objects.get(email="test@test.com")
+        model_admin = site._registry[HotelDraft]
+
+        with mock.patch.object(model_admin, "message_user") as message_user:
+            model_admin.make_approve(request, HotelDraft.objects.all())
+
+        result = HotelDraft.objects.filter(status="approved").count()
+        self.assertEqual(result, 2)
+        message_user.assert_called_once_with(
+            request, "2 Hotel Drafts have been approved"
+        )
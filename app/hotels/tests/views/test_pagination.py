@@ -0,0 +1,127 @@
+import json
+from base64 import urlsafe_b64encode
+from unittest.mock import patch
+
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+
+from app.config.pagination import KeysetPagination
+from app.hotels.models import Hotel, HotelChain
+from .base import TestSetup
+
+
+# region Keyset Pagination
+@patch.object(KeysetPagination, "page_size", 3)
+class KeysetPaginationTestCase(TestSetup):
+    def setUp(self):
+        super().setUp()
+
+        for i in range(6):
+            Hotel.objects.create(name=f"page hotel {i}")
+            HotelChain.objects.create(title=f"page chain {i}")
+
+        # ties on created_at are broken by the id
+        Hotel.objects.filter(name__startswith="page hotel").update(
+            created_at=timezone.now()
+        )
+
+    def walk(self, url: str, key: str = "next") -> list:
+        names = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+            names.append([item["name"] for item in response.json()["results"]])
+            url = response.json()[key]
+        return names
+
+    def test_hotel_pages(self):
+        pages = self.walk(reverse("hotel-list"))
+
+        result = [name for page in pages for name in page]
+        expected = list(
+            Hotel.objects.order_by("-created_at", "-id").values_list("name", flat=True)
+        )
+        self.assertEqual(result, expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 2])
+
+    def test_hotel_previous_pages(self):
+        response = self.client.get(reverse("hotel-list"))
+        response = self.client.get(response.json()["next"])
+        response = self.client.get(response.json()["next"])
+        last_page = [item["name"] for item in response.json()["results"]]
+
+        pages = self.walk(response.json()["previous"], key="previous")
+
+        result = [name for page in reversed(pages) for name in page] + last_page
+        expected = list(
+            Hotel.objects.order_by("-created_at", "-id").values_list("name", flat=True)
+        )
+        self.assertEqual(result, expected)
+
+    def test_hotelchain_pages(self):
+        url = reverse("hotelchain-list")
+        titles = []
+        while url:
+            response = self.client.get(url)
+            titles += [item["title"] for item in response.json()["results"]]
+            url = response.json()["next"]
+
+        expected = list(
+            HotelChain.objects.order_by("title", "id").values_list("title", flat=True)
+        )
+        self.assertEqual(titles, expected)
+
+    def test_count(self):
+        response = self.client.get(reverse("hotel-list"))
+
+        result = response.json().get("count")
+        self.assertEqual(result, 8, msg=response.json())
+
+    def test_skip_count(self):
+        response = self.client.get(reverse("hotel-list"), {"count": "false"})
+
+        self.assertNotIn("count", response.json())
+        self.assertEqual(len(response.json()["results"]), 3, msg=response.json())
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("hotel-list"), {"cursor": "invalid"})
+
+        result = response.status_code
+        expected = status.HTTP_404_NOT_FOUND
+        self.assertEqual(result, expected, msg=response.json())
+
+    def test_invalid_cursor_values(self):
+        positions = [
+            ["not-a-date", 1],
+            [{"a": 1}, 1],
+            ["2024-01-01T00:00:00+00:00", "abc"],
+            [None, 1],
+        ]
+        for position in positions:
+            data = json.dumps({"p": position, "r": False}).encode()
+            cursor = urlsafe_b64encode(data).decode()
+
+            response = self.client.get(reverse("hotel-list"), {"cursor": cursor})
+
+            result = response.status_code
+            expected = status.HTTP_404_NOT_FOUND
+            self.assertEqual(result, expected, msg=position)
+
+    def test_search_pages(self):
+        pages = self.walk(f"{reverse('hotel-list')}?search=page")
+
+        result = sorted(name for page in pages for name in page)
+        expected = [f"page hotel {i}" for i in range(6)]
+        self.assertEqual(result, expected)
+
+        data = json.dumps({"p": ["abc", 1], "r": False}).encode()
+        cursor = urlsafe_b64encode(data).decode()
+        response = self.client.get(
+            reverse("hotel-list"), {"search": "page", "cursor": cursor}
+        )
+
+        result = response.status_code
+        expected = status.HTTP_404_NOT_FOUND
+        self.assertEqual(result, expected, msg=response.json())
@@ -0,0 +1,85 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+
+from app.hotels.models import Hotel, HotelChain, HotelDraft
+from ..base import User
+from .base import TestSetup
+
+
+# region List Query Count
+class ListQueryCountTestCase(TestSetup):
+    """
+    The number of queries of a list page must not depend on its size
+    """
+
+    MAX_QUERIES = 6
+
+    def setUp(self):
+        super().setUp()
+
+        self.user = User.objects.first()
+
+    def create_catalogue(self, size: int, offset: int = 0) -> None:
+        for i in range(offset, offset + size):
+            chain = HotelChain.objects.create(title=f"query chain {i}")
+            hotel = Hotel.objects.create(name=f"query hotel {i}", chain=chain)
+            Hotel.objects.create(name=f"query sibling {i}", chain=chain)
+            HotelDraft.objects.create(
+                hotel=hotel,
+                name=f"query draft {i}",
+                chain=chain,
+                created_by=self.user,
+            )
+
+    def count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        return len(context.captured_queries)
+
+    def assert_constant_queries(self, url_name: str) -> None:
+        url = reverse(url_name)
+
+        self.create_catalogue(2)
+        small = self.count_queries(url)
+
+        self.create_catalogue(10, offset=2)
+        large = self.count_queries(url)
+
+        self.assertEqual(small, large, msg=f"{small} queries grew to {large}")
+        self.assertLessEqual(large, self.MAX_QUERIES, msg=f"{large} queries")
+
+    def test_hotel_list(self):
+        self.assert_constant_queries("hotel-list")
+
+    def test_hotelchain_list(self):
+        self.assert_constant_queries("hotelchain-list")
+
+    def test_hoteldraft_list(self):
+        self.assert_constant_queries("hoteldraft-list")
+
+    def test_hotelchain_list_without_aggregates(self):
+        self.create_catalogue(2)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse("hotelchain-list"))
+
+        queries = [query["sql"] for query in context.captured_queries]
+        self.assertFalse([sql for sql in queries if 'hotels_hotel"' in sql], queries)
+
+    def test_hotel_list_data(self):
+        self.create_catalogue(1)
+
+        response = self.client.get(reverse("hotel-list"), {"name": "query hotel"})
+        hotel = response.json().get("results")[0]
+
+        result = hotel.get("chain").get("number_of_hotels")
+        self.assertEqual(result, 2, msg=hotel)
+
+        result = hotel.get("related_hotels")
+        expected = [Hotel.objects.get(name="query sibling 0").pk]
+        self.assertEqual(result, expected, msg=hotel)
@@ -0,0 +1,68 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.urls import reverse
+
+from rest_framework import status
+
+from app.hotels.models import Hotel, HotelChain
+from .base import TestSetup
+
+
+# region Search
+class SearchTestCase(TestSetup):
+    def setUp(self):
+        super().setUp()
+
+        Hotel.objects.create(name="resort", location="madrid")
+        Hotel.objects.create(name="grand resort palace", location="sevilla")
+        HotelChain.objects.create(title="sunny resorts")
+
+    def get_results(self, url_name: str, **params) -> list:
+        response = self.client.get(reverse(url_name), params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        return response.json()["results"]
+
+    def test_search_hotels_ranked(self):
+        results = self.get_results("hotel-list", search="resort")
+
+        result = [hotel["name"] for hotel in results]
+        # the ranks of the partial matches depend on the database
+        self.assertEqual(result[0], "resort", msg=result)
+        expected = ["grand resort palace", "test resort"]
+        self.assertEqual(sorted(result[1:]), expected, msg=result)
+
+    def test_search_hotels_location(self):
+        results = self.get_results("hotel-list", search="sevilla")
+
+        result = [hotel["name"] for hotel in results]
+        self.assertEqual(result, ["grand resort palace"])
+
+    def test_search_hotels_every_word(self):
+        results = self.get_results("hotel-list", search="palace resort")
+
+        result = [hotel["name"] for hotel in results]
+        self.assertEqual(result, ["grand resort palace"])
+
+    @skipUnless(connection.vendor == "postgresql", "Trigram search")
+    def test_search_hotels_typo(self):
+        results = self.get_results("hotel-list", search="grand palaces")
+
+        result = [hotel["name"] for hotel in results]
+        self.assertEqual(result, ["grand resort palace"])
+
+    def test_search_chains(self):
+        results = self.get_results("hotelchain-list", search="sunny")
+
+        result = [chain["title"] for chain in results]
+        self.assertEqual(result, ["Sunny Resorts"])
+
+    def test_filter_chains_by_name(self):
+        results = self.get_results("hotelchain-list", name="chain")
+
+        result = [chain["title"] for chain in results]
+        self.assertEqual(result, ["Test Chain"])
+
+
+# endregion
@@ -0,0 +1,108 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+
+from app.hotels.models import Hotel, HotelChain
+from .base import TestSetup
+
+
+# region Sparse Fieldsets
+class SparseFieldsetTestCase(TestSetup):
+    def setUp(self):
+        super().setUp()
+
+        self.chain = HotelChain.objects.get(title="Test Chain")
+        Hotel.objects.filter(name="test hotel").update(chain=self.chain)
+        self.url = reverse("hotel-detail", args=["test-hotel-test-land"])
+
+    def get_queries(self, url: str, data: dict = None) -> tuple:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        return response.json(), [query["sql"] for query in context.captured_queries]
+
+    def test_list_fields(self):
+        response = self.client.get(reverse("hotel-list"), {"fields": "name,slug"})
+
+        result = response.json().get("results")
+        expected = [
+            {"name": "test resort", "slug": "test-resort-somewhere"},
+            {"name": "test hotel", "slug": "test-hotel-test-land"},
+        ]
+        self.assertEqual(result, expected, msg=result)
+
+    def test_retrieve_fields(self):
+        response = self.client.get(self.url, {"fields": "name, location,url"})
+
+        result = response.json()
+        expected = {
+            "name": "test hotel",
+            "location": "test city",
+            "url": f"http://testserver{self.url}",
+        }
+        self.assertEqual(result, expected, msg=result)
+
+    def test_chain_pk(self):
+        response = self.client.get(self.url, {"fields": "name,chain"})
+
+        result = response.json()
+        expected = {"name": "test hotel", "chain": self.chain.pk}
+        self.assertEqual(result, expected, msg=result)
+
+    def test_expand_chain(self):
+        response = self.client.get(self.url, {"fields": "name", "expand": "chain"})
+
+        result = response.json().get("chain")
+        expected = self.client.get(self.url).json().get("chain")
+        self.assertEqual(result, expected, msg=result)
+        self.assertEqual(result.get("title"), "Test Chain", msg=result)
+
+    def test_without_fields(self):
+        result = self.client.get(self.url, {"expand": "chain"}).json()
+        expected = self.client.get(self.url).json()
+        self.assertEqual(result, expected, msg=result)
+
+    def test_related_hotels(self):
+        Hotel.objects.filter(name="test resort").update(chain=self.chain)
+
+        response = self.client.get(self.url, {"fields": "related_hotels"})
+
+        result = response.json()
+        expected = {"related_hotels": [Hotel.objects.get(name="test resort").pk]}
+        self.assertEqual(result, expected, msg=result)
+
+    def test_unknown_fields(self):
+        response = self.client.get(
+            reverse("hotel-list"), {"fields": "name,secret", "expand": "photo"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        result = response.json()
+        expected = {
+            "fields": ["Unknown fields: secret."],
+            "expand": ["Not expandable: photo."],
+        }
+        self.assertEqual(result, expected, msg=result)
+
+    def test_deferred_columns(self):
+        _, queries = self.get_queries(reverse("hotel-list"), {"fields": "name"})
+
+        result = [sql for sql in queries if 'hotels_hotel"."name' in sql][-1]
+        self.assertNotIn('"location"', result, msg=result)
+        self.assertNotIn('"photo_variants"', result, msg=result)
+
+    def test_fewer_queries(self):
+        url = reverse("hotel-list")
+        _, full = self.get_queries(url)
+        _, sparse = self.get_queries(url, {"fields": "name,chain"})
+
+        self.assertLess(len(sparse), len(full), msg=sparse)
+        result = [sql for sql in sparse if 'FROM "hotels_hotelchain"' in sql]
+        self.assertEqual(result, [], msg=sparse)
+
+        _, expanded = self.get_queries(url, {"fields": "name", "expand": "chain"})
+        result = [sql for sql in expanded if 'FROM "hotels_hotelchain"' in sql]
+        self.assertEqual(len(result), 1, msg=expanded)
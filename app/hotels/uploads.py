@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+from django.utils.translation import gettext_lazy as _
+
+from PIL import Image
+
+# form fields of the photos of the hotels and drafts
+PHOTO_FIELDS = {"photo"}
+
+
+class PhotoTooLarge(MultiPartParserError):
+    """
+    The upload of a photo is larger than `HOTEL_PHOTO_MAX_BYTES`, answered
+    with a 400 by Django and DRF
+    """
+
+
+class PhotoUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams the uploaded photos to a temporary file chunk by chunk, so they
+    are never held in memory, and stops the upload as soon as it is larger
+    than `HOTEL_PHOTO_MAX_BYTES`
+
+    The files of other fields are left to the next handlers.
+    """
+
+    def new_file(
+        self,
+        field_name,
+        file_name,
+        content_type,
+        content_length,
+        charset=None,
+        content_type_extra=None,
+    ):
+        self.file = None
+        if field_name not in PHOTO_FIELDS:
+            return
+
+        if content_length and content_length > settings.HOTEL_PHOTO_MAX_BYTES:
+            raise PhotoTooLarge(self.too_large_message())
+        super().new_file(
+            field_name,
+            file_name,
+            content_type,
+            content_length,
+            charset,
+            content_type_extra,
+        )
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.file is None:
+            return raw_data
+
+        if start + len(raw_data) > settings.HOTEL_PHOTO_MAX_BYTES:
+            # deletes the temporary file
+            self.file.close()
+            raise PhotoTooLarge(self.too_large_message())
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if self.file is None:
+            return None
+        return super().file_complete(file_size)
+
+    def too_large_message(self) -> str:
+        return f"The photo is larger than {settings.HOTEL_PHOTO_MAX_BYTES} bytes."
+
+
+def validate_photo(file) -> None:
+    """
+    Validates the size, format and dimensions of an uploaded photo, reading
+    only the header of the image, the bitmap is not decoded
+
+    Photos already in the storage are not validated again.
+    """
+
+    if getattr(file, "_committed", False):
+        return
+
+    if file.size > settings.HOTEL_PHOTO_MAX_BYTES:
+        raise ValidationError(
+            _("The photo is larger than %(max)s bytes."),
+            code="photo_too_large",
+            params={"max": settings.HOTEL_PHOTO_MAX_BYTES},
+        )
+
+    too_many_pixels = ValidationError(
+        _("The photo has more than %(max)s pixels."),
+        code="photo_too_many_pixels",
+        params={"max": settings.HOTEL_PHOTO_MAX_PIXELS},
+    )
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            format, (width, height) = image.format, image.size
+    except Image.DecompressionBombError:
+        raise too_many_pixels
+    except OSError:
+        raise ValidationError(_("Upload a valid image."), code="invalid_image")
+    finally:
+        file.seek(0)
+
+    if width * height > settings.HOTEL_PHOTO_MAX_PIXELS:
+        raise too_many_pixels
+    if format not in settings.HOTEL_PHOTO_FORMATS:
+        raise ValidationError(
+            _("Upload a %(formats)s photo."),
+            code="invalid_image_format",
+            params={"formats": ", ".join(settings.HOTEL_PHOTO_FORMATS)},
+        )
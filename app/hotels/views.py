@@ -1,35 +1,230 @@
-from rest_framework import viewsets
+import re
+
+from django.db.models import Max, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
 
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework import permissions
 
+from .exporters import WRITERS, export_rows, gzip_stream
 from .filters import HotelFilter, HotelChainFilter
-from .models import Hotel, HotelChain, HotelDraft
-from .serializers import HotelSerializer, HotelChainSerializer, HotelDraftSerializer
-from .permissions import IsStaffUserOrReadOnly
+from .importers import HotelImporter
+from .mixins import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    RowReaderMixin,
+    SparseFieldsetMixin,
+)
+from .models import Hotel, HotelChain, HotelDraft, Tombstone
+from .serializers import (
+    HotelDraftApproveSerializer,
+    HotelSerializer,
+    HotelChainSerializer,
+    HotelDraftSerializer,
+    TombstoneSerializer,
+)
+from .parsers import CSVParser, NDJSONParser
+from .readers import HotelChainReader, HotelReader
+from .permissions import IsReviewer, IsStaffUserOrReadOnly
+from .renderers import CSVRenderer, NDJSONRenderer
+from .sync import ExpiredToken, InvalidToken, next_token, read_token, stream_changes
+
+
+class Gone(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Resource no longer available."
+    default_code = "gone"
+
 
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
 
-class HotelChainViewSet(viewsets.ModelViewSet):
+
+class HotelChainViewSet(
+    ConditionalGetMixin, CachedResponseMixin, RowReaderMixin, viewsets.ModelViewSet
+):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsStaffUserOrReadOnly]
-    queryset = HotelChain.objects.all().order_by("title")
+    queryset = HotelChain.objects.all().order_by("title", "id")
     serializer_class = HotelChainSerializer
+    reader_class = HotelChainReader
     lookup_field = "slug"
     filterset_class = HotelChainFilter
+    cache_models = (HotelChain, Hotel)
 
 
-class HotelViewSet(viewsets.ModelViewSet):
+class HotelViewSet(
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    RowReaderMixin,
+    viewsets.ModelViewSet,
+):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsStaffUserOrReadOnly]
-    queryset = Hotel.objects.all().order_by("-created_at")
+    queryset = Hotel.objects.all().order_by("-created_at", "-id")
     serializer_class = HotelSerializer
+    reader_class = HotelReader
     lookup_field = "slug"
     filterset_class = HotelFilter
+    cache_models = (Hotel, HotelChain)
+    conditional_aggregates = {"chain_modified": Max("chain__updated_at")}
+
+    def use_reader(self) -> bool:
+        # the sparse fieldsets are served by the pruned serializer
+        return super().use_reader() and self.sparse_fieldset is None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.sparse_fieldset is not None:
+            fields, expand = self.sparse_fieldset
+            queryset = self.get_sparse_queryset(queryset)
+            # only the related hotels read the members of the chain, and the
+            # chain is only read when expanded, its pk is in the hotel row
+            if "related_hotels" not in fields:
+                if "chain" in expand:
+                    queryset = queryset.prefetch_related("chain")
+                return queryset
+
+        # chain and its members, which are the related hotels, are fetched
+        # in bulk so a page costs the same number of queries whatever its size
+        chains = HotelChain.objects.prefetch_related(  # type: ignore
+            Prefetch(
+                "hotel_set", queryset=Hotel.objects.only("pk", "chain").order_by("pk")
+            )
+        )
+        return queryset.prefetch_related(Prefetch("chain", queryset=chains))
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        parser_classes=[NDJSONParser, CSVParser],
+    )
+    def bulk(self, request):
+        """
+        Creates or updates hotels (by name) from a NDJSON or CSV stream
+
+        Rows are imported in chunks with bulk queries, see `HotelImporter`.
+        Returns the import report.
+        """
+
+        report = HotelImporter().run(request.data)
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+        pagination_class=None,
+    )
+    def export(self, request):
+        """
+        Streams every hotel (matching the filters) as NDJSON or CSV
+
+        `?format=ndjson|csv`, NDJSON by default. Rows are read with a server
+        side cursor and written in blocks, so the memory does not depend on
+        the size of the catalogue. Compressed on the fly when the client
+        accepts gzip.
+        """
+
+        file_format = request.accepted_renderer.format
+        queryset = self.filter_queryset(Hotel.objects.all())
+        stream = WRITERS[file_format](export_rows(queryset))
 
+        gzip = ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if gzip:
+            stream = gzip_stream(stream)
 
-class HotelDraftViewSet(viewsets.ModelViewSet):
+        response = StreamingHttpResponse(
+            stream, content_type=request.accepted_renderer.media_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="hotels.{file_format}"'
+        response["Vary"] = "Accept-Encoding"
+        if gzip:
+            response["Content-Encoding"] = "gzip"
+        return response
+
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """
+        Streams the hotels and chains changed since the `since` token
+
+        Without a token every hotel and chain is returned. The response holds
+        the deletions (from the tombstones), the created or updated hotels and
+        chains, and the token for the next sync. Clients apply the deletions
+        first and must tolerate receiving a row more than once.
+        """
+
+        since = request.query_params.get("since")
+        try:
+            moment = read_token(since) if since else None
+        except InvalidToken as error:
+            raise ValidationError({"since": [str(error)]})
+        except ExpiredToken as error:
+            raise Gone(str(error))
+
+        # taken before reading, rows written meanwhile go in the next sync
+        token = next_token(timezone.now())
+
+        hotels = self.get_queryset().order_by("updated_at", "id")
+        chains = HotelChain.objects.order_by("updated_at", "id")
+        deleted = Tombstone.objects.order_by("deleted_at", "id")
+        if moment:
+            hotels = hotels.filter(updated_at__gte=moment)
+            chains = chains.filter(updated_at__gte=moment)
+            deleted = deleted.filter(deleted_at__gte=moment)
+
+        context = self.get_serializer_context()
+        sections = [
+            ("deleted", deleted, lambda obj: TombstoneSerializer(obj).data),
+            ("hotels", hotels, lambda obj: HotelSerializer(obj, context=context).data),
+            (
+                "chains",
+                chains,
+                lambda obj: HotelChainSerializer(obj, context=context).data,
+            ),
+        ]
+        return StreamingHttpResponse(
+            stream_changes(token, sections), content_type="application/json"
+        )
+
+
+class HotelDraftViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     authentication_classes = [JWTAuthentication]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    queryset = HotelDraft.objects.all().order_by("-created_at")
+    queryset = HotelDraft.objects.all().order_by("-created_at", "-id")
     serializer_class = HotelDraftSerializer
     lookup_field = "slug"
+    conditional_aggregates = {"chain_modified": Max("chain__updated_at")}
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("hotel", "chain")
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="approve",
+        permission_classes=[IsReviewer],
+        serializer_class=HotelDraftApproveSerializer,
+    )
+    def approve(self, request):
+        """
+        Approves the drafts of the `ids` in bulk, see `HotelDraft.approve_many`
+
+        Returns the ids of the approved drafts, the ones already approved or
+        not found are skipped.
+        """
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        approved = HotelDraft.approve_many(serializer.validated_data["ids"])
+        return Response(
+            {"approved": [draft.pk for draft in approved]}, status=status.HTTP_200_OK
+        )